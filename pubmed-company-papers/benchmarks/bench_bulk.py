@@ -0,0 +1,73 @@
+"""Benchmark offline classification of local .xml.gz dumps, in-process vs. sharded across workers."""
+
+import argparse
+import gzip
+import os
+import shutil
+import tempfile
+import time
+from typing import List
+
+from pubmed_company_papers.dumps import iter_dump_articles
+from pubmed_company_papers.processing import ProcessingPool, process_article
+
+from benchmarks.bench_memory import write_efetch_xml
+
+
+def make_dumps(directory: str, files: int, articles: int) -> List[str]:
+    """Write synthetic gzipped baseline files."""
+    paths = []
+    for number in range(files):
+        xml_path = os.path.join(directory, f"pubmed24n{number + 1:04d}.xml")
+        write_efetch_xml(xml_path, articles, seed=number)
+        with open(xml_path, "rb") as source, gzip.open(f"{xml_path}.gz", "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.remove(xml_path)
+        paths.append(f"{xml_path}.gz")
+    return paths
+
+
+def in_process(paths: List[str]) -> int:
+    """Classify every file in this process."""
+    count = 0
+    for path in paths:
+        for article in iter_dump_articles(path):
+            process_article(article)
+            count += 1
+    return count
+
+
+def pooled(paths: List[str], workers: int) -> int:
+    """Classify the files on a worker pool, one file per task."""
+    with ProcessingPool(workers) as pool:
+        for _ in pool.process_files(paths):
+            pass
+        return pool.articles
+
+
+def main() -> None:
+    """Run the bulk benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-f", "--files", type=int, default=8)
+    parser.add_argument("-n", "--articles", type=int, default=5000, help="Articles per file")
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = make_dumps(tmpdir, args.files, args.articles)
+        print(f"dumps:      {args.files} files x {args.articles} articles, {os.cpu_count()} CPUs")
+
+        start = time.perf_counter()
+        count = in_process(paths)
+        elapsed = time.perf_counter() - start
+        print(f"in-process: {elapsed:.2f}s ({count / elapsed:.0f} articles/s)")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            count = pooled(paths, workers)
+            elapsed = time.perf_counter() - start
+            print(f"{workers} workers:  {elapsed:.2f}s ({count / elapsed:.0f} articles/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark the compiled affiliation classifier against the per-keyword scan."""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, List
+
+from pubmed_company_papers.affiliations import AffiliationAnalyzer
+
+COMPANY_SITES = [
+    "Pfizer Inc., New York, NY, USA",
+    "Genentech, Inc., South San Francisco, CA 94080, USA",
+    "AstraZeneca Pharmaceuticals, Cambridge, UK",
+    "Novartis Pharma AG, Basel, Switzerland",
+    "Regeneron Pharmaceuticals, Tarrytown, NY, USA",
+    "Moderna Therapeutics, Cambridge, MA, USA",
+]
+
+ACADEMIC_SITES = [
+    "Department of Biology, Stanford University, CA, USA",
+    "Harvard Medical School, Boston, MA, USA",
+    "National Institutes of Health, Bethesda, MD, USA",
+    "Division of Oncology, Mayo Clinic, Rochester, MN, USA",
+    "Faculty of Medicine, University of Tokyo, Tokyo, Japan",
+    "Research Center for Infectious Diseases, Shanghai, China",
+]
+
+EMAIL_ONLY = [
+    "Basel, Switzerland. j.doe@roche.com",
+    "Shenzhen, China. wang@szu.edu.cn",
+    "Toronto, Canada. someone@gmail.com",
+    "Melbourne, Australia. lee@unimelb.edu.au",
+]
+
+
+def build_corpus(size: int, seed: int = 42) -> List[str]:
+    """
+    Build a reproducible mix of company, academic and email-only affiliations.
+
+    Args:
+        size: Number of affiliation strings to generate
+        seed: Random seed
+
+    Returns:
+        List of affiliation strings
+    """
+    rng = random.Random(seed)
+    pools = COMPANY_SITES + ACADEMIC_SITES + EMAIL_ONLY
+    return [f"{rng.choice(pools)} {rng.randint(1, 999)}" for _ in range(size)]
+
+
+def legacy_is_company_affiliation(affiliation: str) -> bool:
+    """Reference implementation: one regex search per keyword."""
+    if not affiliation:
+        return False
+    affiliation_lower = affiliation.lower()
+    for keyword in AffiliationAnalyzer.COMPANY_KEYWORDS:
+        if re.search(r'\b' + re.escape(keyword) + r'\b', affiliation_lower):
+            return True
+    for keyword in AffiliationAnalyzer.ACADEMIC_KEYWORDS:
+        if re.search(r'\b' + re.escape(keyword) + r'\b', affiliation_lower):
+            return False
+    email_match = re.search(r'[\w\.-]+@([\w\.-]+)', affiliation_lower)
+    if email_match:
+        domain = email_match.group(1)
+        for academic_domain in AffiliationAnalyzer.ACADEMIC_EMAIL_DOMAINS:
+            if domain.endswith(academic_domain):
+                return False
+        if domain.endswith('.com') or domain.endswith('.co'):
+            return True
+    return False
+
+
+def time_it(func: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time of several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the classifier benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--size", type=int, default=100_000)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size)
+
+    expected = [legacy_is_company_affiliation(a) for a in corpus]
+    if AffiliationAnalyzer.classify_many(corpus) != expected:
+        raise SystemExit("Compiled classifier disagrees with the reference implementation")
+
+    legacy = time_it(lambda: [legacy_is_company_affiliation(a) for a in corpus], args.repeat)
+    compiled = time_it(lambda: AffiliationAnalyzer.classify_many(corpus), args.repeat)
+
+    print(f"affiliations:  {args.size}")
+    print(f"legacy:        {legacy:.3f}s ({args.size / legacy:,.0f}/s)")
+    print(f"compiled:      {compiled:.3f}s ({args.size / compiled:,.0f}/s)")
+    print(f"speedup:       {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
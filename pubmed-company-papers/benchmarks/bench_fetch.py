@@ -0,0 +1,60 @@
+"""Benchmark sequential vs. concurrent vs. adaptively sized efetch against a local E-utilities stub."""
+
+import argparse
+import time
+
+from pubmed_company_papers.api import PubMedAPI
+from pubmed_company_papers.batching import AdaptiveBatchSizer
+from pubmed_company_papers.ratelimit import TokenBucket
+
+from tests.stub_eutils import StubEutils
+
+
+def run(api: PubMedAPI, pmids: list, concurrency: int) -> float:
+    """Fetch every PMID and return the elapsed wall time."""
+    start = time.perf_counter()
+    fetched = sum(1 for _ in api.iter_articles(pmids, concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+    if fetched != len(pmids):
+        raise SystemExit(f"Fetched {fetched} of {len(pmids)} articles")
+    return elapsed
+
+
+def main() -> None:
+    """Run the fetch benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--size", type=int, default=1000)
+    parser.add_argument("-l", "--latency", type=float, default=0.3, help="Stub response latency (s)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=10.0, help="Requests per second allowed")
+    args = parser.parse_args()
+
+    pmids = [str(30000000 + i) for i in range(args.size)]
+    batches = (args.size - 1) // 50 + 1
+
+    with StubEutils(pmids=pmids, latency=args.latency) as stub:
+        sequential_api = PubMedAPI(email="bench@example.com", eutils_url=stub.url,
+                                   rate_limiter=TokenBucket(args.rate))
+        sequential = run(sequential_api, pmids, concurrency=1)
+
+        concurrent_api = PubMedAPI(email="bench@example.com", eutils_url=stub.url,
+                                   rate_limiter=TokenBucket(args.rate))
+        concurrent = run(concurrent_api, pmids, concurrency=args.concurrency)
+
+        sizer = AdaptiveBatchSizer()
+        adaptive_api = PubMedAPI(email="bench@example.com", eutils_url=stub.url,
+                                 rate_limiter=TokenBucket(args.rate), batch_sizer=sizer)
+        adaptive = run(adaptive_api, pmids, concurrency=1)
+
+    print(f"articles:      {args.size} in {batches} batches, {args.latency:.2f}s latency")
+    print(f"sequential:    {sequential:.2f}s ({args.size / sequential:,.0f} articles/s)")
+    print(f"concurrent:    {concurrent:.2f}s ({args.size / concurrent:,.0f} articles/s, "
+          f"{args.concurrency} workers, {args.rate:g} req/s)")
+    print(f"speedup:       {sequential / concurrent:.1f}x")
+    sizes = sizer.summary()
+    print(f"adaptive:      {adaptive:.2f}s ({args.size / adaptive:,.0f} articles/s, sequential, "
+          f"{sizes['batches']} batches of {sizes['smallest']}-{sizes['largest']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measure memory held by extracted author data: dicts vs. slotted, interned records."""
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import tracemalloc
+from typing import Any, Callable, List
+from xml.sax.saxutils import escape
+
+from pubmed_company_papers.parser import PubMedParser
+from pubmed_company_papers.records import STRING_POOL
+from pubmed_company_papers.xml_stream import iter_pubmed_articles
+
+from benchmarks.bench_classifier import ACADEMIC_SITES, COMPANY_SITES, EMAIL_ONLY
+
+
+def write_efetch_xml(path: str, size: int, authors_per_article: int = 8, seed: int = 42) -> None:
+    """
+    Write a synthetic efetch document where co-authors share affiliation lines.
+
+    Args:
+        path: Output file
+        size: Number of articles
+        authors_per_article: Number of authors on each article
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    pools = COMPANY_SITES + ACADEMIC_SITES + EMAIL_ONLY
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("<PubmedArticleSet>\n")
+        for pmid in range(size):
+            sites = [escape(rng.choice(pools)) for _ in range(2)]
+            authors = "".join(
+                f"<Author><LastName>Author{i}</LastName><ForeName>Test</ForeName>"
+                f"<AffiliationInfo><Affiliation>{sites[i % 2]}</Affiliation></AffiliationInfo></Author>"
+                for i in range(authors_per_article)
+            )
+            handle.write(
+                f"<PubmedArticle><MedlineCitation><PMID>{30000000 + pmid}</PMID><Article>"
+                f"<Journal><JournalIssue><PubDate><Year>2023</Year></PubDate></JournalIssue></Journal>"
+                f"<ArticleTitle>Synthetic article {pmid}</ArticleTitle>"
+                f"<AuthorList>{authors}</AuthorList></Article></MedlineCitation></PubmedArticle>\n"
+            )
+        handle.write("</PubmedArticleSet>\n")
+
+
+def as_dicts(article: Any) -> Any:
+    """Keep article fields the pre-record way: a tuple of fields plus author dicts."""
+    return (
+        PubMedParser.extract_pubmed_id(article),
+        PubMedParser.extract_title(article),
+        PubMedParser.extract_publication_date(article),
+        PubMedParser.extract_authors_with_affiliations(article),
+    )
+
+
+def measure(path: str, extract: Callable[[Any], Any]) -> int:
+    """Return the bytes still allocated while holding every extracted article."""
+    STRING_POOL.clear()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept: List[Any] = [extract(article) for article in iter_pubmed_articles(path)]
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del kept
+    return held
+
+
+def main() -> None:
+    """Run the memory benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--size", type=int, default=20_000)
+    parser.add_argument("-a", "--authors", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "efetch.xml")
+        write_efetch_xml(path, args.size, args.authors)
+
+        dicts = measure(path, as_dicts)
+        records = measure(path, PubMedParser.extract_article)
+
+    scale = 100_000 / args.size
+    print(f"articles:      {args.size} ({args.authors} authors each)")
+    print(f"author dicts:  {dicts * scale / 2**20:.1f} MiB per 100k articles")
+    print(f"records:       {records * scale / 2**20:.1f} MiB per 100k articles")
+    print(f"reduction:     {dicts / records:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark the streaming CSV writer vs. the former pandas DataFrame path, and the --format writers."""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from pubmed_company_papers.output import OUTPUT_FORMATS, OutputHandler
+from pubmed_company_papers.records import ArticleRecord
+
+# Rows per append, as written by the CLI between checkpoints
+BATCH_SIZE = 50
+
+
+def iter_rows(size: int) -> Iterator[Dict[str, str]]:
+    """Generate result rows as the CLI produces them."""
+    for i in range(size):
+        yield OutputHandler.format_data_for_csv(
+            pubmed_id=str(30000000 + i),
+            title=f"Synthetic article {i}, a study of compound {i % 97}",
+            publication_date="2023-01-15",
+            company_authors=[f"Author{i}, Test", f"Author{i + 1}, Test"],
+            company_names=["Pfizer Inc., Groton, CT, USA", "Genentech, Inc."],
+            corresponding_email=f"author{i}@pfizer.com"
+        )
+
+
+def iter_list_rows(size: int) -> Iterator[Dict[str, Any]]:
+    """Generate result rows with list-valued columns, as the processing stage produces them."""
+    for i in range(size):
+        record = ArticleRecord(str(30000000 + i), f"Synthetic article {i}, a study of compound {i % 97}",
+                               "2023-01-15", (), f"author{i}@pfizer.com")
+        yield OutputHandler.format_row(record, [f"Author{i}, Test", f"Author{i + 1}, Test"],
+                                       ["Pfizer Inc., Groton, CT, USA", "Genentech, Inc."])
+
+
+def append_rows(output_format: str, size: int, filename: str) -> None:
+    """Write rows with a --format writer in checkpoint-sized batches."""
+    writer = OUTPUT_FORMATS[output_format](filename)
+    batch = []
+    for row in iter_list_rows(size):
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            writer.append(batch)
+            batch = []
+    writer.append(batch)
+    writer.close()
+
+
+def pandas_csv(size: int, filename: str) -> None:
+    """Write rows the way OutputHandler.create_csv did: collect, build a DataFrame, to_csv."""
+    import pandas as pd
+
+    data = list(iter_rows(size))
+    pd.DataFrame(data).to_csv(filename, index=False)
+
+
+def streaming_csv(size: int, filename: str) -> None:
+    """Write rows with the streaming OutputHandler.create_csv."""
+    OutputHandler.create_csv(iter_rows(size), filename)
+
+
+def measure(func: Callable[..., Any], *args: Any) -> Tuple[float, float]:
+    """
+    Run a function and measure it.
+
+    Returns:
+        Elapsed seconds and peak traced memory in MB
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    """Run the output benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--size", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "results.csv")
+
+        elapsed, peak = measure(streaming_csv, args.size, filename)
+        print(f"streaming: {elapsed:.2f}s ({args.size / elapsed:.0f} rows/s), peak {peak:.1f} MB")
+
+        try:
+            import pandas  # noqa: F401
+            elapsed, peak = measure(pandas_csv, args.size, filename)
+            print(f"pandas:    {elapsed:.2f}s ({args.size / elapsed:.0f} rows/s), peak {peak:.1f} MB")
+        except ImportError:
+            print("pandas:    not installed, skipped")
+
+        for output_format in sorted(OUTPUT_FORMATS):
+            path = os.path.join(tmpdir, f"results.{output_format}")
+            try:
+                elapsed, peak = measure(append_rows, output_format, args.size, path)
+            except ImportError as e:
+                print(f"{output_format + ':':10} skipped ({e})")
+                continue
+            print(f"{output_format + ':':10} {elapsed:.2f}s ({args.size / elapsed:.0f} rows/s), "
+                  f"peak {peak:.1f} MB, {os.path.getsize(path) / 1024 / 1024:.1f} MB on disk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark single-pass article extraction against the per-field extractors."""
+
+import argparse
+import random
+from typing import Any, Dict, List
+
+from pubmed_company_papers.parser import PubMedParser
+
+from benchmarks.bench_classifier import ACADEMIC_SITES, COMPANY_SITES, EMAIL_ONLY, time_it
+
+
+def build_articles(size: int, authors_per_article: int = 8, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Build reproducible Entrez-style article dictionaries.
+
+    Args:
+        size: Number of articles
+        authors_per_article: Number of authors on each article
+        seed: Random seed
+
+    Returns:
+        List of article dictionaries
+    """
+    rng = random.Random(seed)
+    pools = COMPANY_SITES + ACADEMIC_SITES + EMAIL_ONLY
+    articles = []
+    for pmid in range(size):
+        authors = [
+            {
+                "LastName": f"Author{i}",
+                "ForeName": "Test",
+                "Initials": "T",
+                "AffiliationInfo": [{"Affiliation": rng.choice(pools)}],
+            }
+            for i in range(authors_per_article)
+        ]
+        articles.append({
+            "MedlineCitation": {
+                "PMID": str(30000000 + pmid),
+                "Article": {
+                    "ArticleTitle": f"Synthetic article {pmid}",
+                    "Journal": {"JournalIssue": {"PubDate": {"Year": "2023", "Month": "Mar", "Day": "7"}}},
+                    "AuthorList": authors,
+                },
+            }
+        })
+    return articles
+
+
+def per_field(articles: List[Dict[str, Any]]) -> None:
+    """Extract fields the way process_articles did before extract_article."""
+    for article in articles:
+        PubMedParser.extract_pubmed_id(article)
+        PubMedParser.extract_title(article)
+        PubMedParser.extract_publication_date(article)
+        PubMedParser.extract_authors_with_affiliations(article)
+        PubMedParser.extract_corresponding_author_email(article)
+
+
+def single_pass(articles: List[Dict[str, Any]]) -> None:
+    """Extract fields with PubMedParser.extract_article."""
+    for article in articles:
+        PubMedParser.extract_article(article)
+
+
+def main() -> None:
+    """Run the parser benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--size", type=int, default=20_000)
+    parser.add_argument("-a", "--authors", type=int, default=8)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    articles = build_articles(args.size, args.authors)
+
+    before = time_it(lambda: per_field(articles), args.repeat)
+    after = time_it(lambda: single_pass(articles), args.repeat)
+
+    print(f"articles:      {args.size} ({args.authors} authors each)")
+    print(f"per-field:     {before / args.size * 1e6:.1f} us/article")
+    print(f"single-pass:   {after / args.size * 1e6:.1f} us/article")
+    print(f"speedup:       {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
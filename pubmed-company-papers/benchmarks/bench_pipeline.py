@@ -0,0 +1,109 @@
+"""Benchmark the phased CLI flow vs. the overlapped fetch/process/write pipeline."""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from pubmed_company_papers.api import PubMedAPI
+from pubmed_company_papers.cli import FETCH_QUEUE_SIZE, process_articles, write_results
+from pubmed_company_papers.output import CSVAppender
+from pubmed_company_papers.ratelimit import TokenBucket
+
+from tests.stub_eutils import StubEutils
+
+AFFILIATIONS = [
+    "Department of Oncology, Harvard Medical School, Boston, MA, USA.",
+    "Pfizer Inc., Worldwide Research and Development, Groton, CT, USA.",
+    "Institute of Pharmacology, University of Heidelberg, Germany.",
+    "Genentech, Inc., South San Francisco, CA, USA. someone@gene.com",
+]
+
+
+def heavy_article(pmid: str, authors: int) -> str:
+    """Build one article with many authors so processing has real cost."""
+    author_xml = "".join(
+        f"<Author><LastName>Author{i}</LastName><ForeName>Test</ForeName>"
+        f"<AffiliationInfo><Affiliation>{AFFILIATIONS[i % len(AFFILIATIONS)]} {pmid}-{i}</Affiliation>"
+        "</AffiliationInfo></Author>"
+        for i in range(authors)
+    )
+    return (
+        f"<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>"
+        "<Journal><JournalIssue><PubDate><Year>2024</Year></PubDate></JournalIssue></Journal>"
+        f"<ArticleTitle>Article {pmid}</ArticleTitle><AuthorList>{author_xml}</AuthorList>"
+        "</Article></MedlineCitation></PubmedArticle>"
+    )
+
+
+class HeavyStub(StubEutils):
+    """Stub whose articles carry many uniquely affiliated authors."""
+
+    def __init__(self, pmids: List[str], latency: float, authors: int):
+        super().__init__(pmids=pmids, latency=latency)
+        self.authors = authors
+
+    def respond(self, utility: str, params: Dict[str, str]) -> Optional[bytes]:
+        if utility == "efetch" and "id" in params:
+            articles = "".join(heavy_article(pmid, self.authors) for pmid in params["id"].split(","))
+            return f"<PubmedArticleSet>{articles}</PubmedArticleSet>".encode("utf-8")
+        return super().respond(utility, params)
+
+
+def phased(api: PubMedAPI, pmids: List[str], filename: str) -> float:
+    """Fetch everything, then process, then write, as the CLI used to."""
+    start = time.perf_counter()
+    articles = list(api.iter_articles(pmids))
+    rows = process_articles(articles)
+    writer = CSVAppender(filename)
+    writer.append(rows)
+    writer.close()
+    return time.perf_counter() - start
+
+
+def pipelined(api: PubMedAPI, pmids: List[str], filename: str) -> float:
+    """Run the staged pipeline used by the CLI."""
+    start = time.perf_counter()
+    articles = api.iter_articles(pmids, prefetch=FETCH_QUEUE_SIZE)
+    writer = CSVAppender(filename)
+    write_results(articles, writer)
+    writer.close()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the pipeline benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--size", type=int, default=2000)
+    parser.add_argument("-a", "--authors", type=int, default=40, help="Authors per article")
+    parser.add_argument("-l", "--latency", type=float, default=0.15, help="Stub response latency (s)")
+    args = parser.parse_args()
+
+    pmids = [str(30000000 + i) for i in range(args.size)]
+
+    with HeavyStub(pmids, args.latency, args.authors) as stub, tempfile.TemporaryDirectory() as tmpdir:
+        api = PubMedAPI(email="bench@example.com", eutils_url=stub.url, rate_limiter=TokenBucket(1000))
+
+        start = time.perf_counter()
+        articles = list(api.iter_articles(pmids))
+        fetch_only = time.perf_counter() - start
+
+        start = time.perf_counter()
+        process_articles(articles)
+        process_only = time.perf_counter() - start
+        del articles
+
+        phased_time = phased(api, pmids, os.path.join(tmpdir, "phased.csv"))
+        pipelined_time = pipelined(api, pmids, os.path.join(tmpdir, "pipelined.csv"))
+
+    print(f"articles:      {args.size} with {args.authors} authors, {args.latency:.2f}s latency per batch")
+    print(f"fetch + parse: {fetch_only:.2f}s")
+    print(f"process only:  {process_only:.2f}s")
+    print(f"phased:        {phased_time:.2f}s")
+    print(f"pipelined:     {pipelined_time:.2f}s "
+          f"(max(fetch, process) = {max(fetch_only, process_only):.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark the fetch path offline: record a stub run once, then replay it at full speed."""
+
+import argparse
+import logging
+import tempfile
+import time
+
+from pubmed_company_papers.api import PubMedAPI
+from pubmed_company_papers.ratelimit import TokenBucket
+from pubmed_company_papers.retry import RetryPolicy
+from pubmed_company_papers.transport import HTTPTransport, RecordingTransport, ReplayTransport
+
+from tests.stub_eutils import StubEutils
+
+
+def run(transport, pmids: list, concurrency: int, retries: int = 5) -> float:
+    """Fetch every PMID through a transport and return the elapsed wall time."""
+    api = PubMedAPI(email="bench@example.com", rate_limiter=TokenBucket(float("inf")), transport=transport,
+                    retry_policy=RetryPolicy(max_attempts=retries, base_delay=0.01))
+    start = time.perf_counter()
+    fetched = sum(1 for _ in api.iter_articles(pmids, concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+    if fetched != len(pmids):
+        raise SystemExit(f"Fetched {fetched} of {len(pmids)} articles")
+    return elapsed
+
+
+def main() -> None:
+    """Run the replay benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--size", type=int, default=5000)
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("-l", "--latency", type=float, default=0.05, help="Simulated response latency (s)")
+    parser.add_argument("-e", "--error-rate", type=float, default=0.1, help="Share of requests failed with 503")
+    args = parser.parse_args()
+    # Injected errors are expected, keep their retry warnings out of the results
+    logging.getLogger("pubmed_company_papers.retry").setLevel(logging.ERROR)
+
+    pmids = [str(30000000 + i) for i in range(args.size)]
+    with tempfile.TemporaryDirectory() as cassette:
+        with StubEutils(pmids=pmids) as stub:
+            recorder = RecordingTransport(HTTPTransport(stub.url, "bench", "bench@example.com"), cassette)
+            recording = run(recorder, pmids, concurrency=1)
+        print(f"articles:      {args.size} in {recorder.recorded} batches, recorded in {recording:.2f}s")
+
+        for concurrency in args.concurrency:
+            plain = run(ReplayTransport(cassette), pmids, concurrency)
+            player = ReplayTransport(cassette, latency=args.latency, error_rate=args.error_rate, seed=1)
+            loaded = run(player, pmids, concurrency, retries=20)
+            print(f"{concurrency:>2} threads:    replay {args.size / plain:>9,.0f} articles/s, "
+                  f"with {args.latency:.2f}s latency and {player.injected} injected errors "
+                  f"{args.size / loaded:>7,.0f} articles/s")
+
+
+if __name__ == "__main__":
+    main()
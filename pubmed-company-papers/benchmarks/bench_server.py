@@ -0,0 +1,72 @@
+"""Benchmark --serve jobs against a local E-utilities stub: first vs. warm job latency, and concurrent throughput."""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.request import Request, urlopen
+
+from pubmed_company_papers.article_store import ArticleStore
+from pubmed_company_papers.ratelimit import TokenBucket
+from pubmed_company_papers.server import PapersServer, PapersService
+
+from tests.stub_eutils import StubEutils
+
+
+def post_job(url: str, query: str, max_results: int) -> float:
+    """Run one job to completion and return its latency."""
+    start = time.perf_counter()
+    request = Request(f"{url}/jobs", data=json.dumps({"query": query, "max_results": max_results}).encode("utf-8"))
+    with urlopen(request) as response:
+        summary = json.loads(response.read().splitlines()[-1])["summary"]
+    if summary["retrieved"] != max_results:
+        raise SystemExit(f"Retrieved {summary['retrieved']} of {max_results} articles")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the server benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--size", type=int, default=500, help="Articles per job")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="Concurrent jobs")
+    parser.add_argument("-l", "--latency", type=float, default=0.1, help="Stub response latency (s)")
+    parser.add_argument("--rate", type=float, default=10.0, help="Requests per second shared by all jobs")
+    args = parser.parse_args()
+
+    pmids = [str(30000000 + i) for i in range(args.size)]
+    with StubEutils(pmids=pmids, latency=args.latency) as stub, tempfile.TemporaryDirectory() as tmpdir:
+        store = ArticleStore(os.path.join(tmpdir, "articles.sqlite"))
+        service = PapersService(email="bench@example.com", eutils_url=stub.url,
+                                rate_limiter=TokenBucket(args.rate), article_store=store,
+                                max_results=args.size, max_jobs=args.jobs)
+        server = PapersServer(service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        first = post_job(server.url, "cancer", args.size)
+        warm = post_job(server.url, "cancer", args.size)
+
+        latencies = []
+        start = time.perf_counter()
+        threads = [threading.Thread(target=lambda: latencies.append(post_job(server.url, "cancer", args.size)))
+                   for _ in range(args.jobs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        server.shutdown()
+        server.server_close()
+        store.close()
+
+    print(f"articles:      {args.size} per job, {args.latency:.2f}s stub latency, {args.rate:g} req/s shared")
+    print(f"first job:     {first:.2f}s ({args.size / first:,.0f} articles/s, fetched)")
+    print(f"warm job:      {warm:.2f}s ({args.size / warm:,.0f} articles/s, from the article store)")
+    print(f"{args.jobs} jobs:        {elapsed:.2f}s ({args.jobs * args.size / elapsed:,.0f} articles/s warm, "
+          f"latency {min(latencies):.2f}-{max(latencies):.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
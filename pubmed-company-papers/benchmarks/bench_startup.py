@@ -0,0 +1,95 @@
+"""Measure CLI startup cost with `python -X importtime` and check it against a budget."""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Set, Tuple
+
+# Code run for each scenario in a fresh interpreter
+SCENARIOS: Dict[str, str] = {
+    "help": (
+        "import sys; sys.argv = ['get-papers-list', '--help']\n"
+        "from pubmed_company_papers.cli import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass"
+    ),
+    "classify": (
+        "from pubmed_company_papers.affiliations import AffiliationAnalyzer\n"
+        "AffiliationAnalyzer.is_company_affiliation('Pfizer Inc., New York, NY, USA.')"
+    ),
+}
+
+# Heavy modules that must not load on any of the scenarios
+HEAVY_MODULES = ["Bio", "tqdm", "pandas", "multiprocessing", "sqlite3", "http.client", "ssl"]
+
+# Default budget for the import time of the package per scenario (ms)
+DEFAULT_BUDGET_MS = {"help": 75.0, "classify": 35.0}
+
+
+def run_importtime(code: str) -> Tuple[float, float, Set[str]]:
+    """
+    Run code in a fresh interpreter with -X importtime.
+
+    Returns:
+        Wall time (ms), cumulative import time of the package (ms), and the
+        names of all imported modules
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+    )
+    wall = (time.perf_counter() - start) * 1000
+
+    package_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        modules.add(name.strip())
+        # Top-level imports of the package (run from -c, so they have no indentation)
+        if name.startswith(" pubmed_company_papers") and not name.startswith("  "):
+            package_us += int(cumulative)
+    return wall, package_us / 1000, modules
+
+
+def main() -> None:
+    """Run the startup benchmark; exits with 1 if a budget is exceeded."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    parser.add_argument("--help-budget-ms", type=float, default=DEFAULT_BUDGET_MS["help"])
+    parser.add_argument("--classify-budget-ms", type=float, default=DEFAULT_BUDGET_MS["classify"])
+    args = parser.parse_args()
+    budgets = {"help": args.help_budget_ms, "classify": args.classify_budget_ms}
+
+    failures: List[str] = []
+    for scenario, code in SCENARIOS.items():
+        walls, imports = [], []
+        modules: Set[str] = set()
+        for _ in range(args.repeat):
+            wall, package_ms, modules = run_importtime(code)
+            walls.append(wall)
+            imports.append(package_ms)
+
+        heavy = [name for name in HEAVY_MODULES if name in modules]
+        package_ms = statistics.median(imports)
+        print(f"{scenario:9} wall {statistics.median(walls):6.1f} ms, "
+              f"package imports {package_ms:6.1f} ms (budget {budgets[scenario]:.0f} ms), "
+              f"heavy modules: {', '.join(heavy) or 'none'}")
+
+        if package_ms > budgets[scenario]:
+            failures.append(f"{scenario}: package imports took {package_ms:.1f} ms")
+        if heavy:
+            failures.append(f"{scenario}: loaded {', '.join(heavy)}")
+
+    for failure in failures:
+        print(f"BUDGET EXCEEDED - {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
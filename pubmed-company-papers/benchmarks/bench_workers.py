@@ -0,0 +1,65 @@
+"""Benchmark in-process parsing and classification vs. the worker process pool."""
+
+import argparse
+import os
+import time
+from io import BytesIO
+from typing import List
+
+from pubmed_company_papers.processing import ProcessingPool, process_article
+from pubmed_company_papers.xml_stream import iter_pubmed_articles
+
+from benchmarks.bench_pipeline import heavy_article
+
+
+def make_payloads(size: int, batch_size: int, authors: int) -> List[bytes]:
+    """Build raw efetch batches of articles with many uniquely affiliated authors."""
+    pmids = [str(30000000 + i) for i in range(size)]
+    payloads = []
+    for start in range(0, size, batch_size):
+        articles = "".join(heavy_article(pmid, authors) for pmid in pmids[start:start + batch_size])
+        payloads.append(f"<PubmedArticleSet>{articles}</PubmedArticleSet>".encode("utf-8"))
+    return payloads
+
+
+def in_process(payloads: List[bytes]) -> float:
+    """Parse and classify every batch in this process."""
+    start = time.perf_counter()
+    for payload in payloads:
+        for article in iter_pubmed_articles(BytesIO(payload)):
+            process_article(article)
+    return time.perf_counter() - start
+
+
+def pooled(payloads: List[bytes], workers: int) -> float:
+    """Parse and classify every batch on a worker pool (startup included)."""
+    start = time.perf_counter()
+    with ProcessingPool(workers) as pool:
+        for _ in pool.process((number, {}, payload) for number, payload in enumerate(payloads, 1)):
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the worker benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--size", type=int, default=2000)
+    parser.add_argument("-b", "--batch-size", type=int, default=50)
+    parser.add_argument("-a", "--authors", type=int, default=40, help="Authors per article")
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.size, args.batch_size, args.authors)
+    baseline = in_process(payloads)
+
+    print(f"articles:   {args.size} with {args.authors} authors, {len(payloads)} batches, "
+          f"{os.cpu_count()} CPUs")
+    print(f"in-process: {baseline:.2f}s ({args.size / baseline:.0f} articles/s)")
+    for workers in args.workers:
+        elapsed = pooled(payloads, workers)
+        print(f"{workers} workers:  {elapsed:.2f}s ({args.size / elapsed:.0f} articles/s, "
+              f"{baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Benchmark suite: time every processing stage on synthetic corpora and compare runs.
+
+Each corpus size runs in its own child process, so its peak RSS is not inflated
+by earlier sizes. The corpus is streamed in chunks, which keeps memory bounded
+at 1M articles; stage times are summed over the chunks.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pubmed_company_papers.affiliations import AffiliationAnalyzer
+from pubmed_company_papers.cli import process_articles
+from pubmed_company_papers.dumps import iter_dump_articles
+from pubmed_company_papers.output import OutputHandler
+from pubmed_company_papers.parser import PubMedParser
+
+from benchmarks.synthetic import SyntheticCorpus
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+# Articles materialized at a time
+CHUNK_SIZE = 10000
+
+# Stages in the order they run; xml and parser together are what the CLI does before classifying
+STAGES = ["xml", "parser", "classifier", "process_articles", "create_csv"]
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def iter_chunks(path: str) -> Iterator[List[Dict[str, Any]]]:
+    """Stream the corpus file in chunks of parsed articles."""
+    articles = iter_dump_articles(path)
+    while True:
+        chunk = list(islice(articles, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Run a function, returning its result and the elapsed seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def traced_peak(func: Callable[..., Any], *args: Any) -> float:
+    """Run a function under tracemalloc, returning its peak allocation in MB."""
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def classify_all(records: List[Any]) -> None:
+    """Run the classifier over the authors of every record."""
+    for record in records:
+        AffiliationAnalyzer.identify_company_authors(record.authors)
+
+
+def max_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def run_size(path: str, csv_path: str) -> Dict[str, Any]:
+    """
+    Time every stage on one corpus file.
+
+    The file is read twice: once timing the stages one by one and once timing
+    the CLI path (process_articles and create_csv). The verdict cache is reset
+    before each pass, so neither pass profits from the other's cache. Peak
+    traced memory of each stage is measured separately on the first chunk, as
+    tracemalloc slows the code it traces.
+
+    Args:
+        path: efetch XML file
+        csv_path: Scratch CSV file
+
+    Returns:
+        Article/author counts, stage timings and memory figures
+    """
+    seconds = dict.fromkeys(STAGES, 0.0)
+    articles = authors = rows = 0
+
+    AffiliationAnalyzer.configure_cache(AffiliationAnalyzer.DEFAULT_CACHE_SIZE)
+    chunks = iter_chunks(path)
+    while True:
+        chunk, elapsed = timed(next, chunks, None)
+        if chunk is None:
+            break
+        seconds["xml"] += elapsed
+        records, elapsed = timed(lambda: [PubMedParser.extract_article(article) for article in chunk])
+        seconds["parser"] += elapsed
+        seconds["classifier"] += timed(classify_all, records)[1]
+        articles += len(records)
+        authors += sum(len(record.authors) for record in records)
+
+    AffiliationAnalyzer.configure_cache(AffiliationAnalyzer.DEFAULT_CACHE_SIZE)
+    for chunk in iter_chunks(path):
+        results, elapsed = timed(process_articles, chunk)
+        seconds["process_articles"] += elapsed
+        seconds["create_csv"] += timed(OutputHandler.create_csv, results, csv_path)[1]
+        rows += len(results)
+
+    # Per-stage peak memory on a cold cache, from the first chunk
+    AffiliationAnalyzer.configure_cache(AffiliationAnalyzer.DEFAULT_CACHE_SIZE)
+    chunk = next(iter_chunks(path))
+    records = [PubMedParser.extract_article(article) for article in chunk]
+    results = process_articles(chunk)
+    peaks = {
+        "xml": traced_peak(lambda: next(iter_chunks(path))),
+        "parser": traced_peak(lambda: [PubMedParser.extract_article(article) for article in chunk]),
+        "classifier": traced_peak(classify_all, records),
+        "process_articles": traced_peak(process_articles, chunk),
+        "create_csv": traced_peak(OutputHandler.create_csv, results, csv_path),
+    }
+
+    return {
+        "articles": articles,
+        "authors": authors,
+        "rows": rows,
+        "max_rss_mb": round(max_rss_mb(), 1),
+        "stages": {
+            stage: {
+                "seconds": round(seconds[stage], 4),
+                "articles_per_second": round(articles / seconds[stage]) if seconds[stage] else None,
+                "peak_mb": round(peaks[stage], 2),
+            }
+            for stage in STAGES
+        },
+    }
+
+
+def corpus_file(data_dir: str, size: int, corpus: SyntheticCorpus) -> str:
+    """Generate the corpus file for a size, reusing one generated with the same settings."""
+    name = (f"synthetic-{size}-a{corpus.authors_per_article:g}-c{corpus.company_share:g}"
+            f"-e{corpus.email_density:g}-s{corpus.seed}.xml.gz")
+    path = os.path.join(data_dir, name)
+    if not os.path.exists(path):
+        print(f"generating {size} articles -> {path}", file=sys.stderr)
+        partial = path.replace(".xml.gz", ".part.xml.gz")
+        corpus.write_file(partial, size)
+        os.replace(partial, path)
+    return path
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree, if it is a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Print the current run against a baseline run.
+
+    A stage regresses if its throughput drops, or its peak memory grows, by
+    more than the threshold.
+
+    Args:
+        current: Results of this run
+        baseline: Results of the baseline run
+        threshold: Tolerated relative change (0.1 = 10%)
+
+    Returns:
+        Descriptions of the regressions
+    """
+    regressions = []
+    print(f"\ncompared with {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}):")
+    for size, result in current["results"].items():
+        base = baseline["results"].get(size)
+        if base is None:
+            continue
+        for stage, stats in result["stages"].items():
+            base_stats = base["stages"].get(stage)
+            if not base_stats or not base_stats["articles_per_second"] or not stats["articles_per_second"]:
+                continue
+            speed = stats["articles_per_second"] / base_stats["articles_per_second"]
+            memory = stats["peak_mb"] / base_stats["peak_mb"] if base_stats["peak_mb"] else 1.0
+            flags = []
+            if speed < 1 - threshold:
+                flags.append("SLOWER")
+            if memory > 1 + threshold:
+                flags.append("MORE MEMORY")
+            print(f"  {size:>8} {stage:<17} throughput x{speed:.2f}  peak memory x{memory:.2f}  {' '.join(flags)}")
+            if flags:
+                regressions.append(f"{stage} at {size} articles: {', '.join(flags).lower()}")
+    return regressions
+
+
+def fastest(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge repeated runs of a size, keeping each stage's fastest time and lowest peak."""
+    result = runs[0]
+    for stage, stats in result["stages"].items():
+        stats["seconds"] = min(run["stages"][stage]["seconds"] for run in runs)
+        stats["peak_mb"] = min(run["stages"][stage]["peak_mb"] for run in runs)
+        stats["articles_per_second"] = round(result["articles"] / stats["seconds"]) if stats["seconds"] else None
+    result["max_rss_mb"] = min(run["max_rss_mb"] for run in runs)
+    result["repeat"] = len(runs)
+    return result
+
+
+def report(size: str, result: Dict[str, Any]) -> None:
+    """Print the results of one size."""
+    print(f"\n{size} articles, {result['authors']} authors, {result['rows']} rows, "
+          f"max RSS {result['max_rss_mb']:.0f} MB")
+    for stage, stats in result["stages"].items():
+        print(f"  {stage:<17} {stats['seconds']:8.2f}s {stats['articles_per_second'] or 0:>9} articles/s"
+              f"  peak {stats['peak_mb']:7.1f} MB on the first chunk")
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=DEFAULT_SIZES, help="Comma-separated corpus sizes (default: 1000,100000,1000000)")
+    parser.add_argument("-a", "--authors", type=float, default=6.0, help="Mean authors per article")
+    parser.add_argument("--company-share", type=float, default=0.15)
+    parser.add_argument("--email-density", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="Runs per size, keeping the fastest")
+    parser.add_argument("--data-dir", help="Directory keeping generated corpora between runs (default: temporary)")
+    parser.add_argument("-o", "--output", help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Results file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown or memory growth reported as a regression (default: 0.1)")
+    parser.add_argument("--run-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_file:
+        # Child process: measure a single corpus and hand the result back on stdout
+        with tempfile.TemporaryDirectory() as tmpdir:
+            print(json.dumps(run_size(args.run_file, os.path.join(tmpdir, "results.csv"))))
+        return
+
+    corpus = SyntheticCorpus(args.authors, args.company_share, email_density=args.email_density, seed=args.seed)
+    timestamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+    current: Dict[str, Any] = {
+        "meta": {
+            "timestamp": timestamp,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "chunk_size": CHUNK_SIZE,
+            "corpus": vars(corpus),
+        },
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = args.data_dir or tmpdir
+        os.makedirs(data_dir, exist_ok=True)
+        for size in args.sizes:
+            path = corpus_file(data_dir, size, corpus)
+            runs = []
+            for _ in range(args.repeat):
+                child = subprocess.run([sys.executable, "-m", "benchmarks.suite", "--run-file", path],
+                                       stdout=subprocess.PIPE, check=True, text=True)
+                runs.append(json.loads(child.stdout))
+            result = fastest(runs)
+            current["results"][str(size)] = result
+            report(str(size), result)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{timestamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(current, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {'; '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""Generator of realistic synthetic PubMed efetch XML for benchmarks."""
+
+import argparse
+import gzip
+import random
+from typing import IO, Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from benchmarks.bench_classifier import ACADEMIC_SITES, COMPANY_SITES
+
+# Sites without company or academic keywords, classified by their e-mail domain only
+HOSPITAL_SITES = [
+    "Department of Cardiology, Massachusetts General Hospital, Boston, MA, USA",
+    "Charité - Universitätsmedizin Berlin, Berlin, Germany",
+    "Centre Hospitalier Universitaire de Nantes, Nantes, France",
+    "Seoul National University Hospital, Seoul, Korea",
+]
+
+EMAIL_DOMAINS = {
+    "company": ["pfizer.com", "gene.com", "astrazeneca.com", "novartis.com", "regeneron.com"],
+    "academic": ["stanford.edu", "hms.harvard.edu", "nih.gov", "u-tokyo.ac.jp", "ox.ac.uk"],
+    "hospital": ["mgh.harvard.edu", "charite.de", "chu-nantes.fr", "snuh.org"],
+}
+
+LAST_NAMES = ["Smith", "Wang", "Garcia", "Müller", "Kim", "Rossi", "Nguyen", "Patel", "Cohen", "Silva"]
+FORE_NAMES = ["John", "Wei", "Maria", "Anna", "Ji-Hoon", "Luca", "Thi", "Priya", "David", "Ana"]
+TITLE_WORDS = ["inhibitor", "cohort", "randomized", "tumor", "expression", "kinase", "trial",
+               "antibody", "phase", "response", "pathway", "receptor", "outcomes", "variant"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+class SyntheticCorpus:
+    """Reproducible stream of synthetic <PubmedArticle> records."""
+
+    def __init__(self, authors_per_article: float = 6.0, company_share: float = 0.15,
+                 hospital_share: float = 0.2, email_density: float = 0.1,
+                 multi_affiliation_share: float = 0.1, seed: int = 42):
+        """
+        Configure the corpus.
+
+        Args:
+            authors_per_article: Mean number of authors per article (at least one)
+            company_share: Share of author affiliations at a company
+            hospital_share: Share of author affiliations at a hospital; the rest are academic
+            email_density: Share of affiliations ending with an e-mail address
+            multi_affiliation_share: Share of authors listing a second affiliation
+            seed: Random seed
+        """
+        self.authors_per_article = authors_per_article
+        self.company_share = company_share
+        self.hospital_share = hospital_share
+        self.email_density = email_density
+        self.multi_affiliation_share = multi_affiliation_share
+        self.seed = seed
+
+    def _affiliation(self, rng: random.Random, index: int) -> str:
+        """Draw one affiliation line, unique enough that caches do not see every repeat."""
+        draw = rng.random()
+        if draw < self.company_share:
+            kind, site = "company", rng.choice(COMPANY_SITES)
+        elif draw < self.company_share + self.hospital_share:
+            kind, site = "hospital", rng.choice(HOSPITAL_SITES)
+        else:
+            kind, site = "academic", rng.choice(ACADEMIC_SITES)
+
+        # Real affiliations repeat often but not always verbatim (lab names, postcodes)
+        if rng.random() < 0.3:
+            site = f"Laboratory {rng.randint(1, 500)}, {site}"
+        if rng.random() < self.email_density:
+            site = f"{site}. author{index}@{rng.choice(EMAIL_DOMAINS[kind])}"
+        return escape(site)
+
+    def _pub_date(self, rng: random.Random) -> str:
+        """Draw a publication date in one of the shapes PubMed uses."""
+        year = rng.randint(1990, 2024)
+        shape = rng.random()
+        if shape < 0.6:
+            return f"<Year>{year}</Year><Month>{rng.choice(MONTHS)}</Month><Day>{rng.randint(1, 28)}</Day>"
+        if shape < 0.9:
+            return f"<Year>{year}</Year><Month>{rng.choice(MONTHS)}</Month>"
+        if shape < 0.97:
+            return f"<Year>{year}</Year>"
+        return f"<MedlineDate>{year} {rng.choice(MONTHS)}-{rng.choice(MONTHS)}</MedlineDate>"
+
+    def _author_count(self, rng: random.Random) -> int:
+        """Draw an author count with a long tail (consortium papers)."""
+        count = max(1, int(rng.expovariate(1 / self.authors_per_article) + 0.5))
+        return min(count, 500)
+
+    def iter_articles(self, size: int, first_pmid: int = 30000000) -> Iterator[str]:
+        """
+        Generate articles.
+
+        Args:
+            size: Number of articles
+            first_pmid: PMID of the first article
+
+        Yields:
+            <PubmedArticle> XML strings
+        """
+        rng = random.Random(self.seed)
+        for number in range(size):
+            authors = []
+            for index in range(self._author_count(rng)):
+                affiliations = [self._affiliation(rng, index)]
+                if rng.random() < self.multi_affiliation_share:
+                    affiliations.append(self._affiliation(rng, index))
+                affiliation_xml = "".join(
+                    f"<AffiliationInfo><Affiliation>{affiliation}</Affiliation></AffiliationInfo>"
+                    for affiliation in affiliations
+                )
+                authors.append(
+                    f'<Author ValidYN="Y"><LastName>{rng.choice(LAST_NAMES)}</LastName>'
+                    f"<ForeName>{rng.choice(FORE_NAMES)}</ForeName>"
+                    f"<Initials>{rng.choice(FORE_NAMES)[0]}</Initials>{affiliation_xml}</Author>"
+                )
+
+            words = rng.sample(TITLE_WORDS, 5)
+            title = f"{words[0].capitalize()} of <i>{words[1]}</i> {' '.join(words[2:])} (study {number})."
+            yield (
+                f'<PubmedArticle><MedlineCitation Status="MEDLINE" Owner="NLM">'
+                f'<PMID Version="1">{first_pmid + number}</PMID><Article PubModel="Print">'
+                f"<Journal><JournalIssue CitedMedium=\"Internet\"><PubDate>{self._pub_date(rng)}</PubDate>"
+                f"</JournalIssue><Title>Journal {rng.randint(1, 300)}</Title></Journal>"
+                f"<ArticleTitle>{title}</ArticleTitle>"
+                f"<Abstract><AbstractText>{' '.join(rng.choices(TITLE_WORDS, k=60))}</AbstractText></Abstract>"
+                f'<AuthorList CompleteYN="Y">{"".join(authors)}</AuthorList>'
+                f"</Article></MedlineCitation><PubmedData><PublicationStatus>ppublish</PublicationStatus>"
+                f"</PubmedData></PubmedArticle>\n"
+            )
+
+    def write(self, handle: IO[str], size: int, first_pmid: int = 30000000) -> None:
+        """
+        Write an efetch document.
+
+        Args:
+            handle: Text file to write to
+            size: Number of articles
+            first_pmid: PMID of the first article
+        """
+        handle.write('<?xml version="1.0" ?>\n<!DOCTYPE PubmedArticleSet PUBLIC '
+                     '"-//NLM//DTD PubMedArticle, 1st January 2024//EN" '
+                     '"https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_240101.dtd">\n<PubmedArticleSet>\n')
+        for article in self.iter_articles(size, first_pmid):
+            handle.write(article)
+        handle.write("</PubmedArticleSet>\n")
+
+    def write_file(self, path: str, size: int, first_pmid: int = 30000000) -> None:
+        """
+        Write an efetch document to a file (gzipped if the name ends with .gz).
+
+        Args:
+            path: Output file
+            size: Number of articles
+            first_pmid: PMID of the first article
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt", encoding="utf-8") as handle:  # type: ignore[operator]
+            self.write(handle, size, first_pmid)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Write a synthetic efetch file."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", help="Output file (.xml or .xml.gz)")
+    parser.add_argument("-n", "--size", type=int, default=10000)
+    parser.add_argument("-a", "--authors", type=float, default=6.0, help="Mean authors per article")
+    parser.add_argument("--company-share", type=float, default=0.15)
+    parser.add_argument("--hospital-share", type=float, default=0.2)
+    parser.add_argument("--email-density", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    corpus = SyntheticCorpus(args.authors, args.company_share, args.hospital_share,
+                             args.email_density, seed=args.seed)
+    corpus.write_file(args.output, args.size)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,9 +1,14 @@
 """Module for analyzing author affiliations to identify company affiliations."""
 
-from typing import Dict, List, Set, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Set, Tuple, Union, Any, cast
+import hashlib
 import re
 import logging
 
+from pubmed_company_papers.cache import LRUCache
+from pubmed_company_papers.records import STRING_POOL, AuthorRecord
+from pubmed_company_papers.verdict_store import VerdictStore
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,72 @@ class AffiliationAnalyzer:
         'edu.hk', 'ac.ir', 'ac.kr', 'edu.tw', 'edu.in', 'ac.za'
     }
     
+    # Email domain pattern shared by the classifier
+    EMAIL_DOMAIN_PATTERN = re.compile(r'[\w\.-]+@([\w\.-]+)')
+    
+    # Top-level domains that suggest a commercial email address
+    COMMERCIAL_EMAIL_SUFFIXES = ('.com', '.co')
+    
+    # Patterns used by extract_company_name: a company name followed by a legal or
+    # industry suffix, a .com email domain, and the email addresses and postal
+    # codes removed from affiliations matching neither
+    COMPANY_SUFFIX_PATTERN = re.compile(
+        r'([\w\s\-&]+)\s+(Inc\.|Corp\.|LLC|Ltd\.|GmbH|AG|SA|BV|Holdings|Pharmaceuticals|Pharma|Biotech)',
+        re.IGNORECASE
+    )
+    COMPANY_EMAIL_PATTERN = re.compile(r'[\w\.-]+@([\w\.-]+)\.com', re.IGNORECASE)
+    EMAIL_ADDRESS_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+    POSTAL_CODE_PATTERN = re.compile(r'\b\d{5}\b|\b\d{5}-\d{4}\b')
+
+    # Compiled classifier state, populated by compile_rules()
+    _rules_compiled = False
+    _company_pattern: Pattern[str]
+    _academic_pattern: Pattern[str]
+    _academic_domain_suffixes: Tuple[str, ...]
+    
+    # Default number of memoized affiliation verdicts
+    DEFAULT_CACHE_SIZE = 10000
+    
+    # Memoized (is_company, company_name) verdicts keyed on normalized affiliations
+    _verdict_cache: Optional[LRUCache] = LRUCache(DEFAULT_CACHE_SIZE)
+    
+    # Optional persistent verdict store shared across runs
+    _verdict_store: Optional[VerdictStore] = None
+
+    @staticmethod
+    def _compile_keywords(keywords: Set[str]) -> Pattern[str]:
+        """
+        Compile a keyword set into a single word-bounded alternation.
+        
+        Args:
+            keywords: Lowercase keywords to match
+            
+        Returns:
+            Compiled pattern matching any keyword as a whole word
+        """
+        # Longest first so the leftmost match prefers the most specific keyword
+        ordered = sorted(keywords, key=lambda keyword: (-len(keyword), keyword))
+        alternation = '|'.join(re.escape(keyword) for keyword in ordered)
+        return re.compile(r'\b(?:' + alternation + r')\b')
+    
+    @classmethod
+    def compile_rules(cls) -> None:
+        """
+        Compile the keyword and email domain rules used by the classifier.
+        
+        Rules are compiled lazily on first use; call this again after changing
+        COMPANY_KEYWORDS, ACADEMIC_KEYWORDS or ACADEMIC_EMAIL_DOMAINS.
+        """
+        cls._company_pattern = cls._compile_keywords(cls.COMPANY_KEYWORDS)
+        cls._academic_pattern = cls._compile_keywords(cls.ACADEMIC_KEYWORDS)
+        cls._academic_domain_suffixes = tuple(sorted(cls.ACADEMIC_EMAIL_DOMAINS))
+        cls._rules_compiled = True
+        
+        logger.debug(
+            f"Compiled {len(cls.COMPANY_KEYWORDS)} company and "
+            f"{len(cls.ACADEMIC_KEYWORDS)} academic keywords"
+        )
+    
     @classmethod
     def is_company_affiliation(cls, affiliation: str) -> bool:
         """
@@ -46,37 +117,51 @@ class AffiliationAnalyzer:
         if not affiliation:
             return False
         
+        # Compile per class so subclasses with their own keyword sets stay separate
+        if not cls.__dict__.get("_rules_compiled", False):
+            cls.compile_rules()
+        
         # Convert to lowercase for case-insensitive matching
         affiliation_lower = affiliation.lower()
         
-        # Check for company keywords
-        for keyword in cls.COMPANY_KEYWORDS:
-            # Use word boundaries to avoid partial matches
-            if re.search(r'\b' + re.escape(keyword) + r'\b', affiliation_lower):
-                return True
+        # Check for company keywords (word boundaries avoid partial matches)
+        if cls._company_pattern.search(affiliation_lower):
+            return True
         
         # Check for academic keywords (negative indicator)
-        for keyword in cls.ACADEMIC_KEYWORDS:
-            if re.search(r'\b' + re.escape(keyword) + r'\b', affiliation_lower):
-                return False
+        if cls._academic_pattern.search(affiliation_lower):
+            return False
         
         # Check for email domains
-        email_match = re.search(r'[\w\.-]+@([\w\.-]+)', affiliation_lower)
+        email_match = cls.EMAIL_DOMAIN_PATTERN.search(affiliation_lower)
         if email_match:
             domain = email_match.group(1)
             
             # Check if it's an academic domain
-            for academic_domain in cls.ACADEMIC_EMAIL_DOMAINS:
-                if domain.endswith(academic_domain):
-                    return False
+            if domain.endswith(cls._academic_domain_suffixes):
+                return False
             
             # If it has a commercial TLD and not an academic domain, it might be a company
-            if domain.endswith('.com') or domain.endswith('.co'):
+            if domain.endswith(cls.COMMERCIAL_EMAIL_SUFFIXES):
                 return True
         
         # Default to False if no clear indicators
         return False
     
+    @classmethod
+    def classify_many(cls, affiliations: Iterable[str]) -> List[bool]:
+        """
+        Classify a batch of affiliations in one call.
+        
+        Args:
+            affiliations: Affiliation strings
+            
+        Returns:
+            List of verdicts in the same order as the input
+        """
+        is_company = cls.is_company_affiliation
+        return [is_company(affiliation) for affiliation in affiliations]
+    
     @classmethod
     def extract_company_name(cls, affiliation: str) -> str:
         """
@@ -94,13 +179,12 @@ class AffiliationAnalyzer:
         # Try to extract company name using common patterns
         
         # Pattern 1: Company name followed by Inc./Corp./etc.
-        company_suffix_pattern = r'([\w\s\-&]+)\s+(Inc\.|Corp\.|LLC|Ltd\.|GmbH|AG|SA|BV|Holdings|Pharmaceuticals|Pharma|Biotech)'
-        match = re.search(company_suffix_pattern, affiliation, re.IGNORECASE)
+        match = cls.COMPANY_SUFFIX_PATTERN.search(affiliation)
         if match:
             return match.group(0).strip()
         
         # Pattern 2: Email domain might indicate company name
-        email_match = re.search(r'[\w\.-]+@([\w\.-]+)\.com', affiliation, re.IGNORECASE)
+        email_match = cls.COMPANY_EMAIL_PATTERN.search(affiliation)
         if email_match:
             domain = email_match.group(1)
             # Convert domain to a readable company name
@@ -109,19 +193,164 @@ class AffiliationAnalyzer:
         
         # If no patterns match, return a cleaned version of the affiliation
         # Remove email addresses
-        cleaned = re.sub(r'[\w\.-]+@[\w\.-]+\.\w+', '', affiliation)
+        cleaned = cls.EMAIL_ADDRESS_PATTERN.sub('', affiliation)
         # Remove postal addresses
-        cleaned = re.sub(r'\b\d{5}\b|\b\d{5}-\d{4}\b', '', cleaned)
+        cleaned = cls.POSTAL_CODE_PATTERN.sub('', cleaned)
         
         return cleaned.strip()
     
+    @staticmethod
+    def normalize_affiliation(affiliation: str) -> str:
+        """
+        Normalize an affiliation string for classification and use as a cache key.
+        
+        Case is kept, since extracted company names keep the casing of the affiliation.
+        
+        Args:
+            affiliation: Affiliation string
+            
+        Returns:
+            Affiliation with whitespace runs collapsed to single spaces
+        """
+        return " ".join(affiliation.split())
+    
+    @classmethod
+    def configure_cache(cls, maxsize: int) -> None:
+        """
+        Replace the verdict cache with a new, empty one.
+        
+        Args:
+            maxsize: Maximum number of cached verdicts; 0 or less disables caching
+        """
+        cls._verdict_cache = LRUCache(maxsize) if maxsize > 0 else None
+        logger.debug(f"Affiliation verdict cache size set to {maxsize}")
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        """
+        Get the verdict cache counters.
+        
+        Returns:
+            Dictionary with hits, misses, evictions, size and maxsize (empty if disabled)
+        """
+        if cls._verdict_cache is None:
+            return {}
+        return cls._verdict_cache.stats()
+    
+    @classmethod
+    def rule_set_version(cls) -> str:
+        """
+        Compute a version stamp for the current classification rules.
+        
+        Returns:
+            Short hash that changes whenever any keyword set, email domain or
+            suffix, or company name pattern changes
+        """
+        digest = hashlib.sha256()
+        for rules in (cls.COMPANY_KEYWORDS, cls.ACADEMIC_KEYWORDS, cls.ACADEMIC_EMAIL_DOMAINS,
+                      cls.COMMERCIAL_EMAIL_SUFFIXES):
+            digest.update("\x1f".join(sorted(rules)).encode("utf-8"))
+            digest.update(b"\x1e")
+        for pattern in (cls.EMAIL_DOMAIN_PATTERN, cls.COMPANY_SUFFIX_PATTERN, cls.COMPANY_EMAIL_PATTERN,
+                        cls.EMAIL_ADDRESS_PATTERN, cls.POSTAL_CODE_PATTERN):
+            digest.update(f"{pattern.flags}:{pattern.pattern}".encode("utf-8"))
+            digest.update(b"\x1e")
+        return digest.hexdigest()[:16]
+    
+    @classmethod
+    def open_store(cls, path: str, batch_size: int = 1000) -> VerdictStore:
+        """
+        Open a persistent verdict store for the current rules and attach it.
+        
+        Args:
+            path: Path to the SQLite database file
+            batch_size: Number of new verdicts to buffer before each write
+            
+        Returns:
+            The attached verdict store
+        """
+        store = VerdictStore(path, cls.rule_set_version(), batch_size=batch_size)
+        cls.attach_store(store)
+        return store
+    
     @classmethod
-    def identify_company_authors(cls, authors: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    def attach_store(cls, store: Optional[VerdictStore]) -> None:
+        """
+        Attach a persistent verdict store and preload its most used entries.
+        
+        Args:
+            store: Verdict store to consult on cache misses, or None to detach
+        """
+        cls._verdict_store = store
+        if store is None or cls._verdict_cache is None:
+            return
+        
+        hot_entries = store.load_hot(cls._verdict_cache.maxsize)
+        for key, verdict in reversed(hot_entries):
+            cls._verdict_cache.put(key, verdict)
+        logger.debug(f"Preloaded {len(hot_entries)} verdicts from {store.path}")
+    
+    @classmethod
+    def flush_store(cls) -> None:
+        """Write buffered verdicts of the attached verdict store, if any."""
+        if cls._verdict_store is not None:
+            cls._verdict_store.flush()
+    
+    @classmethod
+    def close_store(cls) -> None:
+        """Flush and close the attached verdict store, if any."""
+        store = cls._verdict_store
+        cls._verdict_store = None
+        if store is not None:
+            store.close()
+    
+    @classmethod
+    def analyze_affiliation(cls, affiliation: str) -> Tuple[bool, str]:
+        """
+        Classify an affiliation and extract its company name, using the verdict cache.
+        
+        Args:
+            affiliation: Affiliation string
+            
+        Returns:
+            Tuple containing (whether the affiliation is a company, company name or "")
+        """
+        # The verdict is computed from the key, so every variant sharing it gets the same one
+        key = cls.normalize_affiliation(affiliation)
+        cache = cls._verdict_cache
+        store = cls._verdict_store
+        if cache is None and store is None:
+            return cls._analyze_uncached(key)
+        
+        verdict = cache.get(key) if cache is not None else None
+        if verdict is not None:
+            return cast(Tuple[bool, str], verdict)
+        
+        verdict = store.get(key) if store is not None else None
+        if verdict is None:
+            verdict = cls._analyze_uncached(key)
+            if store is not None:
+                store.put(key, verdict)
+        if cache is not None:
+            cache.put(key, verdict)
+        return verdict
+    
+    @classmethod
+    def _analyze_uncached(cls, affiliation: str) -> Tuple[bool, str]:
+        """Classify an affiliation and extract its company name without caching."""
+        if not cls.is_company_affiliation(affiliation):
+            return False, ""
+        return True, STRING_POOL.intern(cls.extract_company_name(affiliation))
+    
+    @classmethod
+    def identify_company_authors(
+        cls, authors: Sequence[Union[AuthorRecord, Dict[str, Any]]]
+    ) -> Tuple[List[str], List[str]]:
         """
         Identify authors affiliated with companies.
         
         Args:
-            authors: List of author dictionaries with affiliations
+            authors: Author records or author dictionaries with affiliations
             
         Returns:
             Tuple containing (list of company-affiliated author names, list of company names)
@@ -132,10 +361,15 @@ class AffiliationAnalyzer:
         for author in authors:
             has_company_affiliation = False
             
-            for affiliation in author.get("affiliations", []):
-                if cls.is_company_affiliation(affiliation):
+            if isinstance(author, AuthorRecord):
+                affiliations: Iterable[str] = author.affiliations
+            else:
+                affiliations = author.get("affiliations", [])
+            
+            for affiliation in affiliations:
+                is_company, company_name = cls.analyze_affiliation(affiliation)
+                if is_company:
                     has_company_affiliation = True
-                    company_name = cls.extract_company_name(affiliation)
                     if company_name:
                         company_names.add(company_name)
             
@@ -1,17 +1,53 @@
 """Module for interacting with the PubMed API."""
 
-from typing import Dict, List, Optional, Union
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
+import datetime
 import time
 import logging
-from Bio import Entrez
+import xml.etree.ElementTree as ET
+
+from pubmed_company_papers.article_store import ArticleStore
+from pubmed_company_papers.batching import AdaptiveBatchSizer
+from pubmed_company_papers.pipeline import iter_in_thread
+from pubmed_company_papers.ratelimit import TokenBucket
+from pubmed_company_papers.response_cache import ResponseCache
+from pubmed_company_papers.retry import FetchReport, RawBatch, RetryPolicy, batch_size, remaining_params
+from pubmed_company_papers.stats import STATS
+from pubmed_company_papers.transport import DEFAULT_TOOL, Transport, default_transport
+from pubmed_company_papers.xml_stream import (
+    article_pmid,
+    iter_pubmed_articles,
+    iter_pubmed_elements,
+    serialize_article,
+    wrap_articles,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# esearch only returns the first 10,000 hits of a search (retstart + retmax)
+ESEARCH_MAX_RECORDS = 10000
+
+def __getattr__(name: str) -> Any:
+    """Import Bio.Entrez on first access of `api.Entrez`, keeping the module import cheap."""
+    if name == "Entrez":
+        from Bio import Entrez
+        return Entrez
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 class PubMedAPI:
     """Class to handle interactions with the PubMed API."""
     
-    def __init__(self, email: str, tool: str = "PubMedCompanyPapers", api_key: Optional[str] = None):
+    def __init__(self, email: str, tool: str = DEFAULT_TOOL, api_key: Optional[str] = None,
+                 eutils_url: Optional[str] = None, rate_limiter: Optional[TokenBucket] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 article_store: Optional[ArticleStore] = None,
+                 batch_sizer: Optional[AdaptiveBatchSizer] = None,
+                 transport: Optional[Transport] = None):
         """
         Initialize the PubMed API handler.
         
@@ -19,12 +55,34 @@ class PubMedAPI:
             email: Email address to identify yourself to NCBI
             tool: Name of the tool/application
             api_key: Optional NCBI API key for higher request limits
+            eutils_url: Optional base URL of an E-utilities compatible server
+                (e.g. a local stub); requests go through Biopython's Entrez when unset
+            rate_limiter: Optional shared limiter; defaults to NCBI's limit for the key
+            response_cache: Optional on-disk cache of esearch results and article XML
+            retry_policy: Optional policy for retrying failed requests; defaults to
+                five attempts with jittered exponential backoff
+            article_store: Optional local store of parsed articles; stored PMIDs
+                are served from it and fetched articles are added to it
+            batch_sizer: Optional controller that sizes each efetch batch from the
+                latency and payload size of earlier ones; the batch_size arguments
+                then only set the size of the first batches
+            transport: Optional transport issuing the requests (e.g. replaying
+                recorded responses); defaults to Entrez, or HTTP for eutils_url
         """
         self.email = email
         self.tool = tool
         self.api_key = api_key
+        self.eutils_url = eutils_url.rstrip("/") if eutils_url else None
+        self.rate_limiter = rate_limiter or TokenBucket.for_ncbi(api_key)
+        self.response_cache = response_cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.article_store = article_store
+        self.batch_sizer = batch_sizer
+        self.transport = transport or default_transport(self.eutils_url, tool, email, api_key)
+        self.last_fetch = FetchReport()
         
-        # Set up Entrez
+        # Set up Entrez (imported here so that loading the module stays cheap)
+        from Bio import Entrez
         Entrez.email = email
         Entrez.tool = tool
         if api_key:
@@ -32,7 +90,68 @@ class PubMedAPI:
             
         logger.debug(f"Initialized PubMed API with email: {email}")
     
-    def search(self, query: str, retmax: int = 100, debug: bool = False) -> List[str]:
+    def _open_eutils(self, utility: str, **params: Any) -> IO[bytes]:
+        """
+        Issue an E-utilities request and return the response handle.
+        
+        Args:
+            utility: E-utility name (e.g. "esearch", "efetch")
+            **params: Request parameters
+            
+        Returns:
+            Binary handle with the response body
+        """
+        return self.transport.open(utility, params)
+    
+    def _read_eutils(self, utility: str, **params: Any) -> Any:
+        """
+        Issue a rate-limited E-utilities request and parse it with Entrez.read.
+        
+        The request and its parsing are timed together as the utility's stage.
+        
+        Args:
+            utility: E-utility name
+            **params: Request parameters
+            
+        Returns:
+            Parsed Entrez record
+        """
+        from Bio import Entrez
+        
+        with STATS.timer("rate_limit"):
+            self.rate_limiter.acquire()
+        with STATS.timer(utility):
+            handle = self._open_eutils(utility, **params)
+            try:
+                return Entrez.read(handle)
+            finally:
+                handle.close()
+    
+    @staticmethod
+    def _date_params(mindate: Optional[str], maxdate: Optional[str], datetype: str) -> Dict[str, str]:
+        """
+        Build esearch date-range parameters.
+        
+        Args:
+            mindate: Start of the range (YYYY/MM/DD, YYYY/MM or YYYY), or None
+            maxdate: End of the range; defaults to today when only mindate is given
+            datetype: Date field to filter on (e.g. "edat" for the Entrez date)
+            
+        Returns:
+            Dictionary of date parameters (empty when no range is given)
+        """
+        if mindate is None and maxdate is None:
+            return {}
+        # esearch ignores a range unless both ends are set
+        return {
+            "datetype": datetype,
+            "mindate": mindate or "1800/01/01",
+            "maxdate": maxdate or datetime.date.today().strftime("%Y/%m/%d")
+        }
+    
+    def search(self, query: str, retmax: int = 100, debug: bool = False,
+               mindate: Optional[str] = None, maxdate: Optional[str] = None,
+               datetype: str = "edat") -> List[str]:
         """
         Search PubMed for articles matching the query.
         
@@ -40,6 +159,9 @@ class PubMedAPI:
             query: PubMed search query
             retmax: Maximum number of results to return
             debug: Whether to print debug information
+            mindate: Optional start of a date range (YYYY/MM/DD)
+            maxdate: Optional end of a date range (defaults to today if mindate is set)
+            datetype: Date field the range applies to (default: Entrez date)
             
         Returns:
             List of PubMed IDs matching the query
@@ -47,14 +169,24 @@ class PubMedAPI:
         if debug:
             logger.debug(f"Searching PubMed with query: {query}")
         
+        params: Dict[str, Any] = {"db": "pubmed", "term": query, "retmax": retmax}
+        params.update(self._date_params(mindate, maxdate, datetype))
+        if self.response_cache is not None:
+            cached = self.response_cache.get_search(params)
+            if cached is not None:
+                if debug:
+                    logger.debug(f"Found {len(cached)} articles (cached)")
+                return cast(List[str], cached)
+        
         try:
             # Search for articles
-            handle = Entrez.esearch(db="pubmed", term=query, retmax=retmax)
-            record = Entrez.read(handle)
-            handle.close()
+            record = self.retry_policy.call(lambda: self._read_eutils("esearch", **params))
             
             pmids = record["IdList"]
             
+            if self.response_cache is not None:
+                self.response_cache.put_search(params, [str(pmid) for pmid in pmids])
+            
             if debug:
                 logger.debug(f"Found {len(pmids)} articles")
                 
@@ -64,6 +196,42 @@ class PubMedAPI:
             logger.error(f"Error searching PubMed: {e}")
             raise
     
+    def search_page(self, query: str, retstart: int = 0, retmax: int = 100, debug: bool = False,
+                    mindate: Optional[str] = None, maxdate: Optional[str] = None,
+                    datetype: str = "edat") -> Tuple[int, List[str]]:
+        """
+        Run one page of a search, along with the total hit count.
+        
+        Unlike search, pages are not served from the response cache, so the
+        count is always current.
+        
+        Args:
+            query: PubMed search query
+            retstart: Index of the first hit to return
+            retmax: Maximum number of hits to return
+            debug: Whether to print debug information
+            mindate: Optional start of a date range (YYYY/MM/DD)
+            maxdate: Optional end of a date range (defaults to today if mindate is set)
+            datetype: Date field the range applies to (default: Entrez date)
+            
+        Returns:
+            Tuple containing (total hit count, PubMed IDs of the page)
+        """
+        params: Dict[str, Any] = {"db": "pubmed", "term": query, "retstart": retstart, "retmax": retmax}
+        params.update(self._date_params(mindate, maxdate, datetype))
+        
+        try:
+            record = self.retry_policy.call(lambda: self._read_eutils("esearch", **params))
+        except Exception as e:
+            logger.error(f"Error searching PubMed: {e}")
+            raise
+        
+        count = int(record["Count"])
+        pmids = [str(pmid) for pmid in record["IdList"]]
+        if debug:
+            logger.debug(f"Found {len(pmids)} of {count} articles from {retstart}")
+        return count, pmids
+    
     def fetch_details(self, pmids: List[str], debug: bool = False) -> Dict:
         """
         Fetch detailed information for a list of PubMed IDs.
@@ -84,9 +252,9 @@ class PubMedAPI:
         
         try:
             # Fetch article details
-            handle = Entrez.efetch(db="pubmed", id=",".join(pmids), retmode="xml")
-            articles = Entrez.read(handle)
-            handle.close()
+            articles = self.retry_policy.call(
+                lambda: self._read_eutils("efetch", db="pubmed", id=",".join(pmids), retmode="xml")
+            )
             
             return articles
         
@@ -94,47 +262,547 @@ class PubMedAPI:
             logger.error(f"Error fetching article details: {e}")
             raise
     
-    def fetch_articles_batch(self, pmids: List[str], batch_size: int = 50, 
-                            sleep_time: float = 0.5, debug: bool = False) -> List[Dict]:
+    def search_history(self, query: str, debug: bool = False, mindate: Optional[str] = None,
+                       maxdate: Optional[str] = None, datetype: str = "edat") -> Tuple[int, str, str]:
         """
-        Fetch article details in batches to avoid overloading the API.
+        Run a search on the E-utilities history server without retrieving PMIDs.
+        
+        Args:
+            query: PubMed search query
+            debug: Whether to print debug information
+            mindate: Optional start of a date range (YYYY/MM/DD)
+            maxdate: Optional end of a date range (defaults to today if mindate is set)
+            datetype: Date field the range applies to (default: Entrez date)
+            
+        Returns:
+            Tuple containing (total hit count, WebEnv, query_key)
+        """
+        if debug:
+            logger.debug(f"Searching PubMed (history server) with query: {query}")
+        
+        try:
+            params: Dict[str, Any] = {"db": "pubmed", "term": query, "retmax": 0, "usehistory": "y"}
+            params.update(self._date_params(mindate, maxdate, datetype))
+            record = self.retry_policy.call(lambda: self._read_eutils("esearch", **params))
+            
+            count = int(record["Count"])
+            
+            if debug:
+                logger.debug(f"Found {count} articles (WebEnv {record['WebEnv']}, query_key {record['QueryKey']})")
+                
+            return count, record["WebEnv"], record["QueryKey"]
+        
+        except Exception as e:
+            logger.error(f"Error searching PubMed: {e}")
+            raise
+    
+    def _fetch_payload(self, params: Dict[str, Any]) -> bytes:
+        """
+        Download one efetch batch as raw XML.
+        
+        Only network I/O happens here; parsing is left to the consumer so that a
+        fetch thread never competes with processing for the interpreter.
+        
+        Args:
+            params: Batch-specific efetch parameters (an id list or a history page)
+            
+        Returns:
+            efetch XML document
+        """
+        if self.response_cache is not None:
+            return self._fetch_payload_cached(params)
+        
+        return self._download(params)
+    
+    def _download(self, params: Dict[str, Any]) -> bytes:
+        """
+        Issue one rate-limited efetch request and read the response.
+        
+        Each request is recorded as one call of the "efetch" stage, together
+        with the number of bytes received, and reported to the batch sizer.
+        
+        Args:
+            params: Batch-specific efetch parameters (an id list or a history page)
+            
+        Returns:
+            efetch XML document
+        """
+        size = batch_size(params)
+        with STATS.timer("rate_limit"):
+            self.rate_limiter.acquire()
+        
+        start = time.perf_counter()
+        try:
+            handle = self._open_eutils("efetch", db="pubmed", retmode="xml", **params)
+            try:
+                data = handle.read()
+            finally:
+                handle.close()
+        except Exception:
+            if self.batch_sizer is not None:
+                self.batch_sizer.record_failure(size)
+            raise
+        elapsed = time.perf_counter() - start
+        
+        STATS.record("efetch", elapsed, size)
+        STATS.count("efetch.bytes", len(data))
+        if self.batch_sizer is not None:
+            self.batch_sizer.record(size, elapsed, len(data))
+        return data
+    
+    def _fetch_payload_cached(self, params: Dict[str, Any]) -> bytes:
+        """
+        Fetch one efetch batch, serving cached articles from the response cache.
+        
+        Only PMIDs missing from the cache are requested; every fetched article is
+        stored. History-server pages cannot be looked up by PMID, so they are
+        always fetched, but their articles are still cached.
+        
+        Args:
+            params: Batch-specific efetch parameters (an id list or a history page)
+            
+        Returns:
+            efetch XML document with the articles in request order
+        """
+        cache = self.response_cache
+        assert cache is not None
+        
+        pmids = params["id"].split(",") if "id" in params else []
+        fragments = cache.get_articles(pmids)
+        
+        missing = [pmid for pmid in pmids if pmid not in fragments]
+        if missing or "id" not in params:
+            request = dict(params, id=",".join(missing)) if "id" in params else params
+            data = self._download(request)
+            
+            fetched: Dict[str, bytes] = {}
+            for element in iter_pubmed_elements(BytesIO(data)):
+                pmid = article_pmid(element)
+                if pmid:
+                    fetched[pmid] = serialize_article(element)
+            cache.put_articles(fetched)
+            
+            if "id" not in params:
+                return data
+            fragments.update(fetched)
+        
+        return wrap_articles(fragments[pmid] for pmid in pmids if pmid in fragments)
+    
+    def iter_articles(self, pmids: List[str], batch_size: int = 50, debug: bool = False,
+                      concurrency: int = 1, prefetch: int = 0) -> Iterator[Dict]:
+        """
+        Stream article details in batches, yielding one article at a time.
+        
+        Each efetch response is parsed incrementally and only the fields used by
+        PubMedParser are kept, so memory use stays flat regardless of result size.
+        
+        Args:
+            pmids: List of PubMed IDs
+            batch_size: Number of articles to fetch in each batch
+            debug: Whether to print debug information
+            concurrency: Number of batches to fetch in parallel; batches are
+                yielded in PMID order either way
+            prefetch: Number of downloaded batches buffered by a background fetch
+                thread, so downloads overlap with the consumer's work; 0 fetches
+                on demand in the consuming thread
+            
+        Yields:
+            Compact article dictionaries; with an article store, stored articles
+            come first, followed by the fetched ones
+        """
+        stored, pmids = self.split_stored(pmids)
+        if stored and self.article_store is not None:
+            yield from self.article_store.iter_articles(stored)
+        batches = self._id_batches(pmids, batch_size)
+        yield from self._store_articles(
+            self._iter_efetch(batches, len(pmids), debug, concurrency, prefetch)
+        )
+        self.count_stored(stored)
+    
+    def _id_batches(self, pmids: List[str], batch_size: int) -> Iterator[Dict[str, Any]]:
+        """
+        Split PMIDs into efetch batches.
+        
+        Batches are cut as they are requested, so with a batch sizer each one is
+        sized from the batches fetched before it.
+        
+        Args:
+            pmids: List of PubMed IDs
+            batch_size: Number of articles per batch (of the first batches with a batch sizer)
+            
+        Yields:
+            Batch-specific efetch parameters
+        """
+        start = 0
+        while start < len(pmids):
+            size = self.batch_sizer.next_size(batch_size) if self.batch_sizer is not None else batch_size
+            yield {"id": ",".join(pmids[start:start + size])}
+            start += size
+    
+    def _history_pages(self, webenv: str, query_key: str, count: int,
+                       batch_size: int) -> Iterator[Dict[str, Any]]:
+        """
+        Split a history-server result set into efetch pages.
+        
+        Args:
+            webenv: WebEnv returned by search_history
+            query_key: query_key returned by search_history
+            count: Number of results to fetch (starting from the first)
+            batch_size: Number of articles per page (of the first pages with a batch sizer)
+            
+        Yields:
+            Page-specific efetch parameters (retstart/retmax)
+        """
+        start = 0
+        while start < count:
+            size = self.batch_sizer.next_size(batch_size) if self.batch_sizer is not None else batch_size
+            yield {"WebEnv": webenv, "query_key": query_key,
+                   "retstart": start, "retmax": min(size, count - start)}
+            start += size
+    
+    def split_stored(self, pmids: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split PMIDs into those held by the article store and those to fetch.
+        
+        Args:
+            pmids: List of PubMed IDs
+            
+        Returns:
+            Tuple of (stored PMIDs, PMIDs to fetch), both in their original order;
+            without an article store nothing is stored
+        """
+        if self.article_store is None or not pmids:
+            return [], list(pmids)
+        
+        missing = self.article_store.missing(pmids)
+        if len(missing) == len(pmids):
+            return [], missing
+        missing_set = set(missing)
+        stored = [pmid for pmid in pmids if str(pmid) not in missing_set]
+        logger.info(f"{len(stored)} of {len(pmids)} articles found in the article store")
+        return stored, missing
+    
+    def count_stored(self, stored: List[str]) -> None:
+        """
+        Add articles served by the article store to the last fetch report.
+        
+        Args:
+            stored: PMIDs read from the store instead of fetched
+        """
+        self.last_fetch.requested += len(stored)
+        self.last_fetch.retrieved += len(stored)
+    
+    def _store_articles(self, articles: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Pass articles through, adding each one to the article store.
+        
+        Args:
+            articles: Fetched article dictionaries
+            
+        Yields:
+            The same articles
+        """
+        if self.article_store is None:
+            yield from articles
+            return
+        
+        try:
+            for article in articles:
+                self.article_store.put(article)
+                yield article
+        finally:
+            self.article_store.flush()
+    
+    def iter_history_articles(self, webenv: str, query_key: str, count: int,
+                              batch_size: int = 500,
+                              debug: bool = False, concurrency: int = 1,
+                              prefetch: int = 0) -> Iterator[Dict]:
+        """
+        Stream article details for a history-server result set.
+        
+        Pages through the result with retstart/retmax, so PMIDs are never
+        materialized locally or sent back to NCBI.
+        
+        Args:
+            webenv: WebEnv returned by search_history
+            query_key: query_key returned by search_history
+            count: Number of results to fetch (starting from the first)
+            batch_size: Number of articles to fetch in each page
+            debug: Whether to print debug information
+            concurrency: Number of pages to fetch in parallel
+            prefetch: Number of downloaded pages buffered by a background fetch thread
+            
+        Yields:
+            Compact article dictionaries, in result order
+        """
+        pages = self._history_pages(webenv, query_key, count, batch_size)
+        # PMIDs are only known once fetched, so the store is filled but not consulted
+        yield from self._store_articles(self._iter_efetch(pages, count, debug, concurrency, prefetch))
+    
+    def iter_article_batches(self, pmids: List[str], batch_size: int = 50, debug: bool = False,
+                             concurrency: int = 1, prefetch: int = 0) -> Iterator[RawBatch]:
+        """
+        Stream raw efetch batches without parsing them.
+        
+        Used when parsing happens elsewhere (e.g. on a process pool). Batches
+        that fail to download are re-driven at the end like in iter_articles;
+        `last_fetch.retrieved` is left to the consumer, which sees the articles,
+        and so is recording batches that fail to parse (see redrive_articles).
         
         Args:
             pmids: List of PubMed IDs
             batch_size: Number of articles to fetch in each batch
-            sleep_time: Time to sleep between batches (seconds)
             debug: Whether to print debug information
+            concurrency: Number of batches to fetch in parallel
+            prefetch: Number of downloaded batches buffered by a background fetch thread
+            
+        Yields:
+            Tuples of (batch number, parameters, efetch XML), in PMID order
+        """
+        batches = self._id_batches(pmids, batch_size)
+        yield from self._iter_efetch_raw(batches, len(pmids), debug, concurrency, prefetch)
+    
+    def iter_history_batches(self, webenv: str, query_key: str, count: int,
+                             batch_size: int = 500,
+                             debug: bool = False, concurrency: int = 1,
+                             prefetch: int = 0) -> Iterator[RawBatch]:
+        """
+        Stream raw efetch pages of a history-server result set without parsing them.
+        
+        Args:
+            webenv: WebEnv returned by search_history
+            query_key: query_key returned by search_history
+            count: Number of results to fetch (starting from the first)
+            batch_size: Number of articles to fetch in each page
+            debug: Whether to print debug information
+            concurrency: Number of pages to fetch in parallel
+            prefetch: Number of downloaded pages buffered by a background fetch thread
+            
+        Yields:
+            Tuples of (batch number, parameters, efetch XML), in result order
+        """
+        pages = self._history_pages(webenv, query_key, count, batch_size)
+        yield from self._iter_efetch_raw(pages, count, debug, concurrency, prefetch)
+    
+    def _iter_efetch_raw(self, batches: Iterable[Dict[str, Any]], requested: int,
+                         debug: bool, concurrency: int, prefetch: int) -> Iterator[RawBatch]:
+        """
+        Run a sequence of efetch requests and stream the raw responses in order.
+        
+        Args:
+            batches: Batch-specific efetch parameters, one dict per request
+            requested: Number of articles the batches request in total
+            debug: Whether to print debug information
+            concurrency: Number of batches to fetch in parallel
+            prefetch: Number of downloaded batches buffered by a background fetch thread
+            
+        Yields:
+            Tuples of (batch number, parameters, efetch XML)
+        """
+        report = FetchReport(requested=requested)
+        self.last_fetch = report
+        
+        payloads = self._iter_payloads(batches, debug, concurrency, report)
+        if prefetch > 0:
+            payloads = iter_in_thread(payloads, maxsize=prefetch, chunk_size=1, name="efetch")
+        yield from payloads
+        
+        redrive = self._take_failed(report)
+        yield from self._iter_payloads(redrive, debug, 1, report)
+    
+    def redrive_articles(self, debug: bool = False) -> Iterator[Dict]:
+        """
+        Re-drive the failed batches of the last fetch run in this process.
+        
+        Requests only the articles the failed batches did not deliver, one
+        batch at a time, and parses them here. Batches that fail again stay
+        in the failed-batch ledger of `last_fetch`.
+        
+        Args:
+            debug: Whether to print debug information
+            
+        Yields:
+            Compact article dictionaries
+        """
+        report = self.last_fetch
+        redrive = self._take_failed(report)
+        if redrive:
+            before = report.retrieved
+            yield from self._iter_parsed(self._iter_payloads(redrive, debug, 1, report), report)
+            logger.info(f"Re-drive recovered {report.retrieved - before} articles")
+    
+    @staticmethod
+    def _take_failed(report: FetchReport) -> List[Dict[str, Any]]:
+        """
+        Empty the failed-batch ledger for a re-drive pass.
+        
+        Args:
+            report: Report of the current fetch run
             
         Returns:
-            List of article details
+            Parameters of the failed batches
+        """
+        failed = report.failed
+        report.failed = []
+        if failed:
+            logger.info(
+                f"Re-driving {len(failed)} failed batches "
+                f"({sum(batch.size for batch in failed)} articles)"
+            )
+        return [batch.params for batch in failed]
+    
+    def _iter_efetch(self, batches: Iterable[Dict[str, Any]], requested: int,
+                     debug: bool, concurrency: int, prefetch: int = 0) -> Iterator[Dict]:
         """
-        all_articles = []
+        Run a sequence of efetch requests and stream their articles in order.
+        
+        Batches that still fail after retries are recorded in the failed-batch
+        ledger of `last_fetch`; once every batch has been tried, a re-drive pass
+        requests only the articles those batches did not deliver. Articles
+        recovered by the re-drive are yielded after the rest.
         
-        for i in range(0, len(pmids), batch_size):
-            batch = pmids[i:i+batch_size]
+        Args:
+            batches: Batch-specific efetch parameters, one dict per request
+            requested: Number of articles the batches request in total
+            debug: Whether to print debug information
+            concurrency: Number of batches to fetch in parallel
+            prefetch: Number of downloaded batches buffered by a background fetch thread
             
+        Yields:
+            Compact article dictionaries
+        """
+        report = FetchReport(requested=requested)
+        self.last_fetch = report
+        
+        payloads = self._iter_payloads(batches, debug, concurrency, report)
+        if prefetch > 0:
+            payloads = iter_in_thread(payloads, maxsize=prefetch, chunk_size=1, name="efetch")
+        yield from self._iter_parsed(payloads, report)
+        yield from self.redrive_articles(debug)
+        
+        if debug:
+            logger.debug(f"Fetched details for {report.retrieved} of {report.requested} articles")
+    
+    def _iter_parsed(self, payloads: Iterable[RawBatch],
+                     report: FetchReport) -> Iterator[Dict]:
+        """
+        Parse downloaded batches into articles.
+        
+        Args:
+            payloads: Tuples of (batch number, parameters, efetch XML)
+            report: Report receiving retrieved counts and failed batches
+            
+        Yields:
+            Compact article dictionaries
+        """
+        for number, params, data in payloads:
+            delivered: List[Optional[str]] = []
+            try:
+                for article in iter_pubmed_articles(BytesIO(data)):
+                    delivered.append(article.get("MedlineCitation", {}).get("PMID"))
+                    report.retrieved += 1
+                    yield article
+            except ET.ParseError as e:
+                logger.error(f"Error parsing batch {number}: {e}")
+                report.record_failure(number, remaining_params(params, delivered), e)
+    
+    def _iter_payloads(self, batches: Iterable[Dict[str, Any]], debug: bool,
+                       concurrency: int, report: FetchReport) -> Iterator[RawBatch]:
+        """
+        Download batches, retrying transient failures with backoff.
+        
+        Requests are paced by the rate limiter alone, with no fixed pause
+        between batches.
+        
+        Args:
+            batches: Batch-specific efetch parameters, one dict per request
+            debug: Whether to print debug information
+            concurrency: Number of batches to fetch in parallel
+            report: Report receiving failed batches
+            
+        Yields:
+            Tuples of (batch number, parameters, efetch XML), in request order
+        """
+        if concurrency > 1:
+            yield from self._iter_payloads_concurrent(batches, concurrency, debug, report)
+            return
+        
+        for number, params in enumerate(batches, 1):
             if debug:
-                logger.debug(f"Fetching batch {i//batch_size + 1}/{(len(pmids)-1)//batch_size + 1}")
+                logger.debug(f"Fetching batch {number} ({batch_size(params)} articles)")
             
             try:
-                handle = Entrez.efetch(db="pubmed", id=",".join(batch), retmode="xml")
-                record = Entrez.read(handle)
-                handle.close()
-                
-                # Extract articles from the response
-                if "PubmedArticle" in record:
-                    all_articles.extend(record["PubmedArticle"])
-                
-                # Sleep to avoid overloading the API
-                if i + batch_size < len(pmids):
-                    time.sleep(sleep_time)
-                    
+                data = self.retry_policy.call(self._fetch_payload, params)
             except Exception as e:
-                logger.error(f"Error fetching batch {i//batch_size + 1}: {e}")
-                # Continue with the next batch instead of failing completely
+                logger.error(f"Error fetching batch {number}: {e}")
+                # Record the batch and continue with the next one instead of failing completely
+                report.record_failure(number, params, e)
                 continue
+            
+            yield number, params, data
+    
+    def _iter_payloads_concurrent(self, batches: Iterable[Dict[str, Any]], concurrency: int, debug: bool,
+                                  report: FetchReport) -> Iterator[RawBatch]:
+        """
+        Download batches on a thread pool and yield them in request order.
         
-        if debug:
-            logger.debug(f"Fetched details for {len(all_articles)} articles")
+        At most twice `concurrency` batches are in flight or buffered at a time.
+        
+        Args:
+            batches: Batch-specific efetch parameters, one dict per request
+            concurrency: Number of worker threads
+            debug: Whether to print debug information
+            report: Report receiving failed batches
+            
+        Yields:
+            Tuples of (batch number, parameters, efetch XML)
+        """
+        pending: Deque[Tuple[int, Dict[str, Any], "Future[bytes]"]] = deque()
+        source = enumerate(batches, 1)
+        
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="efetch") as executor:
+            def submit_next() -> None:
+                # Batches are cut at submission, so a batch sizer sees every completed batch
+                for number, params in source:
+                    future = executor.submit(self.retry_policy.call, self._fetch_payload, params)
+                    pending.append((number, params, future))
+                    return
             
-        return all_articles
\ No newline at end of file
+            for _ in range(concurrency * 2):
+                submit_next()
+            
+            while pending:
+                number, params, future = pending.popleft()
+                submit_next()
+                
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching batch {number}: {e}")
+                    report.record_failure(number, params, e)
+                    continue
+                
+                if debug:
+                    logger.debug(f"Fetched batch {number} ({batch_size(params)} articles)")
+                
+                yield number, params, data
+    
+    def fetch_articles_batch(self, pmids: List[str], batch_size: int = 50, 
+                            sleep_time: float = 0.5, debug: bool = False) -> List[Dict]:
+        """
+        Fetch article details in batches to avoid overloading the API.
+        
+        With an article store, stored articles are read locally and only the
+        missing PMIDs are fetched.
+        
+        Args:
+            pmids: List of PubMed IDs
+            batch_size: Number of articles to fetch in each batch
+            sleep_time: Ignored; kept for compatibility, requests are paced by
+                the rate limiter
+            debug: Whether to print debug information
+            
+        Returns:
+            List of article details
+        """
+        return list(self.iter_articles(pmids, batch_size=batch_size, debug=debug))
\ No newline at end of file
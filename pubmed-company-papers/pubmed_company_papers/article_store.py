@@ -0,0 +1,192 @@
+"""Module for storing parsed PubMed articles locally, keyed by PMID."""
+
+from typing import Any, Dict, Iterable, Iterator, List
+import json
+import threading
+import zlib
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class ArticleStore:
+    """
+    SQLite-backed store of parsed articles keyed by PMID.
+
+    Articles are kept in the compact Entrez-style form produced by
+    xml_stream.extract_article (the fields PubMedParser reads), so stored
+    articles are neither fetched nor parsed again.
+    """
+
+    # Version of the stored article layout; the store is cleared when it changes
+    FORMAT_VERSION = "1"
+
+    # Maximum number of PMIDs bound in one SQL statement
+    LOOKUP_CHUNK_SIZE = 500
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        """
+        Open (or create) an article store.
+
+        Args:
+            path: Path to the SQLite database file
+            batch_size: Number of new articles to buffer before writing a transaction
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+        import sqlite3
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles (pmid TEXT PRIMARY KEY, data BLOB NOT NULL)"
+            )
+        self._check_version()
+
+    def _check_version(self) -> None:
+        """Drop all articles if they were stored in a different layout."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'format_version'").fetchone()
+        if row is not None and row[0] == self.FORMAT_VERSION:
+            return
+
+        with self._conn:
+            if row is not None:
+                logger.info(f"Article layout changed, discarding stored articles in {self.path}")
+                self._conn.execute("DELETE FROM articles")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('format_version', ?)",
+                (self.FORMAT_VERSION,)
+            )
+
+    @staticmethod
+    def pmid_of(article: Dict[str, Any]) -> str:
+        """Get the PMID of a compact article dictionary."""
+        return str(article.get("MedlineCitation", {}).get("PMID", ""))
+
+    def _select(self, column: str, pmids: List[str]) -> List[Any]:
+        """Run a chunked `WHERE pmid IN (...)` lookup; the lock must be held."""
+        rows: List[Any] = []
+        for start in range(0, len(pmids), self.LOOKUP_CHUNK_SIZE):
+            chunk = pmids[start:start + self.LOOKUP_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(self._conn.execute(
+                f"SELECT {column} FROM articles WHERE pmid IN ({placeholders})", chunk
+            ).fetchall())
+        return rows
+
+    def missing(self, pmids: Iterable[str]) -> List[str]:
+        """
+        Find the PMIDs that are not in the store.
+
+        Args:
+            pmids: PubMed IDs
+
+        Returns:
+            PMIDs without a stored article, in their original order
+        """
+        pmids = [str(pmid) for pmid in pmids]
+        with self._lock:
+            stored = {row[0] for row in self._select("pmid", pmids)}
+            stored.update(pmid for pmid in pmids if pmid in self._pending)
+            missing = [pmid for pmid in pmids if pmid not in stored]
+            self.hits += len(pmids) - len(missing)
+            self.misses += len(missing)
+        return missing
+
+    def get_many(self, pmids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several stored articles at once.
+
+        Args:
+            pmids: PubMed IDs
+
+        Returns:
+            Dictionary mapping each stored PMID to its article
+        """
+        pmids = [str(pmid) for pmid in pmids]
+        with self._lock:
+            found = {pmid: data for pmid, data in self._select("pmid, data", pmids)}
+            found.update((pmid, self._pending[pmid]) for pmid in pmids if pmid in self._pending)
+        return {pmid: json.loads(zlib.decompress(data)) for pmid, data in found.items()}
+
+    def iter_articles(self, pmids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream stored articles, looking them up in chunks.
+
+        Args:
+            pmids: PubMed IDs (PMIDs that are not stored are skipped)
+
+        Yields:
+            Stored articles, in PMID order
+        """
+        pmids = [str(pmid) for pmid in pmids]
+        for start in range(0, len(pmids), self.LOOKUP_CHUNK_SIZE):
+            chunk = pmids[start:start + self.LOOKUP_CHUNK_SIZE]
+            found = self.get_many(chunk)
+            for pmid in chunk:
+                if pmid in found:
+                    yield found[pmid]
+
+    def put(self, article: Dict[str, Any]) -> None:
+        """
+        Queue an article for writing; queued articles are written in batches.
+
+        Args:
+            article: Compact article dictionary from xml_stream.extract_article
+        """
+        pmid = self.pmid_of(article)
+        if not pmid:
+            return
+        data = zlib.compress(json.dumps(article, separators=(",", ":")).encode("utf-8"))
+        with self._lock:
+            self._pending[pmid] = data
+            should_flush = len(self._pending) >= self.batch_size
+        if should_flush:
+            self.flush()
+
+    def put_many(self, articles: Iterable[Dict[str, Any]]) -> None:
+        """
+        Queue several articles for writing.
+
+        Args:
+            articles: Compact article dictionaries
+        """
+        for article in articles:
+            self.put(article)
+
+    def flush(self) -> None:
+        """Write all queued articles in a single transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO articles (pmid, data) VALUES (?, ?)",
+                    list(self._pending.items())
+                )
+            logger.debug(f"Stored {len(self._pending)} articles in {self.path}")
+            self._pending.clear()
+
+    def close(self) -> None:
+        """Flush queued articles and close the database."""
+        self.flush()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0])
+
+    def __enter__(self) -> "ArticleStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
\ No newline at end of file
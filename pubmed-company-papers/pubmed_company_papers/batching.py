@@ -0,0 +1,158 @@
+"""Module providing an adaptive efetch batch size controller."""
+
+from typing import Any, Dict, List, Optional
+import threading
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Response time and payload size a batch is sized for
+TARGET_SECONDS = 3.0
+TARGET_BYTES = 8 * 1024 * 1024
+
+# Default bounds of the batch size (NCBI serves up to 10,000 records per POSTed efetch)
+DEFAULT_MIN_SIZE = 10
+DEFAULT_MAX_SIZE = 1000
+
+# Largest growth factor per observed batch; shrinking is not limited
+MAX_GROWTH = 2.0
+
+# Size factor applied after a failed request, and the number of successful
+# batches during which the size is not allowed to grow again
+BACKOFF_FACTOR = 0.5
+COOLDOWN_BATCHES = 3
+
+# Weight of the newest observation in the per-article latency and size averages
+SMOOTHING = 0.3
+
+class AdaptiveBatchSizer:
+    """
+    Batch size controller for efetch requests.
+
+    Tracks the average response time and payload size per article and sizes
+    the next batch so that it takes about `target_seconds` and stays below
+    `target_bytes`, whichever is smaller. Growth is capped per step, failed
+    requests halve the size and pause growth for a few batches, and the size
+    always stays within [min_size, max_size]. Every decision is kept in
+    `observations` for tuning. Safe to use from concurrent fetch threads.
+    """
+
+    def __init__(self, min_size: int = DEFAULT_MIN_SIZE, max_size: int = DEFAULT_MAX_SIZE,
+                 target_seconds: float = TARGET_SECONDS, target_bytes: int = TARGET_BYTES):
+        """
+        Initialize the controller.
+
+        Args:
+            min_size: Smallest batch size
+            max_size: Largest batch size
+            target_seconds: Response time to size batches for
+            target_bytes: Largest payload to size batches for
+        """
+        if min_size < 1 or max_size < min_size:
+            raise ValueError("batch sizes need 1 <= min_size <= max_size")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self.failures = 0
+        self.observations: List[Dict[str, Any]] = []
+        self._size: Optional[float] = None
+        self._seconds_per_article: Optional[float] = None
+        self._bytes_per_article: Optional[float] = None
+        self._cooldown = 0
+        self._lock = threading.Lock()
+
+    def _clamp(self, size: float) -> float:
+        return min(float(self.max_size), max(float(self.min_size), size))
+
+    @staticmethod
+    def _average(current: Optional[float], value: float) -> float:
+        return value if current is None else current + SMOOTHING * (value - current)
+
+    def next_size(self, default: int) -> int:
+        """
+        Get the size of the next batch.
+
+        Args:
+            default: Size to use until a batch has been observed
+
+        Returns:
+            Number of articles to request
+        """
+        with self._lock:
+            return int(self._size if self._size is not None else self._clamp(default))
+
+    def record(self, size: int, seconds: float, payload_bytes: int) -> None:
+        """
+        Adjust the size after a successful request.
+
+        Args:
+            size: Number of articles requested
+            seconds: Response time of the request
+            payload_bytes: Size of the response
+        """
+        if size <= 0:
+            return
+        with self._lock:
+            self._seconds_per_article = self._average(self._seconds_per_article, seconds / size)
+            self._bytes_per_article = self._average(self._bytes_per_article, payload_bytes / size)
+
+            ideal = min(
+                self.target_seconds / self._seconds_per_article if self._seconds_per_article > 0 else self.max_size,
+                self.target_bytes / self._bytes_per_article if self._bytes_per_article > 0 else self.max_size
+            )
+            current = self._size if self._size is not None else float(size)
+            ideal = min(ideal, current * MAX_GROWTH)
+            if self._cooldown > 0:
+                # Recovering from errors: only allow shrinking
+                self._cooldown -= 1
+                ideal = min(ideal, current)
+            self._size = self._clamp(ideal)
+
+            next_size = int(self._size)
+            self.observations.append({"size": size, "seconds": round(seconds, 3),
+                                      "bytes": payload_bytes, "next": next_size})
+        logger.debug(f"efetch of {size} articles took {seconds:.2f}s ({payload_bytes} bytes), "
+                     f"next batch size {next_size}")
+
+    def record_failure(self, size: int) -> None:
+        """
+        Back off after a failed request.
+
+        Args:
+            size: Number of articles requested
+        """
+        with self._lock:
+            self.failures += 1
+            current = min(self._size, float(size)) if self._size is not None else float(size)
+            self._size = self._clamp(current * BACKOFF_FACTOR)
+            self._cooldown = COOLDOWN_BATCHES
+            next_size = int(self._size)
+            self.observations.append({"size": size, "error": True, "next": next_size})
+        logger.debug(f"efetch of {size} articles failed, next batch size {next_size}")
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the chosen sizes.
+
+        Returns:
+            Dictionary with the bounds, targets, failure count, size statistics
+            of the successful batches and every observation
+        """
+        with self._lock:
+            sizes = [entry["size"] for entry in self.observations if not entry.get("error")]
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "target_seconds": self.target_seconds,
+                "target_bytes": self.target_bytes,
+                "batches": len(sizes),
+                "failures": self.failures,
+                "smallest": min(sizes) if sizes else None,
+                "largest": max(sizes) if sizes else None,
+                "mean": round(sum(sizes) / len(sizes), 1) if sizes else None,
+                "final": int(self._size) if self._size is not None else None,
+                "observations": list(self.observations),
+            }
\ No newline at end of file
@@ -1,15 +1,34 @@
 """Command-line interface for the PubMed Company Papers tool."""
 
 import argparse
+import datetime
 import logging
+import os
 import sys
-from typing import List, Dict, Any, Optional
-from tqdm import tqdm
+import time
+from typing import Container, Iterable, Iterator, List, Dict, Any, Optional, Tuple
 
-from pubmed_company_papers.api import PubMedAPI
-from pubmed_company_papers.parser import PubMedParser
+from pubmed_company_papers.api import ESEARCH_MAX_RECORDS, PubMedAPI
+from pubmed_company_papers.pipeline import BackgroundWorker
+from pubmed_company_papers.processing import ProcessingPool, Result, process_article
 from pubmed_company_papers.affiliations import AffiliationAnalyzer
-from pubmed_company_papers.output import OutputHandler
+from pubmed_company_papers.article_store import ArticleStore
+from pubmed_company_papers.batching import DEFAULT_MAX_SIZE, DEFAULT_MIN_SIZE, AdaptiveBatchSizer
+from pubmed_company_papers.dumps import find_dump_files, iter_dump_articles
+from pubmed_company_papers.incremental import IncrementalState
+from pubmed_company_papers.journal import RunJournal
+from pubmed_company_papers.output import OUTPUT_FORMATS, QUERY_COLUMN, QUERY_COLUMNS, RowAppender
+from pubmed_company_papers.response_cache import ResponseCache
+from pubmed_company_papers.retry import RetryPolicy
+from pubmed_company_papers.ratelimit import TokenBucket
+from pubmed_company_papers.stats import STATS, record_cache_stats
+from pubmed_company_papers.transport import (
+    DEFAULT_TOOL,
+    RecordingTransport,
+    ReplayTransport,
+    Transport,
+    default_transport,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -18,6 +37,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of articles processed between checkpoints of the output and journal
+CHECKPOINT_SIZE = 50
+
+# Bounded queues between the pipeline stages: downloaded efetch batches
+# waiting to be parsed and classified, and checkpoints waiting to be written
+FETCH_QUEUE_SIZE = 4
+WRITE_QUEUE_SIZE = 4
+
 def parse_arguments() -> argparse.Namespace:
     """
     Parse command-line arguments.
@@ -31,7 +58,24 @@ def parse_arguments() -> argparse.Namespace:
     
     parser.add_argument(
         "query",
-        help="PubMed search query"
+        nargs="?",
+        help="PubMed search query (not used with --input or --queries-file)"
+    )
+    
+    parser.add_argument(
+        "-q", "--queries-file",
+        metavar="FILE",
+        help="Run every query in FILE (one per line, # for comments); PMIDs found by several "
+             "queries are fetched and classified once, and each row gets a Query column "
+             "naming the query that found it (one row per matching query)"
+    )
+    
+    parser.add_argument(
+        "-i", "--input",
+        nargs="+",
+        metavar="PATH",
+        help="Offline mode: classify local PubMed baseline/update files (.xml.gz or .xml; "
+             "files, directories or glob patterns) instead of searching PubMed"
     )
     
     parser.add_argument(
@@ -45,6 +89,14 @@ def parse_arguments() -> argparse.Namespace:
         help="Specify the filename to save the results (if not provided, print to console)"
     )
     
+    parser.add_argument(
+        "--format",
+        choices=sorted(OUTPUT_FORMATS),
+        default="csv",
+        help="Output format: csv joins author and company lists with '; ', jsonl and parquet "
+             "keep them as lists; parquet requires -f and pyarrow (default: csv)"
+    )
+    
     parser.add_argument(
         "-m", "--max-results",
         type=int,
@@ -63,51 +115,755 @@ def parse_arguments() -> argparse.Namespace:
         help="NCBI API key for higher request limits"
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=AffiliationAnalyzer.DEFAULT_CACHE_SIZE,
+        help="Number of affiliation verdicts to memoize, 0 disables the cache "
+             f"(default: {AffiliationAnalyzer.DEFAULT_CACHE_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--use-history",
+        action="store_true",
+        help="Page results through the E-utilities history server (WebEnv/query_key) "
+             "instead of retrieving PMIDs; lifts the 10,000 result limit "
+             "(use -m 0 to fetch every hit)"
+    )
+    
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=1,
+        help="Number of efetch batches to download in parallel, paced by NCBI's "
+             "rate limit (3 req/s, 10 req/s with an API key) (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--eutils-url",
+        help="Base URL of an E-utilities compatible server to use instead of NCBI "
+             "(e.g. a local stub for testing)"
+    )
+    
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes that parse and classify downloaded batches "
+             "(or --input files); above 1, raw XML is handed to a process pool (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--adaptive-batches",
+        action="store_true",
+        help="Size each efetch batch from the response times and payload sizes of earlier "
+             "ones, shrinking it after errors; chosen sizes are logged with --debug and "
+             "recorded by --stats-json"
+    )
+    
+    parser.add_argument(
+        "--batch-size-range",
+        type=int,
+        nargs=2,
+        metavar=("MIN", "MAX"),
+        default=[DEFAULT_MIN_SIZE, DEFAULT_MAX_SIZE],
+        help=f"Bounds of the adaptive batch size (default: {DEFAULT_MIN_SIZE} {DEFAULT_MAX_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=4,
+        help="Number of times a failed request is retried with exponential backoff (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--http-cache",
+        metavar="DIR",
+        help="Directory for an on-disk cache of esearch results and compressed article XML"
+    )
+    
+    parser.add_argument(
+        "--http-cache-ttl",
+        type=float,
+        default=168,
+        metavar="HOURS",
+        help="Maximum age of cached responses in hours, 0 for no expiry (default: 168)"
+    )
+    
+    parser.add_argument(
+        "--http-cache-search-ttl",
+        type=float,
+        default=1,
+        metavar="HOURS",
+        help="Maximum age of cached esearch results in hours, so repeated queries pick up "
+             "newly indexed articles; 0 to use --http-cache-ttl alone (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--http-cache-max-mb",
+        type=float,
+        default=1024,
+        metavar="MB",
+        help="Size cap of the response cache, least recently used entries are "
+             "evicted first, 0 for no cap (default: 1024)"
+    )
+    
+    parser.add_argument(
+        "--verdict-store",
+        metavar="PATH",
+        help="SQLite file that persists affiliation verdicts across runs"
+    )
+    
+    parser.add_argument(
+        "--article-store",
+        metavar="PATH",
+        help="SQLite file holding parsed articles by PMID; stored articles are not "
+             "fetched again and fetched ones are added"
+    )
+    
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch articles added to PubMed since the last run of the same query "
+             "and append their rows to the output file; state is kept in FILE.state (requires -f)"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from the journal kept next to the output "
+             "file (FILE.journal); requires -f"
+    )
+    
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        metavar="REQ_PER_S",
+        help="E-utilities requests per second, shared by all fetch threads (default: NCBI's "
+             "limit, 3 or 10 with an API key; unlimited with --replay)"
+    )
+    
+    parser.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Record every esearch/efetch response, gzip-compressed, to a cassette directory "
+             "for --replay"
+    )
+    
+    parser.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Serve esearch/efetch responses from a cassette directory written by --record, "
+             "without network access; requests that were not recorded fail"
+    )
+    
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Latency added to every replayed response (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--replay-error-rate",
+        type=float,
+        default=0.0,
+        metavar="RATE",
+        help="Share of replayed requests failed with HTTP 503 to exercise retries, "
+             "from 0 to 1 (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--replay-seed",
+        type=int,
+        default=0,
+        help="Seed of the replay error injection, so runs fail the same requests (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--serve",
+        type=int,
+        metavar="PORT",
+        help="Run as a local HTTP/JSON service instead of a single query: POST {\"query\": ...} "
+             "to /jobs to stream result rows as JSON lines; the client, classifier and caches "
+             "stay warm between jobs and all jobs share one rate limit"
+    )
+    
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface the --serve service listens on (default: 127.0.0.1)"
+    )
+    
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=4,
+        help="Number of --serve jobs running at once; further jobs get HTTP 503 (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--stats-json",
+        metavar="PATH",
+        help="Write per-stage timings (esearch, efetch, xml, parser, classifier, output), "
+             "counters and cache hit rates of the run to a JSON file"
+    )
+    
+    parser.add_argument(
+        "--stats-prometheus",
+        metavar="PATH",
+        help="Write the run statistics in the Prometheus text format, e.g. to a "
+             "node exporter textfile collector directory (use a .prom name)"
+    )
+    
+    args = parser.parse_args()
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+    if args.serve is not None:
+        if args.query or args.input or args.queries_file:
+            parser.error("--serve takes its queries from HTTP requests, not a query, --queries-file or --input")
+        if args.file or args.format != "csv" or args.workers > 1 or args.use_history \
+                or args.resume or args.incremental:
+            parser.error("--serve streams each job's rows as JSON lines in its HTTP response; "
+                         "-f, --format, --workers, --use-history, --resume and --incremental do not apply")
+        return args
+    if not args.query and not args.input and not args.queries_file:
+        parser.error("a query, --queries-file, --input or --serve is required")
+    if args.queries_file and (args.query or args.input):
+        parser.error("--queries-file cannot be combined with a query or --input")
+    return args
 
-def process_articles(articles: List[Dict[str, Any]], debug: bool = False) -> List[Dict[str, Any]]:
+def process_articles(articles: Iterable[Dict[str, Any]], debug: bool = False,
+                     total: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Process PubMed articles to extract relevant information.
     
     Args:
-        articles: List of PubMed articles
+        articles: PubMed articles (a list or a stream)
         debug: Whether to print debug information
+        total: Expected number of articles, used for the progress bar
         
     Returns:
         List of processed article data
     """
+    from tqdm import tqdm
+    
     results = []
     
-    for article in tqdm(articles, desc="Processing articles", disable=not debug):
-        # Extract basic information
-        pubmed_id = PubMedParser.extract_pubmed_id(article)
-        title = PubMedParser.extract_title(article)
-        publication_date = PubMedParser.extract_publication_date(article)
-        
-        # Extract authors and affiliations
-        authors = PubMedParser.extract_authors_with_affiliations(article)
+    for article in tqdm(articles, desc="Processing articles", total=total, disable=not debug):
+        _, result = process_article(article)
+        if result is not None:
+            results.append(result)
+    
+    return results
+
+def write_results(articles: Iterable[Dict[str, Any]], writer: RowAppender,
+                  journal: Optional[RunJournal] = None, debug: bool = False,
+                  total: Optional[int] = None, checkpoint_size: int = CHECKPOINT_SIZE,
+                  seen: Optional[Container[str]] = None) -> int:
+    """
+    Process PubMed articles and write the results incrementally.
+    
+    Args:
+        articles: PubMed articles (a list or a stream)
+        writer: Output for the result rows
+        journal: Optional journal of the run
+        debug: Whether to print debug information
+        total: Expected number of articles, used for the progress bar
+        checkpoint_size: Number of articles per checkpoint
+        seen: Optional PMIDs processed by earlier runs, which are skipped as well
         
-        # Identify company-affiliated authors
-        company_authors, company_names = AffiliationAnalyzer.identify_company_authors(authors)
+    Returns:
+        Total number of result rows written, including those of a resumed run
+    """
+    return write_rows((process_article(article) for article in articles), writer, journal,
+                      debug=debug, total=total, checkpoint_size=checkpoint_size, seen=seen)
+
+def write_rows(results: Iterable[Result], writer: RowAppender,
+               journal: Optional[RunJournal] = None, debug: bool = False,
+               total: Optional[int] = None, checkpoint_size: int = CHECKPOINT_SIZE,
+               seen: Optional[Container[str]] = None) -> int:
+    """
+    Write processed articles incrementally.
+    
+    After every `checkpoint_size` articles the new rows are flushed to the output
+    and the batch is recorded in the journal, so an interrupted run loses at most
+    one batch. Writing happens on a background thread, so processing continues
+    while a checkpoint is flushed. Articles the journal already records as done
+    are skipped.
+    
+    Args:
+        results: Tuples of (PubMed ID, formatted row or None) from process_article;
+            the row may also be a list of rows
+        writer: Output for the result rows
+        journal: Optional journal of the run
+        debug: Whether to print debug information
+        total: Expected number of articles, used for the progress bar
+        checkpoint_size: Number of articles per checkpoint
+        seen: Optional PMIDs processed by earlier runs, which are skipped as well
         
-        # Only include papers with at least one company-affiliated author
-        if company_authors:
-            # Extract corresponding author email
-            corresponding_email = PubMedParser.extract_corresponding_author_email(article)
+    Returns:
+        Total number of result rows written, including those of a resumed run
+    """
+    from tqdm import tqdm
+    
+    rows_written = journal.rows if journal is not None else 0
+    rows: List[Dict[str, Any]] = []
+    pmids: List[str] = []
+    
+    def write(batch_rows: List[Dict[str, Any]], batch_pmids: List[str], total_rows: int) -> None:
+        offset = writer.append(batch_rows)
+        if journal is not None:
+            journal.record_batch(batch_pmids, total_rows, offset)
+    
+    def checkpoint() -> None:
+        nonlocal rows_written, rows, pmids
+        rows_written += len(rows)
+        worker.submit(write, rows, pmids, rows_written)
+        rows, pmids = [], []
+    
+    worker = BackgroundWorker(maxsize=WRITE_QUEUE_SIZE, name="writer")
+    try:
+        for pubmed_id, result in tqdm(results, desc="Processing articles", total=total, disable=not debug):
+            if (journal is not None and pubmed_id in journal.done) or (seen and pubmed_id in seen):
+                continue
             
-            # Format data for CSV
-            result = OutputHandler.format_data_for_csv(
-                pubmed_id=pubmed_id,
-                title=title,
-                publication_date=publication_date,
-                company_authors=company_authors,
-                company_names=company_names,
-                corresponding_email=corresponding_email
-            )
+            pmids.append(pubmed_id)
+            if isinstance(result, list):
+                rows.extend(result)
+            elif result is not None:
+                rows.append(result)
             
-            results.append(result)
+            if len(pmids) >= checkpoint_size:
+                checkpoint()
+        
+        if pmids:
+            checkpoint()
+    except BaseException:
+        # Keep the original error; a failed write would only repeat it
+        try:
+            worker.close()
+        except Exception:
+            pass
+        raise
     
-    return results
+    worker.close()
+    return rows_written
+
+def run_offline(args: argparse.Namespace, writer: RowAppender) -> Tuple[int, List[str]]:
+    """
+    Classify the articles of local PubMed dump files, without any network access.
+    
+    Files are sharded across worker processes (one file per task) when
+    --workers is above 1, and results are written in file order. A file the
+    workers fail to process is skipped and reported; without workers the
+    error ends the run.
+    
+    Args:
+        args: Parsed arguments
+        writer: Output for the result rows
+        
+    Returns:
+        Tuple of (number of result rows written, paths of the files that
+        could not be processed)
+    """
+    files = find_dump_files(args.input)
+    logger.info(f"Offline mode: processing {len(files)} PubMed XML files")
+    start = time.perf_counter()
+    
+    if args.workers > 1:
+        with ProcessingPool(args.workers, cache_size=args.cache_size, verdict_store=args.verdict_store) as pool:
+            found = write_rows(pool.process_files(files), writer, debug=args.debug)
+            articles = pool.articles
+            failed = [batch.params["path"] for batch in pool.failed]
+    else:
+        articles = 0
+        failed = []
+        
+        def results() -> Iterable[Result]:
+            nonlocal articles
+            for path in files:
+                for article in iter_dump_articles(path):
+                    articles += 1
+                    yield process_article(article)
+                logger.debug(f"Processed {path}")
+        
+        found = write_rows(results(), writer, debug=args.debug)
+    
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Processed {articles} articles from {len(files)} files in {elapsed:.1f}s "
+        f"({articles / elapsed if elapsed > 0 else 0:.0f} articles/sec)"
+    )
+    return found, failed
+
+def read_queries(path: str) -> List[str]:
+    """
+    Read the queries of a --queries-file.
+    
+    Args:
+        path: Text file with one query per line; blank lines and lines
+            starting with # are skipped
+        
+    Returns:
+        Queries in file order, without duplicates
+    """
+    with open(path, encoding="utf-8") as f:
+        queries = [line.strip() for line in f]
+    return list(dict.fromkeys(query for query in queries if query and not query.startswith("#")))
+
+def iter_results(args: argparse.Namespace, pubmed_api: PubMedAPI, total: int,
+                 pmids: Optional[List[str]] = None, history: Optional[Tuple[str, str]] = None,
+                 article_store: Optional[ArticleStore] = None,
+                 pool: Optional[ProcessingPool] = None) -> Iterator[Result]:
+    """
+    Fetch articles and classify them as they arrive.
+    
+    Downloads run on a fetch thread so they overlap with parsing, classifying
+    and writing. With a pool, raw batches go to the worker processes and only
+    result rows come back, while stored articles are classified here.
+    
+    Args:
+        args: Parsed arguments
+        pubmed_api: PubMed API handler
+        total: Number of articles to fetch
+        pmids: PubMed IDs to fetch; required unless paging a history search
+        history: WebEnv and query_key of a history search
+        article_store: Article store used by the run, if any
+        pool: Worker pool for parsing and classifying, if any
+        
+    Yields:
+        Tuples of (PubMed ID, formatted row or None)
+    """
+    options: Dict[str, Any] = {"debug": args.debug, "concurrency": args.concurrency, "prefetch": FETCH_QUEUE_SIZE}
+    
+    if pool is None:
+        if history is not None:
+            articles = pubmed_api.iter_history_articles(*history, total, **options)
+        else:
+            assert pmids is not None
+            articles = pubmed_api.iter_articles(pmids, **options)
+        yield from (process_article(article) for article in articles)
+        return
+    
+    stored: List[str] = []
+    if history is not None:
+        payloads = pubmed_api.iter_history_batches(*history, total, **options)
+    else:
+        assert pmids is not None
+        stored, missing = pubmed_api.split_stored(pmids)
+        payloads = pubmed_api.iter_article_batches(missing, **options)
+    if stored and article_store is not None:
+        yield from (process_article(article) for article in article_store.iter_articles(stored))
+    yield from pool.process(payloads)
+    report = pubmed_api.last_fetch
+    report.retrieved = pool.articles
+    # Batches the workers could not parse are re-fetched and parsed here, like
+    # the sequential path does, so they are not silently dropped
+    report.failed.extend(pool.failed)
+    yield from (process_article(article) for article in pubmed_api.redrive_articles(args.debug))
+    pubmed_api.count_stored(stored)
+
+def search_new(args: argparse.Namespace, pubmed_api: PubMedAPI, mindate: Optional[str],
+               seen: Container[str]) -> Tuple[List[str], bool]:
+    """
+    Search for the articles an incremental run has not processed yet.
+    
+    Pages through the hits, skipping PMIDs processed by earlier runs, until
+    --max-results new articles are found or the hits run out, so new articles
+    are not crowded out by ones already written.
+    
+    Args:
+        args: Parsed arguments
+        pubmed_api: PubMed API handler
+        mindate: Start of the date range searched
+        seen: PMIDs processed by earlier runs
+        
+    Returns:
+        Tuple of (new PMIDs, whether hits were left unsearched because of
+        --max-results or esearch's 10,000 record limit)
+    """
+    limit = args.max_results if args.max_results > 0 else ESEARCH_MAX_RECORDS
+    new: List[str] = []
+    retstart = 0
+    count = 0
+    while len(new) < limit and retstart < ESEARCH_MAX_RECORDS:
+        count, page = pubmed_api.search_page(args.query, retstart=retstart,
+                                             retmax=min(limit, ESEARCH_MAX_RECORDS - retstart),
+                                             debug=args.debug, mindate=mindate)
+        new.extend(pmid for pmid in page if pmid not in seen)
+        retstart += len(page)
+        if not page or retstart >= count:
+            break
+    return new[:limit], retstart < count or len(new) > limit
+
+def recover_incremental_run(journal_path: str, settings: Dict[str, Any],
+                            incremental_state: IncrementalState, size: int) -> Optional[int]:
+    """
+    Carry the progress of an interrupted incremental run over to the incremental state.
+    
+    The state file is only saved when a run completes, so the PMIDs of the rows
+    an interrupted run wrote are recorded only in its journal, which a new run
+    replaces. They are added to the state of the journal's query and saved, so
+    the next run does not fetch and append them again.
+    
+    Args:
+        journal_path: Journal left by the previous run
+        settings: Settings of the current run
+        incremental_state: Incremental state of the output file
+        size: Current size of the output file (bytes)
+        
+    Returns:
+        Size of the output at the previous run's last checkpoint, or None if
+        there is no journal of an incremental run writing the same format
+    """
+    if not os.path.exists(journal_path):
+        return None
+    with RunJournal(journal_path, resume=True) as previous:
+        if previous.settings is None or not previous.settings.get("incremental") \
+                or previous.settings.get("format") != settings["format"] or previous.offset > size:
+            return None
+        
+        query_state = incremental_state.query(previous.settings["query"])
+        recovered = previous.done.difference(query_state.seen)
+        if recovered:
+            logger.info(f"Recovered {len(recovered)} articles written by an interrupted run from {journal_path}")
+            query_state.seen.update(recovered)
+            incremental_state.save()
+        return previous.offset
+
+def run_queries(args: argparse.Namespace, pubmed_api: PubMedAPI, writer: RowAppender,
+                article_store: Optional[ArticleStore] = None,
+                pool: Optional[ProcessingPool] = None) -> int:
+    """
+    Run every query of a --queries-file, fetching each article once.
+    
+    All searches run first; their PMIDs are merged in first-seen order, so
+    the fetch volume is that of the union rather than the sum of the queries.
+    Each matching article gets one row per query that found it, in the
+    Query column.
+    
+    Args:
+        args: Parsed arguments
+        pubmed_api: PubMed API handler
+        writer: Output for the result rows, with QUERY_COLUMNS
+        article_store: Article store used by the run, if any
+        pool: Worker pool for parsing and classifying, if any
+        
+    Returns:
+        Number of result rows written
+    """
+    queries = read_queries(args.queries_file)
+    if not queries:
+        raise ValueError(f"No queries in {args.queries_file}")
+    
+    # Queries that found each PMID
+    matches: Dict[str, List[str]] = {}
+    hits = 0
+    for query in queries:
+        logger.info(f"Searching PubMed for: {query}")
+        pmids = pubmed_api.search(query, retmax=args.max_results, debug=args.debug)
+        hits += len(pmids)
+        logger.info(f"Found {len(pmids)} articles for: {query}")
+        for pmid in pmids:
+            matches.setdefault(str(pmid), []).append(query)
+    
+    if not matches:
+        logger.warning("No results found for the queries")
+        return 0
+    logger.info(f"{len(matches)} unique articles across {len(queries)} queries "
+                f"({hits - len(matches)} duplicates skipped), fetching details...")
+    
+    def expand(results: Iterable[Result]) -> Iterator[Tuple[str, Any]]:
+        for pubmed_id, result in results:
+            if result is None:
+                yield pubmed_id, None
+            else:
+                yield pubmed_id, [{QUERY_COLUMN: query, **result} for query in matches[pubmed_id]]
+    
+    logger.info("Processing articles to identify company affiliations...")
+    total = len(matches)
+    results = iter_results(args, pubmed_api, total, pmids=list(matches), article_store=article_store, pool=pool)
+    return write_rows(expand(results), writer, debug=args.debug, total=total)
+
+def build_transport(args: argparse.Namespace) -> Optional[Transport]:
+    """
+    Create the transport requested by --record or --replay.
+    
+    Args:
+        args: Parsed arguments
+        
+    Returns:
+        Recording or replaying transport, or None for the default one
+    """
+    if args.replay:
+        return ReplayTransport(args.replay, latency=args.replay_latency,
+                               error_rate=args.replay_error_rate, seed=args.replay_seed)
+    if args.record:
+        inner = default_transport(args.eutils_url, DEFAULT_TOOL, args.email, args.api_key)
+        return RecordingTransport(inner, args.record)
+    return None
+
+def build_rate_limiter(args: argparse.Namespace) -> Optional[TokenBucket]:
+    """
+    Create the limiter requested by --rate-limit.
+    
+    Args:
+        args: Parsed arguments
+        
+    Returns:
+        Shared limiter, or None for NCBI's limit
+    """
+    if args.rate_limit is not None:
+        return TokenBucket(args.rate_limit)
+    if args.replay:
+        # Replayed responses are local, so nothing needs pacing
+        return TokenBucket(float("inf"))
+    return None
+
+def run_server(args: argparse.Namespace, response_cache: Optional[ResponseCache] = None,
+               article_store: Optional[ArticleStore] = None) -> None:
+    """
+    Serve query jobs over HTTP until interrupted.
+    
+    Args:
+        args: Parsed arguments
+        response_cache: Response cache shared by the jobs, if any
+        article_store: Article store shared by the jobs, if any
+    """
+    # Imported here so that single-query runs do not load the HTTP server
+    from pubmed_company_papers.server import PapersServer, PapersService
+    
+    service = PapersService(
+        email=args.email,
+        api_key=args.api_key,
+        eutils_url=args.eutils_url,
+        rate_limiter=build_rate_limiter(args),
+        response_cache=response_cache,
+        article_store=article_store,
+        transport=build_transport(args),
+        retry_policy=RetryPolicy(max_attempts=max(1, args.max_retries + 1)),
+        max_results=args.max_results,
+        concurrency=args.concurrency,
+        max_jobs=args.max_jobs
+    )
+    server = PapersServer(service, args.host, args.serve)
+    logger.info(f"Serving on {server.url}: POST /jobs, GET /health, GET /stats (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping server")
+    finally:
+        server.server_close()
+
+def log_fetch_report(pubmed_api: PubMedAPI) -> None:
+    """
+    Log how many of the requested articles were fetched.
+    
+    Args:
+        pubmed_api: PubMed API handler of the run
+    """
+    report = pubmed_api.last_fetch
+    logger.info(f"Retrieved {report.retrieved} of {report.requested} requested articles")
+    if pubmed_api.batch_sizer is not None:
+        sizes = pubmed_api.batch_sizer.summary()
+        logger.info(
+            f"Adaptive batches: {sizes['batches']} batches of {sizes['smallest']}-{sizes['largest']} "
+            f"articles (mean {sizes['mean']}), {sizes['failures']} failed requests"
+        )
+    if report.failed:
+        logger.warning(
+            f"{report.missing} articles could not be fetched from "
+            f"{len(report.failed)} batches after retries"
+        )
+    transport = pubmed_api.transport
+    if isinstance(transport, RecordingTransport):
+        logger.info(f"Recorded {transport.recorded} responses to {transport.directory}")
+    elif isinstance(transport, ReplayTransport):
+        logger.info(f"Replayed {transport.requests} requests from {transport.directory}, "
+                    f"{transport.injected} injected errors")
+
+def log_summary(found: int, response_cache: Optional[ResponseCache] = None,
+                article_store: Optional[ArticleStore] = None) -> None:
+    """
+    Log cache statistics and the number of articles found.
+    
+    Args:
+        found: Number of result rows written
+        response_cache: Response cache used by the run, if any
+        article_store: Article store used by the run, if any
+    """
+    cache_stats = AffiliationAnalyzer.cache_stats()
+    if cache_stats:
+        logger.info(
+            f"Affiliation cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+            f"{cache_stats['evictions']} evictions"
+        )
+    
+    if response_cache is not None:
+        http_stats = response_cache.stats()
+        logger.info(
+            f"Response cache: {http_stats['hits']} hits, {http_stats['misses']} misses, "
+            f"{http_stats['evictions']} evictions, {http_stats['bytes']} bytes"
+        )
+    
+    if article_store is not None:
+        logger.info(f"Article store: {article_store.hits} hits, {article_store.misses} misses")
+    
+    # Results were written while processing
+    if found:
+        logger.info(f"Found {found} articles with company-affiliated authors")
+        logger.info("Done!")
+    else:
+        logger.warning("No articles with company-affiliated authors found")
+
+def write_stats(args: argparse.Namespace, found: Optional[int], pubmed_api: Optional[PubMedAPI] = None,
+                response_cache: Optional[ResponseCache] = None,
+                article_store: Optional[ArticleStore] = None, succeeded: bool = True) -> None:
+    """
+    Write the run statistics requested by --stats-json and --stats-prometheus.
+    
+    Args:
+        args: Parsed arguments
+        found: Number of result rows written, or None if the run stopped before writing
+        pubmed_api: PubMed API handler of the run, if any
+        response_cache: Response cache used by the run, if any
+        article_store: Article store used by the run, if any
+        succeeded: Whether the run completed without an error
+    """
+    if not args.stats_json and not args.stats_prometheus:
+        return
+    
+    # Caches keep their own counters; pool workers already reported theirs
+    record_cache_stats(AffiliationAnalyzer.cache_stats(), "affiliation_cache")
+    if response_cache is not None:
+        record_cache_stats(response_cache.stats(), "response_cache")
+    if article_store is not None:
+        STATS.count("article_store.hits", article_store.hits)
+        STATS.count("article_store.misses", article_store.misses)
+    if pubmed_api is not None:
+        report = pubmed_api.last_fetch
+        STATS.count("articles.requested", report.requested)
+        STATS.count("articles.retrieved", report.retrieved)
+        STATS.count("efetch.failed_batches", len(report.failed))
+    if found is not None:
+        STATS.count("rows.written", found)
+    
+    info: Dict[str, Any] = {}
+    if pubmed_api is not None and pubmed_api.batch_sizer is not None:
+        info["batch_sizes"] = pubmed_api.batch_sizer.summary()
+    
+    try:
+        if args.stats_json:
+            STATS.write_json(args.stats_json, query=args.query, queries_file=args.queries_file, input=args.input,
+                             format=args.format, workers=args.workers, concurrency=args.concurrency,
+                             succeeded=succeeded, **info)
+        if args.stats_prometheus:
+            STATS.write_prometheus(args.stats_prometheus)
+    except OSError as e:
+        logger.error(f"Error writing run statistics: {e}")
 
 def main() -> None:
     """Main function to run the command-line tool."""
@@ -119,37 +875,202 @@ def main() -> None:
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("Debug mode enabled")
     
+    STATS.reset()
+    response_cache = None
+    article_store = None
+    pubmed_api = None
+    journal = None
+    writer = None
+    pool = None
+    found = None
+    run_date = datetime.date.today()
+    
     try:
+        # Configure the affiliation verdict cache
+        AffiliationAnalyzer.configure_cache(args.cache_size)
+        if args.verdict_store:
+            AffiliationAnalyzer.open_store(args.verdict_store)
+        
+        writer_class = OUTPUT_FORMATS[args.format]
+        if args.input:
+            # Offline mode: local dumps only, no search, fetch or run journal
+            if args.resume or args.incremental:
+                logger.error("--resume and --incremental are not supported with --input")
+                sys.exit(1)
+            writer = writer_class(args.file)
+            found, failed_files = run_offline(args, writer)
+            log_summary(found)
+            if failed_files:
+                logger.error(f"{len(failed_files)} input files could not be processed: {', '.join(failed_files)}")
+                sys.exit(1)
+            return
+        
+        # Open the response cache
+        if args.http_cache:
+            response_cache = ResponseCache(
+                args.http_cache,
+                ttl=args.http_cache_ttl * 3600 if args.http_cache_ttl > 0 else None,
+                max_bytes=int(args.http_cache_max_mb * 1024 * 1024) if args.http_cache_max_mb > 0 else None,
+                search_ttl=args.http_cache_search_ttl * 3600 if args.http_cache_search_ttl > 0 else None
+            )
+        
+        # Open the article store
+        if args.article_store:
+            article_store = ArticleStore(args.article_store)
+        
+        if args.serve is not None:
+            run_server(args, response_cache, article_store)
+            return
+        
         # Initialize PubMed API
         pubmed_api = PubMedAPI(
             email=args.email,
-            api_key=args.api_key
+            api_key=args.api_key,
+            eutils_url=args.eutils_url,
+            rate_limiter=build_rate_limiter(args),
+            response_cache=response_cache,
+            retry_policy=RetryPolicy(max_attempts=max(1, args.max_retries + 1)),
+            article_store=article_store,
+            batch_sizer=AdaptiveBatchSizer(*args.batch_size_range) if args.adaptive_batches else None,
+            transport=build_transport(args)
         )
         
-        # Search PubMed
-        logger.info(f"Searching PubMed for: {args.query}")
-        pmids = pubmed_api.search(args.query, retmax=args.max_results, debug=args.debug)
+        if args.queries_file:
+            # Multi-query mode: one fetch of the union of the searches, no run journal
+            if args.use_history or args.resume or args.incremental:
+                logger.error("--use-history, --resume and --incremental are not supported with --queries-file")
+                sys.exit(1)
+            writer = writer_class(args.file, columns=QUERY_COLUMNS)
+            if args.workers > 1:
+                pool = ProcessingPool(args.workers, cache_size=args.cache_size, verdict_store=args.verdict_store,
+                                      article_store=args.article_store)
+            found = run_queries(args, pubmed_api, writer, article_store, pool)
+            log_fetch_report(pubmed_api)
+            log_summary(found, response_cache, article_store)
+            return
         
-        if not pmids:
-            logger.warning("No results found for the query")
-            sys.exit(0)
+        # Open the run journal
+        if (args.resume or args.incremental) and not args.file:
+            logger.error("--resume and --incremental require an output file (-f)")
+            sys.exit(1)
+        if not writer_class.supports_resume and (args.resume or args.incremental):
+            logger.error(f"--resume and --incremental are not supported with --format {args.format}")
+            sys.exit(1)
         
-        logger.info(f"Found {len(pmids)} articles, fetching details...")
+        # Load the state of earlier incremental runs
+        incremental_state = None
+        query_state = None
+        mindate = None
+        if args.incremental:
+            incremental_state = IncrementalState(f"{args.file}.state")
         
-        # Fetch article details
-        articles = pubmed_api.fetch_articles_batch(pmids, debug=args.debug)
+        if args.file:
+            settings = {
+                "query": args.query,
+                "max_results": args.max_results,
+                "use_history": args.use_history,
+                "incremental": args.incremental,
+                "format": args.format
+            }
+            journal_path = f"{args.file}.journal"
+            # Incremental runs append to the existing output
+            existing = os.path.getsize(args.file) if args.incremental and os.path.exists(args.file) else 0
+            if incremental_state is not None and not args.resume and existing:
+                # Rows after the interrupted run's last checkpoint are dropped and written again
+                committed = recover_incremental_run(journal_path, settings, incremental_state, existing)
+                if committed is not None:
+                    existing = committed
+            journal = RunJournal(journal_path, resume=args.resume)
+            if journal.resumed and not journal.matches(settings):
+                raise ValueError(f"{journal.path} was written for a different run, start again without --resume")
+            if not journal.resumed:
+                journal.start(settings, offset=existing)
         
-        # Process articles
-        logger.info("Processing articles to identify company affiliations...")
-        results = process_articles(articles, debug=args.debug)
+        resumed = journal is not None and journal.resumed
+        # Resumed runs, and incremental runs after the first, append to the output
+        resume_offset = None
+        if journal is not None and (journal.resumed or (args.incremental and journal.offset > 0)):
+            resume_offset = journal.offset
+        writer = writer_class(args.file, resume_offset=resume_offset)
+        
+        if incremental_state is not None:
+            query_state = incremental_state.query(args.query)
+            mindate = query_state.mindate()
+            if mindate:
+                logger.info(f"Incremental run: searching articles added since {mindate}, "
+                            f"{len(query_state.seen)} already processed")
         
-        # Output results
-        if results:
-            logger.info(f"Found {len(results)} articles with company-affiliated authors")
-            OutputHandler.create_csv(results, args.file, args.debug)
-            logger.info("Done!")
+        # Search PubMed
+        truncated = journal is not None and journal.truncated
+        if journal is not None and journal.resumed and journal.pmids is not None:
+            # The PMIDs were journaled, only the unfinished ones are fetched
+            pmids = journal.remaining(journal.pmids)
+            total = len(pmids)
+            logger.info(f"Skipping search, {total} of {len(journal.pmids)} articles left to fetch")
+            if not total:
+                logger.info(f"Run already complete, {journal.rows} articles with company-affiliated authors")
+                return
         else:
-            logger.warning("No articles with company-affiliated authors found")
+            logger.info(f"Searching PubMed for: {args.query}")
+            if args.use_history:
+                count, webenv, query_key = pubmed_api.search_history(
+                    args.query, debug=args.debug, mindate=mindate
+                )
+                total = min(count, args.max_results) if args.max_results > 0 else count
+                truncated = total < count
+            elif query_state is not None:
+                pmids, truncated = search_new(args, pubmed_api, mindate, query_state.seen)
+                logger.info(f"{len(pmids)} new articles")
+                total = len(pmids)
+            else:
+                pmids = pubmed_api.search(args.query, retmax=args.max_results, debug=args.debug,
+                                          mindate=mindate)
+                total = len(pmids)
+            
+            if truncated and query_state is not None:
+                logger.warning(
+                    f"More new articles were found than --max-results {args.max_results} allows; "
+                    "the last run date is kept so the rest are searched again "
+                    "(raise --max-results to fetch them in one run)"
+                )
+            
+            if not total:
+                logger.warning("No results found for the query")
+                if incremental_state is not None and query_state is not None and not truncated:
+                    query_state.last_date = run_date
+                    incremental_state.save()
+                sys.exit(0)
+            
+            if journal is not None and not resumed:
+                journal.record_search(None if args.use_history else [str(pmid) for pmid in pmids], total,
+                                      truncated=truncated)
+            
+            logger.info(f"Found {total} articles, fetching details...")
+        
+        # Stream article details straight into processing
+        seen = query_state.seen if query_state is not None else None
+        logger.info("Processing articles to identify company affiliations...")
+        if args.workers > 1:
+            pool = ProcessingPool(args.workers, cache_size=args.cache_size, verdict_store=args.verdict_store,
+                                  article_store=args.article_store)
+        results = iter_results(args, pubmed_api, total,
+                               pmids=None if args.use_history else pmids,
+                               history=(webenv, query_key) if args.use_history else None,
+                               article_store=article_store, pool=pool)
+        found = write_rows(results, writer, journal, debug=args.debug, total=total, seen=seen)
+        
+        log_fetch_report(pubmed_api)
+        report = pubmed_api.last_fetch
+        
+        if incremental_state is not None and query_state is not None and journal is not None:
+            query_state.seen.update(journal.done)
+            # Keep the old date if articles are missing or were cut off by
+            # --max-results, so the next run searches for them again
+            if not report.failed and not truncated:
+                query_state.last_date = run_date
+            incremental_state.save()
+        
+        log_summary(found, response_cache, article_store)
         
     except Exception as e:
         logger.error(f"Error: {e}")
@@ -157,6 +1078,22 @@ def main() -> None:
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if pool is not None:
+            pool.close()
+        if writer is not None:
+            writer.close()
+        # Written once the output is complete, also for failed runs; exit(0) is a success
+        error = sys.exc_info()[1]
+        write_stats(args, found, pubmed_api, response_cache, article_store,
+                    succeeded=error is None or (isinstance(error, SystemExit) and not error.code))
+        if journal is not None:
+            journal.close()
+        AffiliationAnalyzer.close_store()
+        if response_cache is not None:
+            response_cache.close()
+        if article_store is not None:
+            article_store.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
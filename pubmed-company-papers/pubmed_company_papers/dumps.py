@@ -0,0 +1,79 @@
+"""Module for reading local PubMed baseline and update file dumps."""
+
+from typing import IO, Any, Dict, Iterable, Iterator, List, cast
+import glob
+import gzip
+import os
+import logging
+
+from pubmed_company_papers.xml_stream import iter_pubmed_articles
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# File name patterns of PubMed dumps (e.g. pubmed24n0001.xml.gz)
+DUMP_PATTERNS = ("*.xml.gz", "*.xml")
+
+def find_dump_files(paths: Iterable[str]) -> List[str]:
+    """
+    Expand input paths to the dump files they contain.
+
+    Directories are searched (non-recursively) for DUMP_PATTERNS and glob
+    patterns are expanded; files within a directory or pattern are sorted by
+    name, so baseline files come before the update files that amend them.
+
+    Args:
+        paths: Files, directories or glob patterns
+
+    Returns:
+        Dump files in processing order, without duplicates
+
+    Raises:
+        FileNotFoundError: If a path matches no file
+    """
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted({
+                match for pattern in DUMP_PATTERNS for match in glob.glob(os.path.join(path, pattern))
+            })
+        elif os.path.isfile(path):
+            matches = [path]
+        else:
+            matches = sorted(glob.glob(path))
+
+        if not matches:
+            raise FileNotFoundError(f"No PubMed XML files found at {path}")
+        files.extend(match for match in matches if match not in files)
+    return files
+
+def open_dump(path: str) -> IO[bytes]:
+    """
+    Open a dump file for reading, decompressing gzipped files on the fly.
+
+    Args:
+        path: .xml.gz or .xml file
+
+    Returns:
+        Binary file object
+    """
+    if path.endswith(".gz"):
+        # GzipFile reads like any binary file, but is not declared as an IO[bytes]
+        return cast(IO[bytes], gzip.open(path, "rb"))
+    return open(path, "rb")
+
+def iter_dump_articles(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the articles of a dump file.
+
+    Only <PubmedArticle> records are read; <DeleteCitation> entries of update
+    files are skipped.
+
+    Args:
+        path: .xml.gz or .xml file
+
+    Yields:
+        Compact article dictionaries (see xml_stream.extract_article)
+    """
+    with open_dump(path) as handle:
+        yield from iter_pubmed_articles(handle)
\ No newline at end of file
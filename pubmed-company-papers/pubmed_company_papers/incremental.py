@@ -0,0 +1,170 @@
+"""Module for keeping per-query state between incremental runs."""
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Iterator, Optional
+import base64
+import datetime
+import json
+import os
+import zlib
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Date format used by the esearch mindate/maxdate parameters
+ESEARCH_DATE_FORMAT = "%Y/%m/%d"
+
+# Days re-searched before the last run date, so records indexed late are not missed
+OVERLAP_DAYS = 1
+
+class PMIDSet:
+    """Sorted, compact set of PubMed IDs (4 bytes per ID in memory)."""
+
+    def __init__(self, pmids: Iterable[Any] = ()):
+        """
+        Initialize the set.
+
+        Args:
+            pmids: Initial PubMed IDs (strings or integers)
+        """
+        self._ids = array("I", sorted({int(pmid) for pmid in pmids}))
+
+    def __contains__(self, pmid: object) -> bool:
+        try:
+            value = int(pmid)  # type: ignore[call-overload]
+        except (TypeError, ValueError):
+            return False
+        index = bisect_left(self._ids, value)
+        return index < len(self._ids) and self._ids[index] == value
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(pmid) for pmid in self._ids)
+
+    def update(self, pmids: Iterable[Any]) -> None:
+        """
+        Add PubMed IDs to the set.
+
+        Args:
+            pmids: PubMed IDs to add; non-numeric values are ignored
+        """
+        new = {int(pmid) for pmid in pmids if str(pmid).isdigit()}
+        if new:
+            new.update(self._ids)
+            self._ids = array("I", sorted(new))
+
+    def encode(self) -> str:
+        """
+        Serialize the set.
+
+        Returns:
+            Base64 text of the zlib-compressed, delta-encoded sorted IDs
+        """
+        deltas = array("I", (b - a for a, b in zip([0] + list(self._ids), self._ids)))
+        return base64.b64encode(zlib.compress(deltas.tobytes())).decode("ascii")
+
+    @classmethod
+    def decode(cls, data: str) -> "PMIDSet":
+        """
+        Deserialize a set produced by encode().
+
+        Args:
+            data: Encoded set
+
+        Returns:
+            Decoded set
+        """
+        deltas = array("I")
+        deltas.frombytes(zlib.decompress(base64.b64decode(data)))
+        pmids = cls()
+        pmids._ids = array("I", accumulate(deltas))
+        return pmids
+
+class QueryState:
+    """Incremental state of one query: the last search date and the PMIDs seen so far."""
+
+    def __init__(self, last_date: Optional[datetime.date] = None, seen: Optional[PMIDSet] = None):
+        """
+        Initialize the state.
+
+        Args:
+            last_date: Date of the last completed run
+            seen: PMIDs processed by previous runs
+        """
+        self.last_date = last_date
+        self.seen = seen if seen is not None else PMIDSet()
+
+    def mindate(self) -> Optional[str]:
+        """
+        Get the esearch mindate for the next run.
+
+        Returns:
+            Last run date minus OVERLAP_DAYS in esearch format, or None before the first run
+        """
+        if self.last_date is None:
+            return None
+        return (self.last_date - datetime.timedelta(days=OVERLAP_DAYS)).strftime(ESEARCH_DATE_FORMAT)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the state to its JSON form."""
+        return {
+            "last_date": self.last_date.isoformat() if self.last_date else None,
+            "seen": self.seen.encode()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QueryState":
+        """Build a state from its JSON form."""
+        last_date = data.get("last_date")
+        return cls(
+            last_date=datetime.date.fromisoformat(last_date) if last_date else None,
+            seen=PMIDSet.decode(data["seen"]) if data.get("seen") else None
+        )
+
+class IncrementalState:
+    """JSON file holding the incremental state of every query run against an output file."""
+
+    def __init__(self, path: str):
+        """
+        Load the state file, if it exists.
+
+        Args:
+            path: State file
+        """
+        self.path = path
+        self.queries: Dict[str, QueryState] = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.queries = {
+                query: QueryState.from_dict(state) for query, state in data.get("queries", {}).items()
+            }
+
+    def query(self, query: str) -> QueryState:
+        """
+        Get the state of a query, creating an empty one for new queries.
+
+        Args:
+            query: PubMed search query
+
+        Returns:
+            State of the query
+        """
+        return self.queries.setdefault(query, QueryState())
+
+    def save(self) -> None:
+        """Write the state file atomically."""
+        data = {"queries": {query: state.to_dict() for query, state in self.queries.items()}}
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        logger.debug(f"Saved incremental state for {len(self.queries)} queries to {self.path}")
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""Module for journaling get-papers-list progress so interrupted runs can resume."""
+
+from typing import Any, Dict, IO, Iterable, List, Optional, Set
+import json
+import os
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class RunJournal:
+    """
+    Append-only JSON-lines journal of a run.
+
+    The journal records the run settings, the search result and, after every
+    checkpoint, the PMIDs that were processed together with the number of result
+    rows and the size of the output file at that point. Every entry is flushed
+    and synced before the run moves on, so a crash loses at most the batch that
+    was in progress.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Open a journal.
+
+        Args:
+            path: Journal file
+            resume: Whether to load and extend an existing journal; otherwise
+                any existing journal is replaced
+        """
+        self.path = path
+        self.settings: Optional[Dict[str, Any]] = None
+        self.pmids: Optional[List[str]] = None
+        self.count: Optional[int] = None
+        self.truncated = False
+        self.done: Set[str] = set()
+        self.rows = 0
+        self.offset = 0
+        self.resumed = False
+
+        if resume and os.path.exists(path):
+            self._load()
+            self.resumed = self.settings is not None
+            if self.resumed:
+                logger.info(
+                    f"Resuming from {path}: {len(self.done)} articles and {self.rows} rows already done"
+                )
+
+        self._file: IO[str] = open(path, "a" if self.resumed else "w", encoding="utf-8")
+
+    def _load(self) -> None:
+        """Replay the journal entries into the in-memory state."""
+        with open(self.path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # An entry cut off by a crash; everything before it is intact
+                    logger.warning(f"Ignoring incomplete journal entry at line {line_number}")
+                    break
+
+                event = entry.get("event")
+                if event == "run":
+                    self.settings = entry["settings"]
+                    self.offset = entry.get("offset", 0)
+                elif event == "search":
+                    self.pmids = entry.get("pmids")
+                    self.count = entry.get("count")
+                    self.truncated = entry.get("truncated", False)
+                elif event == "batch":
+                    self.done.update(entry["pmids"])
+                    self.rows = entry["rows"]
+                    self.offset = entry["offset"]
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Append an entry and force it to disk."""
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def matches(self, settings: Dict[str, Any]) -> bool:
+        """
+        Check whether a resumed journal was written for the same run settings.
+
+        Args:
+            settings: Settings of the current run
+
+        Returns:
+            True if the journal's settings are identical
+        """
+        return self.settings == settings
+
+    def start(self, settings: Dict[str, Any], offset: int = 0) -> None:
+        """
+        Record the settings of a new run.
+
+        Args:
+            settings: JSON-serializable run settings (query, result limit, ...)
+            offset: Size of the output file before the run (bytes), non-zero
+                when rows are appended to an existing file
+        """
+        self.settings = settings
+        self.offset = offset
+        self._write({"event": "run", "settings": settings, "offset": offset})
+
+    def record_search(self, pmids: Optional[List[str]], count: int, truncated: bool = False) -> None:
+        """
+        Record the search result.
+
+        Args:
+            pmids: PMIDs to fetch (None for history-server searches)
+            count: Number of articles to fetch
+            truncated: Whether the search found more articles than are fetched
+        """
+        self.pmids = pmids
+        self.count = count
+        self.truncated = truncated
+        self._write({"event": "search", "pmids": pmids, "count": count, "truncated": truncated})
+
+    def record_batch(self, pmids: Iterable[str], rows: int, offset: int) -> None:
+        """
+        Record a completed batch.
+
+        Args:
+            pmids: PMIDs processed in the batch
+            rows: Total number of result rows written so far
+            offset: Size of the output file after the batch (bytes)
+        """
+        pmids = list(pmids)
+        self.done.update(pmids)
+        self.rows = rows
+        self.offset = offset
+        self._write({"event": "batch", "pmids": pmids, "rows": rows, "offset": offset})
+
+    def remaining(self, pmids: Iterable[str]) -> List[str]:
+        """
+        Filter out PMIDs that were already processed.
+
+        Args:
+            pmids: PMIDs of the run
+
+        Returns:
+            PMIDs not yet recorded in a completed batch, in their original order
+        """
+        return [pmid for pmid in pmids if pmid not in self.done]
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
\ No newline at end of file
@@ -1,60 +1,87 @@
-"""Module for handling output of PubMed data to CSV."""
+"""Module for handling output of PubMed data to CSV, JSON Lines and Parquet."""
 
-from typing import Dict, List, Optional, Any
+from abc import ABC, abstractmethod
+from typing import IO, Dict, Iterable, List, Optional, Any, Type
 import csv
+import json
+import os
 import sys
+import time
 import logging
-import pandas as pd
+
+from pubmed_company_papers.records import ArticleRecord
+from pubmed_company_papers.stats import STATS
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# CSV columns, in output order
+CSV_COLUMNS = [
+    "PubmedID",
+    "Title",
+    "PublicationDate",
+    "Non-academicAuthor(s)",
+    "CompanyAffiliation(s)",
+    "CorrespondingAuthorEmail"
+]
+
+# Multi-valued columns: lists in result rows, joined with LIST_SEPARATOR in CSV
+LIST_COLUMNS = ("Non-academicAuthor(s)", "CompanyAffiliation(s)")
+LIST_SEPARATOR = "; "
+
+# Columns of multi-query runs: every row is prefixed with the query that matched it
+QUERY_COLUMN = "Query"
+QUERY_COLUMNS = [QUERY_COLUMN] + CSV_COLUMNS
+
 class OutputHandler:
     """Class to handle output of PubMed data to CSV."""
     
     @staticmethod
-    def create_csv(data: List[Dict[str, Any]], filename: Optional[str] = None, debug: bool = False) -> None:
+    def create_csv(data: Iterable[Dict[str, Any]], filename: Optional[str] = None, debug: bool = False) -> int:
         """
         Create a CSV file from the processed PubMed data.
         
+        Rows are written one at a time as they arrive, so `data` can be a
+        generator and the results are never held in memory as a whole.
+        
         Args:
-            data: List of dictionaries containing paper information
+            data: Dictionaries containing paper information (a list or a stream)
             filename: Optional filename to save the CSV to
             debug: Whether to print debug information
+            
+        Returns:
+            Number of rows written
         """
-        if not data:
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
             logger.warning("No data to output")
-            return
-        
-        # Define CSV columns
-        columns = [
-            "PubmedID", 
-            "Title", 
-            "PublicationDate", 
-            "Non-academicAuthor(s)", 
-            "CompanyAffiliation(s)", 
-            "CorrespondingAuthorEmail"
-        ]
+            return 0
         
+        start = time.perf_counter()
+        stream: IO[str] = open(filename, "w", newline="", encoding="utf-8") if filename else sys.stdout
+        count = 0
         try:
-            # Create DataFrame
-            df = pd.DataFrame(data)
-            
-            if debug:
-                logger.debug(f"Created DataFrame with {len(df)} rows")
-            
-            if filename:
-                # Save to file
-                df.to_csv(filename, index=False)
-                if debug:
-                    logger.debug(f"Saved CSV to {filename}")
-            else:
-                # Print to console
-                print(df.to_csv(index=False))
-                
+            writer = csv.DictWriter(stream, fieldnames=CSV_COLUMNS, extrasaction="ignore",
+                                    lineterminator="\n")
+            writer.writeheader()
+            writer.writerow(OutputHandler.to_csv_row(first))
+            count = 1
+            for row in rows:
+                writer.writerow(OutputHandler.to_csv_row(row))
+                count += 1
+            stream.flush()
         except Exception as e:
             logger.error(f"Error creating CSV: {e}")
             raise
+        finally:
+            if filename:
+                stream.close()
+        
+        STATS.record("output", time.perf_counter() - start, count)
+        if debug:
+            logger.debug(f"Wrote {count} rows to {filename or 'the console'}")
+        return count
     
     @staticmethod
     def format_data_for_csv(
@@ -86,4 +113,286 @@ class OutputHandler:
             "Non-academicAuthor(s)": "; ".join(company_authors),
             "CompanyAffiliation(s)": "; ".join(company_names),
             "CorrespondingAuthorEmail": corresponding_email
-        }
\ No newline at end of file
+        }
+    
+    @staticmethod
+    def format_row(
+        record: ArticleRecord,
+        company_authors: List[str],
+        company_names: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Format an extracted article record as a result row.
+        
+        Unlike format_data_for_csv, the author and company columns are kept as
+        lists, so JSON Lines and Parquet output can store them without joining.
+        
+        Args:
+            record: Article record from PubMedParser.extract_article
+            company_authors: List of company-affiliated authors
+            company_names: List of company names
+            
+        Returns:
+            Dictionary with the CSV columns as keys
+        """
+        return {
+            "PubmedID": record.pubmed_id,
+            "Title": record.title,
+            "PublicationDate": record.publication_date,
+            "Non-academicAuthor(s)": list(company_authors),
+            "CompanyAffiliation(s)": list(company_names),
+            "CorrespondingAuthorEmail": record.corresponding_email
+        }
+    
+    @staticmethod
+    def to_csv_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Join the list-valued columns of a result row for CSV output.
+        
+        Args:
+            row: Dictionary from format_row or format_data_for_csv
+            
+        Returns:
+            Dictionary with every value flattened to a string
+        """
+        if not any(isinstance(row.get(column), list) for column in LIST_COLUMNS):
+            return row
+        flat = dict(row)
+        for column in LIST_COLUMNS:
+            if isinstance(flat.get(column), list):
+                flat[column] = LIST_SEPARATOR.join(flat[column])
+        return flat
+
+class RowAppender(ABC):
+    """
+    Write result rows to a file or the console incrementally, one batch at a time.
+    
+    Subclasses implement _write_rows for their format; every batch is flushed
+    and synced, so the file size after append() is a valid resume checkpoint.
+    """
+    
+    # Whether an interrupted file can be truncated to a checkpoint and extended
+    supports_resume = True
+    
+    def __init__(self, filename: Optional[str] = None, resume_offset: Optional[int] = None,
+                 columns: Optional[List[str]] = None):
+        """
+        Initialize the writer.
+        
+        Args:
+            filename: Optional filename to write to (the console is used if not provided)
+            resume_offset: Size in bytes of the output file at the last checkpoint;
+                anything after it is discarded and new rows are appended. If not
+                provided, an existing file is replaced.
+            columns: Columns to write, in order (default: CSV_COLUMNS)
+        """
+        self.filename = filename
+        self.columns = list(columns or CSV_COLUMNS)
+        self._stream: Optional[IO[str]] = None
+        self._extending = False
+        
+        if filename and resume_offset is not None and os.path.exists(filename):
+            # Drop rows written after the last checkpoint, they are processed again
+            os.truncate(filename, resume_offset)
+            self._stream = open(filename, "a", newline="", encoding="utf-8")
+            self._extending = resume_offset > 0
+    
+    def append(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Append rows and flush them to disk.
+        
+        Nothing is written until there is at least one row. Each write is
+        recorded as one call of the "output" stage.
+        
+        Args:
+            rows: Dictionaries from OutputHandler.format_row or format_data_for_csv
+            
+        Returns:
+            Size of the output file in bytes after the write (0 for the console)
+        """
+        if rows:
+            with STATS.timer("output", len(rows)):
+                self._write_rows(rows)
+                if self._stream is not None:
+                    self._stream.flush()
+                    if self.filename:
+                        os.fsync(self._stream.fileno())
+        
+        return self.size()
+    
+    @abstractmethod
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Serialize rows to the output, opening it with _open() on first use."""
+    
+    def _open(self) -> IO[str]:
+        """Open the output on first use."""
+        if self._stream is None:
+            if self.filename:
+                self._stream = open(self.filename, "w", newline="", encoding="utf-8")
+            else:
+                self._stream = sys.stdout
+        return self._stream
+    
+    def size(self) -> int:
+        """
+        Get the size of the output file.
+        
+        Returns:
+            Size in bytes (0 for the console or before anything was written)
+        """
+        if self.filename and self._stream is not None:
+            return os.fstat(self._stream.fileno()).st_size
+        return 0
+    
+    def close(self) -> None:
+        """Close the output file."""
+        if self.filename and self._stream is not None:
+            self._stream.close()
+        self._stream = None
+
+class CSVAppender(RowAppender):
+    """Write result rows as CSV, with list-valued columns joined by LIST_SEPARATOR."""
+    
+    def __init__(self, filename: Optional[str] = None, resume_offset: Optional[int] = None,
+                 columns: Optional[List[str]] = None):
+        """
+        Initialize the writer.
+        
+        Args:
+            filename: Optional filename to write to (the console is used if not provided)
+            resume_offset: Size in bytes of the output file at the last checkpoint
+            columns: Columns to write, in order (default: CSV_COLUMNS)
+        """
+        super().__init__(filename, resume_offset, columns)
+        # A file extended after a checkpoint already has its header
+        self._header_written = self._extending
+    
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Write the header before the first row, then the rows."""
+        writer = csv.DictWriter(self._open(), fieldnames=self.columns, lineterminator="\n")
+        if not self._header_written:
+            writer.writeheader()
+            self._header_written = True
+        writer.writerows(OutputHandler.to_csv_row(row) for row in rows)
+
+class JSONLinesAppender(RowAppender):
+    """Write result rows as JSON Lines, one object per article with list-valued columns."""
+    
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Write one JSON object per line."""
+        self._open().write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+
+class ParquetAppender(RowAppender):
+    """
+    Write result rows to a Parquet file with list-valued author and company columns.
+    
+    Rows are buffered and written as a row group whenever `row_group_size` rows
+    are pending, so memory stays bounded however many rows are written. Parquet
+    files end with a footer, so an interrupted file cannot be extended.
+    Requires the optional pyarrow dependency.
+    """
+    
+    supports_resume = False
+    
+    # Rows per Parquet row group
+    ROW_GROUP_SIZE = 10000
+    
+    def __init__(self, filename: Optional[str] = None, resume_offset: Optional[int] = None,
+                 columns: Optional[List[str]] = None, row_group_size: int = ROW_GROUP_SIZE):
+        """
+        Initialize the writer.
+        
+        Args:
+            filename: File to write to (Parquet cannot be written to the console)
+            resume_offset: Not supported, must be None
+            columns: Columns to write, in order (default: CSV_COLUMNS)
+            row_group_size: Number of rows per row group
+            
+        Raises:
+            ValueError: If no filename or a resume offset is given
+            ImportError: If pyarrow is not installed
+        """
+        if not filename:
+            raise ValueError("Parquet output requires a file")
+        if resume_offset is not None:
+            raise ValueError("Parquet output cannot be resumed or appended to")
+        
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from e
+        
+        super().__init__(filename, columns=columns)
+        self.row_group_size = row_group_size
+        self._pa = pa
+        self._pq = pq
+        self._schema = pa.schema([
+            (column, pa.list_(pa.string()) if column in LIST_COLUMNS else pa.string())
+            for column in self.columns
+        ])
+        self._writer: Any = None
+        self._pending: List[Dict[str, Any]] = []
+    
+    def append(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Queue rows and write a row group once enough are pending.
+        
+        Args:
+            rows: Dictionaries from OutputHandler.format_row
+            
+        Returns:
+            Size of the output file in bytes after the write
+        """
+        self._pending.extend(rows)
+        if len(self._pending) >= self.row_group_size:
+            self._write_pending()
+        return self.size()
+    
+    def _write_pending(self) -> None:
+        """Write the pending rows as one row group."""
+        if not self._pending:
+            return
+        start = time.perf_counter()
+        self._write_rows(self._pending)
+        STATS.record("output", time.perf_counter() - start, len(self._pending))
+        self._pending = []
+    
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Write rows as one row group, starting the file on first use."""
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.filename, self._schema)
+        
+        columns: Dict[str, List[Any]] = {column: [] for column in self.columns}
+        for row in rows:
+            for column in self.columns:
+                value = row.get(column)
+                if column in LIST_COLUMNS and isinstance(value, str):
+                    value = value.split(LIST_SEPARATOR) if value else []
+                columns[column].append(value)
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+    
+    def size(self) -> int:
+        """
+        Get the size of the output file.
+        
+        Returns:
+            Size in bytes of the row groups written so far
+        """
+        if self._writer is not None and self.filename and os.path.exists(self.filename):
+            return os.path.getsize(self.filename)
+        return 0
+    
+    def close(self) -> None:
+        """Write the remaining rows and the file footer."""
+        self._write_pending()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+# Result writers by --format name
+OUTPUT_FORMATS: Dict[str, Type[RowAppender]] = {
+    "csv": CSVAppender,
+    "jsonl": JSONLinesAppender,
+    "parquet": ParquetAppender,
+}
\ No newline at end of file
@@ -5,9 +5,14 @@ import logging
 import re
 from datetime import datetime
 
+from pubmed_company_papers.records import STRING_POOL, ArticleRecord, AuthorRecord
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Pattern used to find an email address in an affiliation string
+EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+
 class PubMedParser:
     """Class to parse PubMed API responses."""
     
@@ -24,42 +29,54 @@ class PubMedParser:
         """
         try:
             pub_date_info = article["MedlineCitation"]["Article"]["Journal"]["JournalIssue"]["PubDate"]
+            return PubMedParser._format_publication_date(pub_date_info)
+            
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Error extracting publication date: {e}")
+            return "Unknown"
+    
+    @staticmethod
+    def _format_publication_date(pub_date_info: Dict[str, Any]) -> str:
+        """
+        Format a PubDate element as a date string.
+        
+        Args:
+            pub_date_info: PubDate dictionary
             
-            # Handle different date formats
-            if "Year" in pub_date_info:
-                year = pub_date_info.get("Year", "")
-                month = pub_date_info.get("Month", "01")
-                day = pub_date_info.get("Day", "01")
-                
-                # Convert month names to numbers
-                if month.isalpha():
+        Returns:
+            Publication date as a string (YYYY-MM-DD), or "Unknown"
+        """
+        # Handle different date formats
+        if "Year" in pub_date_info:
+            year = pub_date_info.get("Year", "")
+            month = pub_date_info.get("Month", "01")
+            day = pub_date_info.get("Day", "01")
+            
+            # Convert month names to numbers
+            if month.isalpha():
+                try:
+                    month = datetime.strptime(month, "%b").month
+                except ValueError:
                     try:
-                        month = datetime.strptime(month, "%b").month
+                        month = datetime.strptime(month, "%B").month
                     except ValueError:
-                        try:
-                            month = datetime.strptime(month, "%B").month
-                        except ValueError:
-                            month = "01"
-                
-                # Ensure month and day are two digits
-                month = str(month).zfill(2)
-                day = str(day).zfill(2)
-                
-                return f"{year}-{month}-{day}"
-            else:
-                # Handle MedlineDate format (e.g., "2020 Jan-Feb")
-                medline_date = pub_date_info.get("MedlineDate", "")
-                if medline_date:
-                    # Extract year
-                    year_match = re.search(r'\d{4}', medline_date)
-                    if year_match:
-                        return f"{year_match.group(0)}-01-01"
+                        month = "01"
             
-            return "Unknown"
+            # Ensure month and day are two digits
+            month = str(month).zfill(2)
+            day = str(day).zfill(2)
             
-        except (KeyError, TypeError) as e:
-            logger.warning(f"Error extracting publication date: {e}")
-            return "Unknown"
+            return f"{year}-{month}-{day}"
+        else:
+            # Handle MedlineDate format (e.g., "2020 Jan-Feb")
+            medline_date = pub_date_info.get("MedlineDate", "")
+            if medline_date:
+                # Extract year
+                year_match = re.search(r'\d{4}', medline_date)
+                if year_match:
+                    return f"{year_match.group(0)}-01-01"
+        
+        return "Unknown"
     
     @staticmethod
     def extract_title(article: Dict[str, Any]) -> str:
@@ -106,73 +123,88 @@ class PubMedParser:
         Returns:
             List of dictionaries containing author information
         """
-        authors_info = []
-        
         try:
             author_list = article["MedlineCitation"]["Article"]["AuthorList"]
-            
-            for author in author_list:
-                if "Author" in author:
-                    author = author["Author"]
-                
-                # Skip if not a valid author
-                if not isinstance(author, dict):
-                    continue
-                
-                # Extract author name
-                last_name = author.get("LastName", "")
-                fore_name = author.get("ForeName", "")
-                initials = author.get("Initials", "")
-                
-                full_name = f"{last_name}, {fore_name}" if fore_name else last_name
-                if not full_name and initials:
-                    full_name = initials
-                
-                # Extract affiliations
-                affiliations = []
-                
-                # Handle different affiliation formats
-                if "AffiliationInfo" in author:
-                    for affiliation in author["AffiliationInfo"]:
-                        if "Affiliation" in affiliation:
-                            affiliations.append(affiliation["Affiliation"])
-                elif "Affiliation" in author:
-                    if isinstance(author["Affiliation"], list):
-                        for affiliation in author["Affiliation"]:
-                            if isinstance(affiliation, dict) and "Affiliation" in affiliation:
-                                affiliations.append(affiliation["Affiliation"])
-                            elif isinstance(affiliation, str):
-                                affiliations.append(affiliation)
-                    elif isinstance(author["Affiliation"], str):
-                        affiliations.append(author["Affiliation"])
-                
-                # Extract email
-                email = ""
-                for affiliation in affiliations:
-                    email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', affiliation)
-                    if email_match:
-                        email = email_match.group(0)
-                        break
-                
-                # Check if corresponding author
-                is_corresponding = False
-                if "ValidYN" in author and author["ValidYN"] == "Y":
-                    if "EqualContrib" in author and author["EqualContrib"] == "Y":
-                        is_corresponding = True
-                
-                authors_info.append({
-                    "name": full_name,
-                    "affiliations": affiliations,
-                    "email": email,
-                    "is_corresponding": is_corresponding
-                })
-            
-            return authors_info
+            return [author.as_dict() for author in PubMedParser._extract_authors(author_list)]
             
         except (KeyError, TypeError) as e:
             logger.warning(f"Error extracting authors: {e}")
             return []
     
+    @staticmethod
+    def _extract_authors(author_list: List[Any]) -> Tuple[AuthorRecord, ...]:
+        """
+        Extract author records from an AuthorList.
+        
+        Affiliation strings are interned in the shared string pool, so an
+        affiliation repeated across co-authors and articles is stored once.
+        
+        Args:
+            author_list: AuthorList entries
+            
+        Returns:
+            Tuple of author records
+        """
+        authors_info = []
+        
+        for author in author_list:
+            if "Author" in author:
+                author = author["Author"]
+            
+            # Skip if not a valid author
+            if not isinstance(author, dict):
+                continue
+            
+            # Extract author name
+            last_name = author.get("LastName", "")
+            fore_name = author.get("ForeName", "")
+            initials = author.get("Initials", "")
+            
+            full_name = f"{last_name}, {fore_name}" if fore_name else last_name
+            if not full_name and initials:
+                full_name = initials
+            
+            # Extract affiliations
+            affiliations = []
+            
+            # Handle different affiliation formats
+            if "AffiliationInfo" in author:
+                for affiliation in author["AffiliationInfo"]:
+                    if "Affiliation" in affiliation:
+                        affiliations.append(affiliation["Affiliation"])
+            elif "Affiliation" in author:
+                if isinstance(author["Affiliation"], list):
+                    for affiliation in author["Affiliation"]:
+                        if isinstance(affiliation, dict) and "Affiliation" in affiliation:
+                            affiliations.append(affiliation["Affiliation"])
+                        elif isinstance(affiliation, str):
+                            affiliations.append(affiliation)
+                elif isinstance(author["Affiliation"], str):
+                    affiliations.append(author["Affiliation"])
+            
+            # Extract email
+            email = ""
+            for affiliation in affiliations:
+                email_match = EMAIL_PATTERN.search(affiliation)
+                if email_match:
+                    email = email_match.group(0)
+                    break
+            
+            # Check if corresponding author
+            is_corresponding = False
+            if "ValidYN" in author and author["ValidYN"] == "Y":
+                if "EqualContrib" in author and author["EqualContrib"] == "Y":
+                    is_corresponding = True
+            
+            authors_info.append(AuthorRecord(
+                name=full_name,
+                affiliations=STRING_POOL.intern_all(affiliations),
+                email=email,
+                is_corresponding=is_corresponding
+            ))
+        
+        return tuple(authors_info)
+    
     @staticmethod
     def extract_corresponding_author_email(article: Dict[str, Any]) -> str:
         """
@@ -184,16 +216,90 @@ class PubMedParser:
         Returns:
             Corresponding author's email
         """
-        authors = PubMedParser.extract_authors_with_affiliations(article)
+        try:
+            author_list = article["MedlineCitation"]["Article"]["AuthorList"]
+            authors = PubMedParser._extract_authors(author_list)
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Error extracting authors: {e}")
+            authors = ()
         
+        return PubMedParser._select_corresponding_email(authors)
+    
+    @staticmethod
+    def _select_corresponding_email(authors: Tuple[AuthorRecord, ...]) -> str:
+        """
+        Pick the corresponding author's email from extracted author records.
+        
+        Args:
+            authors: Author records
+            
+        Returns:
+            Corresponding author's email, or "Unknown"
+        """
         # First check for explicitly marked corresponding authors
         for author in authors:
-            if author["is_corresponding"] and author["email"]:
-                return author["email"]
+            if author.is_corresponding and author.email:
+                return author.email
         
         # If no corresponding author is marked, return the first email found
         for author in authors:
-            if author["email"]:
-                return author["email"]
+            if author.email:
+                return author.email
+        
+        return "Unknown"
+    
+    @staticmethod
+    def extract_article(article: Dict[str, Any]) -> ArticleRecord:
+        """
+        Extract every field used downstream from a PubMed article in one pass.
+        
+        Gives the same values as calling extract_pubmed_id, extract_title,
+        extract_publication_date, extract_authors_with_affiliations and
+        extract_corresponding_author_email separately, but walks the record once.
+        
+        Args:
+            article: PubMed article dictionary
+            
+        Returns:
+            ArticleRecord with the article's fields
+        """
+        try:
+            citation = article["MedlineCitation"]
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Error extracting article: {e}")
+            return ArticleRecord("Unknown", "Unknown", "Unknown", (), "Unknown")
+        
+        try:
+            pubmed_id = citation["PMID"]
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Error extracting PubMed ID: {e}")
+            pubmed_id = "Unknown"
+        
+        details = citation.get("Article", {}) if isinstance(citation, dict) else {}
+        
+        try:
+            title = details["ArticleTitle"]
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Error extracting title: {e}")
+            title = "Unknown"
+        
+        try:
+            pub_date_info = details["Journal"]["JournalIssue"]["PubDate"]
+            publication_date = PubMedParser._format_publication_date(pub_date_info)
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Error extracting publication date: {e}")
+            publication_date = "Unknown"
+        
+        try:
+            authors = PubMedParser._extract_authors(details["AuthorList"])
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Error extracting authors: {e}")
+            authors = ()
         
-        return "Unknown"
\ No newline at end of file
+        return ArticleRecord(
+            pubmed_id=pubmed_id,
+            title=title,
+            publication_date=publication_date,
+            authors=authors,
+            corresponding_email=PubMedParser._select_corresponding_email(authors)
+        )
\ No newline at end of file
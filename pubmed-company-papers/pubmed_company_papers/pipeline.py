@@ -0,0 +1,153 @@
+"""Module providing thread-based pipeline stages connected by bounded queues."""
+
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+import queue
+import threading
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Seconds a blocked stage waits before re-checking whether the pipeline was stopped
+_POLL_INTERVAL = 0.1
+
+class _Done:
+    """Marker put on a queue after the last item."""
+
+class _Failed:
+    """Marker carrying an exception raised by a producer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+def iter_in_thread(iterable: Iterable[T], maxsize: int = 4, chunk_size: int = 32,
+                   name: str = "producer") -> Iterator[T]:
+    """
+    Consume an iterable on a background thread and yield its items.
+
+    The producer runs ahead of the consumer by at most `maxsize` chunks, so a
+    slow source (e.g. network fetches) overlaps with the work done on its items
+    without buffering the whole stream. Exceptions raised by the producer are
+    re-raised in the consumer. If the consumer stops early, the producer is
+    stopped and the iterable closed.
+
+    Args:
+        iterable: Source of items (e.g. a generator issuing requests)
+        maxsize: Maximum number of chunks buffered between the threads
+        chunk_size: Number of items handed over at a time
+        name: Name of the producer thread
+
+    Yields:
+        Items of the iterable, in order
+    """
+    channel: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                channel.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        chunk: List[T] = []
+        try:
+            for item in iterable:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    if not put(chunk):
+                        return
+                    chunk = []
+            if chunk and not put(chunk):
+                return
+            put(_Done)
+        except BaseException as e:
+            put(_Failed(e))
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            chunk = channel.get()
+            if chunk is _Done:
+                return
+            if isinstance(chunk, _Failed):
+                raise chunk.error
+            yield from chunk
+    finally:
+        stopped.set()
+        thread.join()
+
+class BackgroundWorker:
+    """Single thread running submitted tasks in order, fed through a bounded queue."""
+
+    def __init__(self, maxsize: int = 4, name: str = "worker"):
+        """
+        Start the worker.
+
+        Args:
+            maxsize: Maximum number of tasks waiting; submit() blocks beyond it
+            name: Name of the worker thread
+        """
+        self._tasks: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is _Done:
+                return
+            if self._error is not None:
+                # Drop the remaining work after a failure, its order can no longer be kept
+                continue
+            func, args = task
+            try:
+                func(*args)
+            except BaseException as e:
+                self._error = e
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> None:
+        """
+        Queue a task, blocking while the queue is full.
+
+        Args:
+            func: Function to run on the worker thread
+            *args: Arguments for func
+
+        Raises:
+            The exception of a previously failed task
+        """
+        self._raise_error()
+        while True:
+            try:
+                self._tasks.put((func, args), timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                self._raise_error()
+
+    def close(self) -> None:
+        """
+        Wait for the queued tasks to finish and stop the worker.
+
+        Raises:
+            The exception of a failed task
+        """
+        self._tasks.put(_Done)
+        self._thread.join()
+        self._raise_error()
\ No newline at end of file
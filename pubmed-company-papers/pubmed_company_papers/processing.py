@@ -0,0 +1,280 @@
+"""Module for turning PubMed articles into result rows, in-process or on a worker pool."""
+
+from collections import deque
+from concurrent.futures import Future
+from io import BytesIO
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+import time
+import logging
+import xml.etree.ElementTree as ET
+
+from pubmed_company_papers.affiliations import AffiliationAnalyzer
+from pubmed_company_papers.article_store import ArticleStore
+from pubmed_company_papers.dumps import iter_dump_articles
+from pubmed_company_papers.output import OutputHandler
+from pubmed_company_papers.parser import PubMedParser
+from pubmed_company_papers.retry import FailedBatch, RawBatch, remaining_params
+from pubmed_company_papers.stats import STATS, record_cache_stats
+from pubmed_company_papers.xml_stream import iter_pubmed_articles
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# A processed article: (PubMed ID, formatted row or None if no author is company-affiliated)
+Result = Tuple[str, Optional[Dict[str, Any]]]
+
+T = TypeVar("T")
+
+# Article store of a pool worker, opened by _init_worker
+_worker_article_store: Optional[ArticleStore] = None
+
+class PayloadError(Exception):
+    """Raised when an efetch batch fails to parse part-way, carrying the results before the error."""
+
+    def __init__(self, message: str, results: List[Result]):
+        # Both go into args, so the error survives the trip back from a pool worker
+        super().__init__(message, results)
+        self.message = message
+        self.results = results
+
+    def __str__(self) -> str:
+        return self.message
+
+def process_article(article: Dict[str, Any]) -> Result:
+    """
+    Process a single PubMed article.
+
+    Extraction and classification are timed as the "parser" and "classifier" stages.
+
+    Args:
+        article: PubMed article
+
+    Returns:
+        Tuple containing (PubMed ID, formatted row or None if no author is company-affiliated)
+    """
+    # Extract all article fields in a single pass
+    start = time.perf_counter()
+    record = PubMedParser.extract_article(article)
+    extracted = time.perf_counter()
+
+    # Identify company-affiliated authors
+    company_authors, company_names = AffiliationAnalyzer.identify_company_authors(record.authors)
+    STATS.record("parser", extracted - start, 1)
+    STATS.record("classifier", time.perf_counter() - extracted, len(record.authors))
+
+    # Only include papers with at least one company-affiliated author
+    if not company_authors:
+        return record.pubmed_id, None
+
+    # Format the result row, keeping author and company lists for columnar output
+    return record.pubmed_id, OutputHandler.format_row(record, company_authors, company_names)
+
+def process_payload(data: bytes) -> List[Result]:
+    """
+    Parse and classify one raw efetch batch.
+
+    Runs inside pool workers: only the raw XML goes in and only the small
+    result tuples come back across the process boundary. Parsed articles are
+    added to the worker's article store, if one is open.
+
+    Args:
+        data: efetch XML document
+
+    Returns:
+        One result per article, in document order
+
+    Raises:
+        PayloadError: If the document is malformed (e.g. truncated)
+    """
+    results: List[Result] = []
+    try:
+        for article in iter_pubmed_articles(BytesIO(data)):
+            if _worker_article_store is not None:
+                _worker_article_store.put(article)
+            results.append(process_article(article))
+    except ET.ParseError as e:
+        raise PayloadError(str(e), results) from None
+    finally:
+        AffiliationAnalyzer.flush_store()
+        if _worker_article_store is not None:
+            _worker_article_store.flush()
+    return results
+
+def process_file(path: str) -> List[Result]:
+    """
+    Parse and classify one local PubMed dump file.
+
+    Runs inside pool workers: only the path goes in, and the file is read and
+    decompressed by the worker itself.
+
+    Args:
+        path: .xml.gz or .xml baseline/update file
+
+    Returns:
+        One result per article, in file order
+    """
+    results = [process_article(article) for article in iter_dump_articles(path)]
+    AffiliationAnalyzer.flush_store()
+    logger.debug(f"Processed {len(results)} articles from {path}")
+    return results
+
+def _run_task(func: Callable[[T], List[Result]], item: T) -> Tuple[List[Result], Dict[str, Any]]:
+    """
+    Run a task in a pool worker and collect the statistics it recorded.
+
+    Args:
+        func: process_payload or process_file
+        item: Argument for func
+
+    Returns:
+        Tuple of (results, snapshot of the task's statistics for RunStats.merge)
+    """
+    STATS.reset()
+    before = AffiliationAnalyzer.cache_stats()
+    results = func(item)
+    after = AffiliationAnalyzer.cache_stats()
+    record_cache_stats({key: value - before.get(key, 0) for key, value in after.items()}, "affiliation_cache")
+    return results, STATS.snapshot()
+
+def _init_worker(cache_size: int, verdict_store: Optional[str], article_store: Optional[str]) -> None:
+    """Configure the affiliation analyzer and article store of a pool worker."""
+    global _worker_article_store
+    AffiliationAnalyzer.configure_cache(cache_size)
+    if verdict_store:
+        AffiliationAnalyzer.open_store(verdict_store)
+    if article_store:
+        _worker_article_store = ArticleStore(article_store)
+
+class ProcessingPool:
+    """Pool of worker processes that parse and classify raw efetch batches."""
+
+    def __init__(self, workers: int, cache_size: int = AffiliationAnalyzer.DEFAULT_CACHE_SIZE,
+                 verdict_store: Optional[str] = None, article_store: Optional[str] = None):
+        """
+        Start the pool.
+
+        Args:
+            workers: Number of worker processes
+            cache_size: Size of each worker's affiliation verdict cache
+            verdict_store: Optional verdict store file shared by the workers
+            article_store: Optional article store file the workers add parsed articles to
+        """
+        # Loads multiprocessing, which only the pool needs
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+
+        self.workers = workers
+        self.articles = 0
+        self.failed: List[FailedBatch] = []
+        # Spawned rather than forked: a forked worker would inherit the parent's open
+        # SQLite connections (verdict and article stores, response cache), which are
+        # not safe to use across a fork; each worker opens its own in _init_worker
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(cache_size, verdict_store, article_store)
+        )
+
+    def process(self, batches: Iterable[RawBatch]) -> Iterator[Result]:
+        """
+        Process downloaded efetch batches on the pool.
+
+        At most twice `workers` batches are queued or in progress at a time, and
+        results are yielded in batch order, so the output is deterministic.
+        A batch that fails to parse, or whose worker fails, is logged and added
+        to `failed` with parameters covering only the articles it did not
+        deliver, so the caller can re-drive it; the articles it did deliver
+        are still yielded.
+
+        Args:
+            batches: Tuples of (batch number, parameters, efetch XML), as
+                yielded by PubMedAPI.iter_article_batches
+
+        Yields:
+            Results of every article, in input order; the workers' statistics
+            are merged into STATS as their batches complete
+        """
+        self.failed = []
+        tasks = (((number, params), data) for number, params, data in batches)
+        return self._map(process_payload, tasks, self._batch_failed)
+
+    def process_files(self, paths: Iterable[str]) -> Iterator[Result]:
+        """
+        Process local dump files on the pool, one file per task.
+
+        Ordering is the same as for process(); a file that cannot be
+        processed is logged, skipped and added to `failed`, numbered by its
+        position in `paths` and with its path as the "path" parameter.
+
+        Args:
+            paths: .xml.gz or .xml baseline/update files
+
+        Yields:
+            Results of every article, in file order
+        """
+        self.failed = []
+        tasks = (((number, path), path) for number, path in enumerate(paths, 1))
+        return self._map(process_file, tasks, self._file_failed)
+
+    def _batch_failed(self, key: Tuple[int, Dict[str, Any]], error: Exception) -> List[Result]:
+        """Record a failed batch, returning the results it delivered before failing."""
+        number, params = key
+        results = error.results if isinstance(error, PayloadError) else []
+        logger.error(f"Error processing batch {number}: {error}")
+        self.failed.append(FailedBatch(number, remaining_params(params, [pmid for pmid, _ in results]), str(error)))
+        return results
+
+    def _file_failed(self, key: Tuple[int, str], error: Exception) -> List[Result]:
+        """Record a file that could not be processed; none of its results are kept."""
+        number, path = key
+        logger.error(f"Error processing file {path}: {error}")
+        self.failed.append(FailedBatch(number, {"path": path}, str(error)))
+        return []
+
+    def _map(self, func: Callable[[T], List[Result]], tasks: Iterable[Tuple[Any, T]],
+             on_error: Callable[[Any, Exception], List[Result]]) -> Iterator[Result]:
+        """
+        Run func over tasks on the pool with a bounded window, yielding results in order.
+
+        Args:
+            func: process_payload or process_file
+            tasks: Tuples of (key identifying the task, argument for func)
+            on_error: Called with the key and the exception of a failed task;
+                returns the results to yield in its place
+        """
+        pending: Deque[Tuple[Any, "Future[Tuple[List[Result], Dict[str, Any]]]"]] = deque()
+        source = iter(tasks)
+
+        def submit_next() -> None:
+            # Only the argument crosses to the worker; the key stays here
+            for key, item in source:
+                pending.append((key, self._executor.submit(_run_task, func, item)))
+                return
+
+        for _ in range(self.workers * 2):
+            submit_next()
+
+        while pending:
+            key, future = pending.popleft()
+            submit_next()
+
+            try:
+                results, stats = future.result()
+            except Exception as e:
+                results = on_error(key, e)
+            else:
+                STATS.merge(stats)
+
+            self.articles += len(results)
+            yield from results
+
+    def close(self) -> None:
+        """Shut the pool down."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ProcessingPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Module providing a thread-safe token-bucket rate limiter."""
+
+from typing import Optional
+import math
+import threading
+import time
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Tolerance for floating-point error when comparing token counts
+_EPSILON = 1e-9
+
+# NCBI E-utilities request limits (requests per second)
+NCBI_RATE_LIMIT = 3.0
+NCBI_RATE_LIMIT_WITH_API_KEY = 10.0
+
+class TokenBucket:
+    """
+    Token-bucket limiter shared by every thread that issues requests.
+
+    The bucket holds one token by default, so no 1-second window ever sees
+    more than `rate` requests; a larger capacity allows bursts above the rate.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum burst size; defaults to 1 (no burst), or unlimited
+                for an infinite rate
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        if capacity is None:
+            # An infinite rate never refills a finite bucket (0 elapsed * inf is nan)
+            capacity = rate if math.isinf(rate) else 1.0
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_ncbi(cls, api_key: Optional[str] = None) -> "TokenBucket":
+        """
+        Create a limiter sized to NCBI's published E-utilities limits.
+
+        Args:
+            api_key: NCBI API key, if one is used
+
+        Returns:
+            Limiter allowing 10 requests/second with an API key, 3 without
+        """
+        return cls(NCBI_RATE_LIMIT_WITH_API_KEY if api_key else NCBI_RATE_LIMIT)
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take tokens if they are available, without waiting.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            True if the tokens were taken, False otherwise
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens + _EPSILON >= tokens:
+                self._tokens = max(0.0, self._tokens - tokens)
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, waiting until they are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Total time spent waiting (seconds)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens + _EPSILON >= tokens:
+                    self._tokens = max(0.0, self._tokens - tokens)
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
\ No newline at end of file
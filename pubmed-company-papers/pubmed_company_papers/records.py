@@ -0,0 +1,144 @@
+"""Module defining the record types passed between parsing, analysis and output."""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Tuple
+import threading
+
+# Strings kept by the shared pool; enough for the affiliations recurring across
+# a large run, while memory stays bounded over bulk runs and a long-running server
+DEFAULT_POOL_SIZE = 100000
+
+class StringPool:
+    """
+    Size-bounded pool that returns one shared instance for equal strings.
+
+    The least recently used strings are dropped once the pool is full; records
+    holding them keep their own copy, they just no longer share it.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_POOL_SIZE) -> None:
+        """
+        Initialize an empty pool.
+
+        Args:
+            maxsize: Maximum number of strings to keep (must be positive)
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+
+        self.maxsize = maxsize
+        self._strings: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def intern(self, value: str) -> str:
+        """
+        Return the pooled instance of a string, adding it if it is new.
+
+        Args:
+            value: String to intern
+
+        Returns:
+            Shared string equal to value
+        """
+        with self._lock:
+            pooled = self._strings.get(value)
+            if pooled is not None:
+                self._strings.move_to_end(value)
+                return pooled
+            self._strings[value] = value
+            if len(self._strings) > self.maxsize:
+                self._strings.popitem(last=False)
+            return value
+
+    def intern_all(self, values: Iterable[str]) -> Tuple[str, ...]:
+        """
+        Intern several strings at once.
+
+        Args:
+            values: Strings to intern
+
+        Returns:
+            Tuple of pooled strings in the same order
+        """
+        return tuple(self.intern(value) for value in values)
+
+    def clear(self) -> None:
+        """Drop all pooled strings."""
+        with self._lock:
+            self._strings.clear()
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+# Pool shared by the parser and analyzer for affiliation and company-name strings
+STRING_POOL = StringPool()
+
+class AuthorRecord:
+    """Compact author record with interned affiliation strings."""
+
+    __slots__ = ("name", "affiliations", "email", "is_corresponding")
+
+    def __init__(self, name: str, affiliations: Tuple[str, ...] = (), email: str = "",
+                 is_corresponding: bool = False):
+        """
+        Initialize an author record.
+
+        Args:
+            name: Author name ("Last, Fore")
+            affiliations: Affiliation strings
+            email: First email address found in the affiliations
+            is_corresponding: Whether the author is marked as corresponding
+        """
+        self.name = name
+        self.affiliations = affiliations
+        self.email = email
+        self.is_corresponding = is_corresponding
+
+    def __getitem__(self, key: str) -> Any:
+        """Support dictionary-style access used by code written for author dicts."""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Support dictionary-style get() used by code written for author dicts."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record to the author dictionary format.
+
+        Returns:
+            Dictionary with name, affiliations (as a list), email and is_corresponding
+        """
+        return {
+            "name": self.name,
+            "affiliations": list(self.affiliations),
+            "email": self.email,
+            "is_corresponding": self.is_corresponding
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AuthorRecord):
+            return NotImplemented
+        return (self.name, self.affiliations, self.email, self.is_corresponding) == (
+            other.name, other.affiliations, other.email, other.is_corresponding
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"AuthorRecord(name={self.name!r}, affiliations={self.affiliations!r}, "
+            f"email={self.email!r}, is_corresponding={self.is_corresponding!r})"
+        )
+
+class ArticleRecord(NamedTuple):
+    """Fields extracted from a single PubMed article."""
+
+    pubmed_id: str
+    title: str
+    publication_date: str
+    authors: Tuple[AuthorRecord, ...]
+    corresponding_email: str
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""Module for caching compressed E-utilities responses on disk."""
+
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import os
+import threading
+import time
+import zlib
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Keys per statement, staying under SQLite's limit on bound parameters
+SQL_CHUNK_SIZE = 500
+
+# Cached tables, each holding compressed payloads with their size
+TABLES = ("articles", "searches")
+
+class ResponseCache:
+    """
+    SQLite-backed cache of efetch article XML keyed by PMID and esearch results
+    keyed by query parameters, with a TTL and an LRU-evicted size cap.
+
+    Search results get a shorter TTL of their own, since the hits of a query
+    change as new articles are indexed while an article's XML rarely does.
+
+    The total payload size is summed once when the cache is opened and then
+    kept up to date by every insert, replacement and deletion, so the size
+    cap costs no table scan per write. Writes by other processes sharing the
+    directory are counted the next time the cache is opened.
+    """
+
+    # Name of the database file inside the cache directory
+    DB_NAME = "responses.sqlite"
+
+    def __init__(self, directory: str, ttl: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: Optional[int] = 1024 * 1024 * 1024,
+                 search_ttl: Optional[float] = 3600):
+        """
+        Open (or create) a response cache.
+
+        Args:
+            directory: Directory holding the cache database
+            ttl: Maximum age of an entry in seconds (None keeps entries forever)
+            max_bytes: Maximum total size of compressed payloads (None for no cap)
+            search_ttl: Maximum age of an esearch result in seconds, also bounded
+                by ttl (None to use ttl alone)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ttl = ttl
+        self.search_ttl = search_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        import sqlite3
+        self._conn = sqlite3.connect(os.path.join(directory, self.DB_NAME), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for table in TABLES:
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "key TEXT PRIMARY KEY, "
+                    "data BLOB NOT NULL, "
+                    "size INTEGER NOT NULL, "
+                    "created REAL NOT NULL, "
+                    "accessed REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed)"
+                )
+        self._bytes: int = sum(
+            self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+            for table in TABLES
+        )
+
+    def _is_fresh(self, created: float, now: float) -> bool:
+        """Check whether an entry created at `created` is still within the TTL."""
+        return self.ttl is None or now - created <= self.ttl
+
+    def _is_fresh_search(self, created: float, now: float) -> bool:
+        """Check whether a search result created at `created` is still within both TTLs."""
+        return self._is_fresh(created, now) and (self.search_ttl is None or now - created <= self.search_ttl)
+
+    def _stored_size(self, table: str, keys: List[str]) -> int:
+        """Sum the payload sizes of the entries of a table with the given keys."""
+        total = 0
+        for start in range(0, len(keys), SQL_CHUNK_SIZE):
+            chunk = keys[start:start + SQL_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            total += self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM {table} WHERE key IN ({placeholders})", chunk
+            ).fetchone()[0]
+        return total
+
+    def get_articles(self, pmids: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Look up cached article XML for several PMIDs at once.
+
+        Args:
+            pmids: PubMed IDs
+
+        Returns:
+            Dictionary mapping each cached, unexpired PMID to its <PubmedArticle> XML
+        """
+        pmids = list(pmids)
+        if not pmids:
+            return {}
+
+        now = time.time()
+        found: Dict[str, bytes] = {}
+        expired: List[str] = []
+        expired_bytes = 0
+
+        with self._lock:
+            rows = []
+            for start in range(0, len(pmids), SQL_CHUNK_SIZE):
+                chunk = pmids[start:start + SQL_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._conn.execute(
+                    f"SELECT key, data, size, created FROM articles WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall())
+            for pmid, data, size, created in rows:
+                if self._is_fresh(created, now):
+                    found[pmid] = zlib.decompress(data)
+                else:
+                    expired.append(pmid)
+                    expired_bytes += size
+
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE articles SET accessed = ? WHERE key = ?",
+                    [(now, pmid) for pmid in found]
+                )
+                self._conn.executemany("DELETE FROM articles WHERE key = ?", [(pmid,) for pmid in expired])
+            self._bytes -= expired_bytes
+
+            self.hits += len(found)
+            self.misses += len(pmids) - len(found)
+
+        return found
+
+    def put_articles(self, articles: Dict[str, bytes]) -> None:
+        """
+        Store article XML for several PMIDs in one transaction.
+
+        Args:
+            articles: Dictionary mapping PMIDs to <PubmedArticle> XML
+        """
+        if not articles:
+            return
+        now = time.time()
+        rows = []
+        for pmid, xml in articles.items():
+            data = zlib.compress(xml)
+            rows.append((pmid, data, len(data), now, now))
+        with self._lock:
+            replaced = self._stored_size("articles", list(articles))
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO articles (key, data, size, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+            self._bytes += sum(row[2] for row in rows) - replaced
+            self._enforce_size_cap()
+
+    @staticmethod
+    def search_key(params: Dict[str, Any]) -> str:
+        """
+        Build the cache key for an esearch request.
+
+        Args:
+            params: esearch parameters
+
+        Returns:
+            Canonical JSON encoding of the parameters
+        """
+        return json.dumps({key: str(value) for key, value in params.items()}, sort_keys=True)
+
+    def get_search(self, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        Look up a cached esearch result.
+
+        Args:
+            params: esearch parameters
+
+        Returns:
+            Cached result, or None if missing or expired
+        """
+        key = self.search_key(params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, created FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or not self._is_fresh_search(row[1], now):
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE searches SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put_search(self, params: Dict[str, Any], result: Any) -> None:
+        """
+        Store an esearch result.
+
+        Args:
+            params: esearch parameters
+            result: JSON-serializable result
+        """
+        key = self.search_key(params)
+        data = zlib.compress(json.dumps(result).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            replaced = self._stored_size("searches", [key])
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO searches (key, data, size, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data), now, now)
+                )
+            self._bytes += len(data) - replaced
+            self._enforce_size_cap()
+
+    def total_bytes(self) -> int:
+        """
+        Get the total size of the cached payloads.
+
+        Returns:
+            Sum of compressed payload sizes in bytes
+        """
+        with self._lock:
+            return self._bytes
+
+    def _enforce_size_cap(self) -> None:
+        """Evict least recently used entries until the cache fits in max_bytes (called with the lock held)."""
+        if self.max_bytes is None:
+            return
+        excess = self._bytes - self.max_bytes
+        if excess <= 0:
+            return
+
+        rows = self._conn.execute(
+            "SELECT 'articles', key, size, accessed FROM articles "
+            "UNION ALL SELECT 'searches', key, size, accessed FROM searches "
+            "ORDER BY accessed"
+        )
+        victims: Dict[str, List[Any]] = {table: [] for table in TABLES}
+        evicted_bytes = 0
+        for table, key, size, _ in rows:
+            if excess <= 0:
+                break
+            victims[table].append((key,))
+            excess -= size
+            evicted_bytes += size
+
+        with self._conn:
+            for table, keys in victims.items():
+                self._conn.executemany(f"DELETE FROM {table} WHERE key = ?", keys)
+        self._bytes -= evicted_bytes
+        evicted = len(victims["articles"]) + len(victims["searches"])
+        self.evictions += evicted
+        logger.debug(f"Evicted {evicted} cached responses to stay under {self.max_bytes} bytes")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache usage counters.
+
+        Returns:
+            Dictionary with hits, misses, evictions and total bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._bytes
+            }
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""Module providing retry with backoff and failure bookkeeping for E-utilities requests."""
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+import datetime
+import random
+import time
+import logging
+
+from pubmed_company_papers.stats import STATS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# HTTP status codes worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+# A downloaded efetch batch: (batch number, parameters, efetch XML)
+RawBatch = Tuple[int, Dict[str, Any], bytes]
+
+class RetryPolicy:
+    """Retry policy using exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Total number of attempts per request (1 disables retries)
+            base_delay: Upper bound of the first backoff delay (seconds)
+            max_delay: Upper bound of any backoff delay (seconds)
+            rng: Optional random generator used for jitter
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        """
+        Check whether a failed request is worth retrying.
+
+        Args:
+            error: Exception raised by the request
+
+        Returns:
+            True for 429/5xx responses, connection failures, timeouts and
+            truncated responses; False for everything else
+        """
+        # Imported here, only once a request has failed, to keep startup fast
+        from http.client import HTTPException
+        from urllib.error import HTTPError, URLError
+        import socket
+        import xml.etree.ElementTree as ET
+
+        if isinstance(error, HTTPError):
+            return error.code in RETRYABLE_STATUS_CODES
+        return isinstance(error, (URLError, ConnectionError, socket.timeout, TimeoutError,
+                                  HTTPException, ET.ParseError))
+
+    @staticmethod
+    def retry_after(error: BaseException) -> Optional[float]:
+        """
+        Read the Retry-After header of an HTTP error response.
+
+        Args:
+            error: Exception raised by the request
+
+        Returns:
+            Requested delay in seconds, or None if the header is missing or invalid
+        """
+        headers = getattr(error, "headers", None)
+        value = headers.get("Retry-After") if headers is not None else None
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        from email.utils import parsedate_to_datetime
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get the jittered backoff delay after a failed attempt.
+
+        Args:
+            attempt: Number of the attempt that failed (starting at 1)
+
+        Returns:
+            Delay drawn uniformly from [0, min(max_delay, base_delay * 2 ** (attempt - 1))]
+        """
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def next_delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """
+        Decide whether and when to retry after a failed attempt.
+
+        Args:
+            attempt: Number of the attempt that failed (starting at 1)
+            error: Exception raised by the attempt
+
+        Returns:
+            Delay before the next attempt (Retry-After when the server sent one,
+            capped at max_delay), or None if the request should not be retried
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return self.backoff(attempt)
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Call a function, retrying it according to the policy.
+
+        Args:
+            func: Function issuing the request
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Return value of func
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self.next_delay(attempt, e)
+                if delay is None:
+                    raise
+                STATS.count("requests.retries")
+                logger.warning(f"Request failed ({e}), retrying in {delay:.1f}s "
+                               f"(attempt {attempt}/{self.max_attempts})")
+                time.sleep(delay)
+
+class FailedBatch(NamedTuple):
+    """An efetch batch that failed after all retries."""
+
+    number: int
+    params: Dict[str, Any]
+    error: str
+
+    @property
+    def size(self) -> int:
+        """Number of articles the batch was expected to return."""
+        return batch_size(self.params)
+
+def batch_size(params: Dict[str, Any]) -> int:
+    """
+    Get the number of articles an efetch batch requests.
+
+    Args:
+        params: Batch-specific efetch parameters (an id list or a history page)
+
+    Returns:
+        Number of PMIDs in the id list, or the page's retmax
+    """
+    if "id" in params:
+        return len([pmid for pmid in params["id"].split(",") if pmid])
+    return int(params.get("retmax", 0))
+
+def remaining_params(params: Dict[str, Any], delivered: List[Optional[str]]) -> Dict[str, Any]:
+    """
+    Narrow batch parameters to the articles that were not delivered.
+
+    Args:
+        params: Batch-specific efetch parameters (an id list or a history page)
+        delivered: PMIDs of the articles already yielded from the batch
+
+    Returns:
+        Parameters requesting only the remaining articles
+    """
+    if not delivered:
+        return params
+    if "id" in params:
+        seen = set(delivered)
+        return dict(params, id=",".join(pmid for pmid in params["id"].split(",") if pmid not in seen))
+    return dict(params, retstart=int(params["retstart"]) + len(delivered),
+                retmax=int(params["retmax"]) - len(delivered))
+
+class FetchReport:
+    """Requested vs. retrieved counts and failed batches of one fetch run."""
+
+    def __init__(self, requested: int = 0):
+        """
+        Initialize the report.
+
+        Args:
+            requested: Number of articles requested
+        """
+        self.requested = requested
+        self.retrieved = 0
+        self.failed: List[FailedBatch] = []
+
+    def record_failure(self, number: int, params: Dict[str, Any], error: BaseException) -> None:
+        """
+        Add a batch to the failed-batch ledger.
+
+        Args:
+            number: Batch number
+            params: Parameters covering only the articles not yet retrieved
+            error: Last exception raised for the batch
+        """
+        self.failed.append(FailedBatch(number, params, str(error)))
+
+    @property
+    def missing(self) -> int:
+        """Number of requested articles that were not retrieved."""
+        return max(0, self.requested - self.retrieved)
+
+    def failed_pmids(self) -> List[str]:
+        """
+        Get the PMIDs of failed id-list batches.
+
+        Returns:
+            PMIDs that could not be fetched (history pages are not included)
+        """
+        return [
+            pmid
+            for batch in self.failed if "id" in batch.params
+            for pmid in batch.params["id"].split(",") if pmid
+        ]
\ No newline at end of file
@@ -0,0 +1,374 @@
+"""Module providing a long-running local HTTP/JSON service that keeps the client, classifier and caches warm."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Generator, List, Optional, Tuple
+import json
+import threading
+import time
+import logging
+
+from pubmed_company_papers.affiliations import AffiliationAnalyzer
+from pubmed_company_papers.api import PubMedAPI
+from pubmed_company_papers.article_store import ArticleStore
+from pubmed_company_papers.processing import process_article
+from pubmed_company_papers.ratelimit import TokenBucket
+from pubmed_company_papers.response_cache import ResponseCache
+from pubmed_company_papers.retry import RetryPolicy
+from pubmed_company_papers.stats import STATS
+from pubmed_company_papers.transport import Transport
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Jobs running at once; further jobs are answered with 503 until one finishes
+DEFAULT_MAX_JOBS = 4
+
+# Largest number of PMIDs a job may ask for (the esearch retmax limit)
+MAX_RESULTS_LIMIT = 10000
+
+# Largest accepted request body
+MAX_BODY_BYTES = 64 * 1024
+
+# Downloaded efetch batches a job buffers ahead of classification
+JOB_PREFETCH = 4
+
+class BusyError(Exception):
+    """Raised when a job is submitted while the server runs its maximum number of jobs."""
+
+class PapersService:
+    """
+    State shared by the jobs of a long-running server.
+
+    The rate limiter, response cache, article store and affiliation verdict
+    cache live as long as the service, so repeated queries skip imports, rule
+    compilation and network requests a fresh CLI run would repeat. Every job
+    gets its own PubMedAPI (fetch reports and retries are per job) built on
+    the shared limiter, so concurrent jobs together stay within NCBI's limit.
+    """
+
+    def __init__(self, email: str, api_key: Optional[str] = None, eutils_url: Optional[str] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 article_store: Optional[ArticleStore] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 transport: Optional[Transport] = None,
+                 max_results: int = 100, concurrency: int = 1, max_jobs: int = DEFAULT_MAX_JOBS):
+        """
+        Initialize the service and warm up its dependencies.
+
+        Args:
+            email: Email address to identify yourself to NCBI
+            api_key: Optional NCBI API key for higher request limits
+            eutils_url: Optional base URL of an E-utilities compatible server
+            rate_limiter: Limiter shared by all jobs; defaults to NCBI's limit for the key
+            response_cache: Optional on-disk cache of esearch results and article XML
+            article_store: Optional local store of parsed articles
+            retry_policy: Optional policy for retrying failed requests
+            transport: Optional transport shared by all jobs (e.g. replaying
+                recorded responses)
+            max_results: Default number of PMIDs per job
+            concurrency: Number of efetch batches a job downloads in parallel
+            max_jobs: Number of jobs allowed to run at once
+        """
+        if max_jobs < 1:
+            raise ValueError("max_jobs must be at least 1")
+        if not 1 <= max_results <= MAX_RESULTS_LIMIT:
+            raise ValueError(f"max_results must be from 1 to {MAX_RESULTS_LIMIT}")
+
+        self.email = email
+        self.api_key = api_key
+        self.eutils_url = eutils_url
+        self.rate_limiter = rate_limiter or TokenBucket.for_ncbi(api_key)
+        self.response_cache = response_cache
+        self.article_store = article_store
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.transport = transport
+        self.max_results = max_results
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self.started = time.time()
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self._slots = threading.BoundedSemaphore(max_jobs)
+        self._lock = threading.Lock()
+
+        # Pay for Biopython's import and the classifier rules now rather than in the first job
+        self.new_api()
+        AffiliationAnalyzer.compile_rules()
+
+    def new_api(self) -> PubMedAPI:
+        """
+        Create the PubMed API handler of a job.
+
+        Returns:
+            Handler sharing the service's limiter, caches and article store
+        """
+        return PubMedAPI(
+            email=self.email,
+            api_key=self.api_key,
+            eutils_url=self.eutils_url,
+            rate_limiter=self.rate_limiter,
+            response_cache=self.response_cache,
+            retry_policy=self.retry_policy,
+            article_store=self.article_store,
+            transport=self.transport
+        )
+
+    def parse_job(self, body: Any) -> Dict[str, Any]:
+        """
+        Validate a job request.
+
+        Args:
+            body: Decoded JSON body with "query" and optionally "max_results",
+                "mindate" and "maxdate" (YYYY/MM/DD)
+
+        Returns:
+            Job settings with defaults filled in
+
+        Raises:
+            ValueError: If the request is not a valid job
+        """
+        if not isinstance(body, dict):
+            raise ValueError("the request body must be a JSON object")
+        unknown = set(body) - {"query", "max_results", "mindate", "maxdate"}
+        if unknown:
+            raise ValueError(f"unknown job fields: {', '.join(sorted(unknown))}")
+
+        query = body.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise ValueError("a non-empty query is required")
+        max_results = body.get("max_results", self.max_results)
+        if not isinstance(max_results, int) or isinstance(max_results, bool) \
+                or not 1 <= max_results <= MAX_RESULTS_LIMIT:
+            raise ValueError(f"max_results must be an integer from 1 to {MAX_RESULTS_LIMIT}")
+        for field in ("mindate", "maxdate"):
+            if body.get(field) is not None and not isinstance(body[field], str):
+                raise ValueError(f"{field} must be a YYYY/MM/DD string")
+
+        return {"query": query.strip(), "max_results": max_results,
+                "mindate": body.get("mindate"), "maxdate": body.get("maxdate")}
+
+    def acquire(self) -> None:
+        """
+        Take a job slot.
+
+        Raises:
+            BusyError: If every slot is taken
+        """
+        if not self._slots.acquire(blocking=False):
+            raise BusyError(f"{self.max_jobs} jobs are already running")
+        with self._lock:
+            self.active += 1
+
+    def release(self, succeeded: bool) -> None:
+        """
+        Return a job slot.
+
+        Args:
+            succeeded: Whether the job ran to completion
+        """
+        with self._lock:
+            self.active -= 1
+            if succeeded:
+                self.completed += 1
+            else:
+                self.failed += 1
+        self._slots.release()
+
+    def search(self, job: Dict[str, Any]) -> Tuple[PubMedAPI, List[str]]:
+        """
+        Run the esearch of a job.
+
+        Args:
+            job: Settings from parse_job
+
+        Returns:
+            Tuple of the job's API handler and the PMIDs found
+        """
+        api = self.new_api()
+        pmids = api.search(job["query"], retmax=job["max_results"],
+                           mindate=job["mindate"], maxdate=job["maxdate"])
+        return api, [str(pmid) for pmid in pmids]
+
+    def iter_job(self, api: PubMedAPI, pmids: List[str]) -> Generator[Dict[str, Any], None, None]:
+        """
+        Fetch and classify the articles of a job.
+
+        Args:
+            api: Handler returned by search
+            pmids: PMIDs returned by search
+
+        Yields:
+            Result rows (author and company lists kept as lists) as soon as
+            each article is classified, then {"summary": {...}} with the
+            article, row and timing counts of the job
+        """
+        start = time.perf_counter()
+        articles = 0
+        rows = 0
+        if pmids:
+            # The shared limiter paces requests across jobs
+            fetched = api.iter_articles(pmids, concurrency=self.concurrency, prefetch=JOB_PREFETCH)
+            for article in fetched:
+                articles += 1
+                _, result = process_article(article)
+                if result is not None:
+                    rows += 1
+                    yield result
+        elapsed = time.perf_counter() - start
+        STATS.record("job", elapsed, rows)
+
+        report = api.last_fetch
+        yield {"summary": {
+            "found": len(pmids),
+            "retrieved": report.retrieved if pmids else 0,
+            "missing": report.missing if pmids else 0,
+            "articles": articles,
+            "rows": rows,
+            "seconds": round(elapsed, 3),
+        }}
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Describe the service.
+
+        Returns:
+            Dictionary with uptime, job counts and cache statistics
+        """
+        with self._lock:
+            status: Dict[str, Any] = {
+                "uptime_seconds": round(time.time() - self.started, 3),
+                "jobs": {"active": self.active, "completed": self.completed,
+                         "failed": self.failed, "max": self.max_jobs},
+                "rate_limit": self.rate_limiter.rate,
+            }
+        status["affiliation_cache"] = AffiliationAnalyzer.cache_stats()
+        if self.response_cache is not None:
+            status["response_cache"] = self.response_cache.stats()
+        if self.article_store is not None:
+            status["article_store"] = {"hits": self.article_store.hits, "misses": self.article_store.misses}
+        return status
+
+def _make_handler(service: PapersService) -> type:
+    """Build the request handler class bound to a service."""
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "PubMedCompanyPapers"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(f"{self.address_string()} {format % args}")
+
+        def _send_json(self, status: int, body: Dict[str, Any],
+                       headers: Optional[Dict[str, str]] = None) -> None:
+            data = (json.dumps(body) + "\n").encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif self.path == "/stats":
+                self._send_json(200, STATS.report(service=service.status()))
+            else:
+                self._send_json(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self) -> None:
+            if self.path != "/jobs":
+                self._send_json(404, {"error": f"unknown path {self.path}"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                self._send_json(400, {"error": "invalid Content-Length"})
+                return
+            if length > MAX_BODY_BYTES:
+                self._send_json(413, {"error": "request body too large"})
+                return
+            try:
+                job = service.parse_job(json.loads(self.rfile.read(length) or b"null"))
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+
+            try:
+                service.acquire()
+            except BusyError as e:
+                self._send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+                return
+
+            succeeded = False
+            try:
+                succeeded = self._run(job)
+            except (BrokenPipeError, ConnectionResetError):
+                logger.info(f"Client disconnected, job stopped: {job['query']}")
+            finally:
+                service.release(succeeded)
+
+        def _run(self, job: Dict[str, Any]) -> bool:
+            logger.info(f"Job started: {job['query']}")
+            try:
+                api, pmids = service.search(job)
+            except Exception as e:
+                logger.error(f"Search failed for {job['query']}: {e}")
+                self._send_json(502, {"error": f"search failed: {e}"})
+                return False
+
+            # Rows are streamed as they are produced; the body ends when the connection closes
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            results = service.iter_job(api, pmids)
+            try:
+                for item in results:
+                    self.wfile.write((json.dumps(item) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                raise
+            except Exception as e:
+                logger.error(f"Job failed for {job['query']}: {e}")
+                self.wfile.write((json.dumps({"error": str(e)}) + "\n").encode("utf-8"))
+                return False
+            finally:
+                # Stops the job's fetch thread if the client went away
+                results.close()
+            logger.info(f"Job finished: {job['query']}")
+            return True
+
+    return Handler
+
+class PapersServer(ThreadingHTTPServer):
+    """HTTP server running every job on its own thread."""
+
+    daemon_threads = True
+
+    def __init__(self, service: PapersService, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the server.
+
+        Args:
+            service: Shared state of the jobs
+            host: Interface to listen on
+            port: Port to listen on, 0 for any free port
+        """
+        self.service = service
+        super().__init__((host, port), _make_handler(service))
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode("ascii")
+        return f"http://{host}:{port}"
\ No newline at end of file
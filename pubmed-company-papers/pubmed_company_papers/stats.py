@@ -0,0 +1,316 @@
+"""Module collecting per-stage timings and counters of a run, reported as JSON or Prometheus text."""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+import json
+import os
+import threading
+import time
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Prefix of every Prometheus metric name
+METRIC_PREFIX = "pubmed_company_papers"
+
+class StageTimer:
+    """Latency histogram and item count of one pipeline stage."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.items = 0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float, items: int = 0) -> None:
+        """
+        Record one call of the stage.
+
+        Args:
+            seconds: Duration of the call
+            items: Number of articles, rows or PMIDs the call handled
+        """
+        self.calls += 1
+        self.seconds += seconds
+        self.items += items
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def merge(self, other: Dict[str, Any]) -> None:
+        """
+        Add the observations of another timer.
+
+        Args:
+            other: Dictionary from to_dict()
+        """
+        self.calls += other["calls"]
+        self.seconds += other["seconds"]
+        self.items += other["items"]
+        self.max = max(self.max, other["max"])
+        self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, other["buckets"])]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the state of the timer.
+
+        Returns:
+            Dictionary with calls, seconds, items, max and bucket counts
+        """
+        return {"calls": self.calls, "seconds": self.seconds, "items": self.items,
+                "max": self.max, "buckets": list(self.buckets)}
+
+class RunStats:
+    """
+    Thread-safe collector of stage timings and counters.
+
+    Stages are timed per call (an efetch batch, an article, a checkpoint
+    write), so the report gives both throughput and per-call latency. The
+    module-level STATS instance is shared by the whole package; worker
+    processes send a snapshot of theirs back with each task, which the parent
+    merges.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters: Dict[str, float] = {}
+        self.stages: Dict[str, StageTimer] = {}
+
+    def reset(self) -> None:
+        """Drop everything recorded so far and restart the run clock."""
+        with self._lock:
+            self.started = time.time()
+            self.counters = {}
+            self.stages = {}
+
+    def count(self, name: str, value: float = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: Dotted counter name (e.g. "efetch.bytes")
+            value: Amount to add
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, stage: str, seconds: float, items: int = 0) -> None:
+        """
+        Record one timed call of a stage.
+
+        Args:
+            stage: Stage name (e.g. "efetch", "classifier")
+            seconds: Duration of the call
+            items: Number of items the call handled
+        """
+        with self._lock:
+            timer = self.stages.get(stage)
+            if timer is None:
+                timer = self.stages[stage] = StageTimer()
+            timer.observe(seconds, items)
+
+    @contextmanager
+    def timer(self, stage: str, items: int = 0) -> Iterator[None]:
+        """
+        Time the enclosed block as one call of a stage; calls that raise are not recorded.
+
+        Args:
+            stage: Stage name
+            items: Number of items the block handles
+        """
+        start = time.perf_counter()
+        yield
+        self.record(stage, time.perf_counter() - start, items)
+
+    def timed_iter(self, stage: str, iterable: Iterable[T]) -> Iterator[T]:
+        """
+        Time the production of an iterable's items, excluding the consumer's time.
+
+        The whole iteration is recorded as one call, when it finishes or is closed.
+
+        Args:
+            stage: Stage name
+            iterable: Source of items (e.g. a streaming parser)
+
+        Yields:
+            Items of the iterable
+        """
+        seconds = 0.0
+        items = 0
+        start = time.perf_counter()
+        try:
+            for item in iterable:
+                seconds += time.perf_counter() - start
+                items += 1
+                yield item
+                start = time.perf_counter()
+            seconds += time.perf_counter() - start
+        finally:
+            self.record(stage, seconds, items)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a picklable copy of the counters and timers.
+
+        Returns:
+            Dictionary for merge()
+        """
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "stages": {stage: timer.to_dict() for stage, timer in self.stages.items()},
+            }
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Add the counters and timers of a snapshot (e.g. from a worker process).
+
+        Args:
+            snapshot: Dictionary from snapshot()
+        """
+        with self._lock:
+            for name, value in snapshot["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for stage, other in snapshot["stages"].items():
+                timer = self.stages.get(stage)
+                if timer is None:
+                    timer = self.stages[stage] = StageTimer()
+                timer.merge(other)
+
+    def report(self, **info: Any) -> Dict[str, Any]:
+        """
+        Build the run report.
+
+        Args:
+            **info: Extra run information to include (query, settings, ...)
+
+        Returns:
+            JSON-serializable dictionary with the run duration, per-stage
+            throughput and latency, counters and cache hit rates
+        """
+        snapshot = self.snapshot()
+        finished = time.time()
+
+        stages = {}
+        for stage, timer in snapshot["stages"].items():
+            stages[stage] = {
+                "calls": timer["calls"],
+                "seconds": round(timer["seconds"], 6),
+                "items": timer["items"],
+                "items_per_second": round(timer["items"] / timer["seconds"], 1)
+                if timer["items"] and timer["seconds"] > 0 else None,
+                "mean_seconds": round(timer["seconds"] / timer["calls"], 6) if timer["calls"] else None,
+                "max_seconds": round(timer["max"], 6),
+                "latency_buckets": {
+                    str(bound): count for bound, count in zip(list(LATENCY_BUCKETS) + ["+Inf"], timer["buckets"])
+                },
+            }
+
+        counters = snapshot["counters"]
+        hit_rates = {}
+        for name in counters:
+            if name.endswith(".hits"):
+                cache = name[:-len(".hits")]
+                lookups = counters[name] + counters.get(f"{cache}.misses", 0)
+                hit_rates[cache] = round(counters[name] / lookups, 4) if lookups else None
+
+        return dict(
+            info,
+            started=self.started,
+            finished=finished,
+            elapsed_seconds=round(finished - self.started, 3),
+            stages=stages,
+            counters=counters,
+            hit_rates=hit_rates,
+        )
+
+    def write_json(self, path: str, **info: Any) -> None:
+        """
+        Write the run report as JSON.
+
+        Args:
+            path: Output file
+            **info: Extra run information to include
+        """
+        _write_atomic(path, json.dumps(self.report(**info), indent=2) + "\n")
+        logger.info(f"Run statistics written to {path}")
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Write the run report in the Prometheus text format.
+
+        The file is replaced atomically, so it can be placed in the textfile
+        collector directory of a node exporter.
+
+        Args:
+            path: Output file (should end in .prom for the textfile collector)
+        """
+        report = self.report()
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> str:
+            full_name = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            return full_name
+
+        name = metric("run_duration_seconds", "gauge", "Wall-clock duration of the last run.")
+        lines.append(f"{name} {report['elapsed_seconds']}")
+        name = metric("run_finished_timestamp_seconds", "gauge", "Unix time the last run finished.")
+        lines.append(f"{name} {report['finished']:.0f}")
+
+        if report["stages"]:
+            name = metric("stage_seconds", "histogram", "Duration of the calls of each stage.")
+            for stage, stats in sorted(report["stages"].items()):
+                cumulative = 0
+                for bound, count in stats["latency_buckets"].items():
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {stats["seconds"]}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {stats["calls"]}')
+            name = metric("stage_items_total", "counter", "Articles, rows or PMIDs handled by each stage.")
+            for stage, stats in sorted(report["stages"].items()):
+                lines.append(f'{name}{{stage="{stage}"}} {stats["items"]}')
+
+        for counter, value in sorted(report["counters"].items()):
+            name = metric(f"{counter.replace('.', '_')}_total", "counter", f"Total {counter} of the last run.")
+            lines.append(f"{name} {value:g}")
+
+        for cache, rate in sorted(report["hit_rates"].items()):
+            if rate is not None:
+                name = metric(f"{cache}_hit_ratio", "gauge", f"Hit ratio of the {cache.replace('_', ' ')}.")
+                lines.append(f"{name} {rate}")
+
+        _write_atomic(path, "\n".join(lines) + "\n")
+        logger.info(f"Prometheus metrics written to {path}")
+
+def _write_atomic(path: str, text: str) -> None:
+    """Write a file through a temporary file, so readers never see it half-written."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temporary, path)
+
+# Statistics of the current run, shared by every module of the package
+STATS = RunStats()
+
+def record_cache_stats(cache_stats: Optional[Dict[str, int]], name: str) -> None:
+    """
+    Add the hit/miss/eviction counts of a cache to STATS.
+
+    Args:
+        cache_stats: Counts as returned by the cache's stats method, or None
+        name: Counter prefix (e.g. "affiliation_cache")
+    """
+    for key, value in (cache_stats or {}).items():
+        if key in ("hits", "misses", "evictions"):
+            STATS.count(f"{name}.{key}", value)
\ No newline at end of file
@@ -0,0 +1,243 @@
+"""Module providing pluggable E-utilities transports, including record/replay of responses on disk."""
+
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import IO, Any, Dict, Optional, cast
+from urllib.parse import urlencode
+import json
+import os
+import random
+import threading
+import time
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Tool name sent to NCBI with every request
+DEFAULT_TOOL = "PubMedCompanyPapers"
+
+# Parameters identifying the caller rather than the request; left out of cassette keys,
+# so cassettes recorded with one email or API key replay for any other
+IDENTITY_PARAMS = ("tool", "email", "api_key")
+
+# Index of a cassette directory, one JSON line per recorded response
+INDEX_NAME = "index.jsonl"
+
+class CassetteMiss(LookupError):
+    """Raised when a replayed request was not recorded."""
+
+class Transport(ABC):
+    """Issues one E-utilities request and returns the response body."""
+
+    @abstractmethod
+    def open(self, utility: str, params: Dict[str, Any]) -> IO[bytes]:
+        """
+        Issue a request.
+
+        Args:
+            utility: E-utility name (e.g. "esearch", "efetch")
+            params: Request parameters
+
+        Returns:
+            Binary handle with the response body
+        """
+
+class EntrezTransport(Transport):
+    """
+    Requests through Biopython's Entrez module (NCBI's servers).
+
+    Biopython's own retry loop is turned off, so that RetryPolicy is the only
+    retry layer: its retries take a rate limiter token and honor Retry-After.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the transport and disable Biopython's retries."""
+        from Bio import Entrez
+        Entrez.max_tries = 1
+        Entrez.sleep_between_tries = 0
+
+    def open(self, utility: str, params: Dict[str, Any]) -> IO[bytes]:
+        from Bio import Entrez
+        return cast(IO[bytes], getattr(Entrez, utility)(**params))
+
+class HTTPTransport(Transport):
+    """POSTs requests to an E-utilities compatible server (e.g. a local stub)."""
+
+    def __init__(self, base_url: str, tool: str, email: str, api_key: Optional[str] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            base_url: Base URL of the server, without the utility name
+            tool: Name of the tool/application
+            email: Email address identifying the caller
+            api_key: Optional NCBI API key
+        """
+        self.base_url = base_url.rstrip("/")
+        self.tool = tool
+        self.email = email
+        self.api_key = api_key
+
+    def open(self, utility: str, params: Dict[str, Any]) -> IO[bytes]:
+        from urllib.request import urlopen
+
+        query = dict(params, tool=self.tool, email=self.email)
+        if self.api_key:
+            query["api_key"] = self.api_key
+        data = urlencode(query).encode("utf-8")
+        return cast(IO[bytes], urlopen(f"{self.base_url}/{utility}.fcgi", data=data))
+
+def default_transport(eutils_url: Optional[str], tool: str, email: str,
+                      api_key: Optional[str] = None) -> Transport:
+    """
+    Create the transport PubMedAPI uses when none is given.
+
+    Args:
+        eutils_url: Optional base URL of an E-utilities compatible server
+        tool: Name of the tool/application
+        email: Email address identifying the caller
+        api_key: Optional NCBI API key
+
+    Returns:
+        HTTPTransport for a custom server, EntrezTransport otherwise
+    """
+    if eutils_url:
+        return HTTPTransport(eutils_url, tool, email, api_key)
+    return EntrezTransport()
+
+def cassette_key(utility: str, params: Dict[str, Any]) -> str:
+    """
+    Get the name a response is recorded under.
+
+    Args:
+        utility: E-utility name
+        params: Request parameters
+
+    Returns:
+        Hex digest of the utility and the parameters, without caller identity
+    """
+    # Imported here, like gzip below, so that loading the module stays cheap
+    import hashlib
+
+    request = {key: str(value) for key, value in params.items() if key not in IDENTITY_PARAMS}
+    text = json.dumps({"utility": utility, "params": request}, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+def cassette_path(directory: str, utility: str, key: str) -> str:
+    """Path of a recorded response."""
+    return os.path.join(directory, utility, f"{key}.xml.gz")
+
+class RecordingTransport(Transport):
+    """
+    Passes requests to another transport and records every response.
+
+    Responses are stored gzip-compressed in a cassette directory, one file per
+    request keyed by its parameters, with an index of what was recorded.
+    Failed requests are not recorded. Responses served from the response cache
+    or the article store never reach the transport, so record with the same
+    cache settings the replay will use.
+    """
+
+    def __init__(self, transport: Transport, directory: str):
+        """
+        Initialize the recorder.
+
+        Args:
+            transport: Transport issuing the real requests
+            directory: Cassette directory, created if missing
+        """
+        self.transport = transport
+        self.directory = directory
+        self.recorded = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def open(self, utility: str, params: Dict[str, Any]) -> IO[bytes]:
+        handle = self.transport.open(utility, params)
+        try:
+            data = handle.read()
+        finally:
+            handle.close()
+
+        import gzip
+
+        key = cassette_key(utility, params)
+        path = cassette_path(self.directory, utility, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(gzip.compress(data))
+        os.replace(temporary, path)
+
+        entry = {"key": key, "utility": utility, "bytes": len(data),
+                 "params": {name: str(value) for name, value in params.items() if name not in IDENTITY_PARAMS}}
+        with self._lock:
+            with open(os.path.join(self.directory, INDEX_NAME), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, sort_keys=True) + "\n")
+            self.recorded += 1
+        logger.debug(f"Recorded {utility} response ({len(data)} bytes) as {key}")
+        return BytesIO(data)
+
+class ReplayTransport(Transport):
+    """
+    Serves recorded responses from a cassette directory, without network access.
+
+    An optional fixed latency is added to every response, and a share of the
+    requests can be failed with an HTTP error, so the concurrent fetch path and
+    the retries are exercised deterministically (the same seed fails the same
+    sequence of requests). Requests that were not recorded raise CassetteMiss,
+    which is not retried.
+    """
+
+    def __init__(self, directory: str, latency: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: Optional[int] = None):
+        """
+        Initialize the player.
+
+        Args:
+            directory: Cassette directory written by RecordingTransport
+            latency: Seconds added to every response
+            error_rate: Share of requests failed with `error_status` (0 to 1)
+            error_status: HTTP status of the injected errors
+            seed: Seed of the error injection
+        """
+        if not os.path.isdir(directory):
+            raise ValueError(f"Cassette directory {directory} does not exist")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.directory = directory
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.injected = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def open(self, utility: str, params: Dict[str, Any]) -> IO[bytes]:
+        with self._lock:
+            self.requests += 1
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if fail:
+                self.injected += 1
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if fail:
+            from email.message import Message
+            from urllib.error import HTTPError
+            raise HTTPError(f"replay://{utility}", self.error_status, "Injected error", Message(), None)
+
+        import gzip
+
+        key = cassette_key(utility, params)
+        try:
+            with open(cassette_path(self.directory, utility, key), "rb") as f:
+                data = gzip.decompress(f.read())
+        except FileNotFoundError:
+            raise CassetteMiss(
+                f"No recorded {utility} response for {key} in {self.directory}; record the run again"
+            ) from None
+        return BytesIO(data)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""Module for persisting affiliation verdicts in SQLite across runs."""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import threading
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+Verdict = Tuple[bool, str]
+
+class VerdictStore:
+    """
+    SQLite-backed store mapping normalized affiliations to (is_company, company_name).
+
+    Keys are affiliations normalized by AffiliationAnalyzer.normalize_affiliation
+    (whitespace collapsed, case kept); verdicts are computed from the key.
+    """
+
+    def __init__(self, path: str, rule_set_version: str, batch_size: int = 1000):
+        """
+        Open (or create) a verdict store.
+
+        Entries written under a different rule-set version are discarded on open.
+
+        Args:
+            path: Path to the SQLite database file
+            rule_set_version: Version stamp of the classification rules in use
+            batch_size: Number of new verdicts to buffer before writing a transaction
+        """
+        self.path = path
+        self.rule_set_version = rule_set_version
+        self.batch_size = batch_size
+        self._pending: Dict[str, Verdict] = {}
+        self._pending_hits: Counter = Counter()
+        self._lock = threading.Lock()
+
+        # Imported on open so that loading the classifier does not pay for sqlite3
+        import sqlite3
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "affiliation TEXT PRIMARY KEY, "
+                "is_company INTEGER NOT NULL, "
+                "company_name TEXT NOT NULL, "
+                "hits INTEGER NOT NULL DEFAULT 0)"
+            )
+        self._check_version()
+
+    def _check_version(self) -> None:
+        """Drop all verdicts if they were produced by a different rule set."""
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'rule_set_version'"
+        ).fetchone()
+        if row is not None and row[0] == self.rule_set_version:
+            return
+
+        with self._conn:
+            if row is not None:
+                logger.info(
+                    f"Affiliation rules changed ({row[0]} -> {self.rule_set_version}), "
+                    f"discarding stored verdicts in {self.path}"
+                )
+                self._conn.execute("DELETE FROM verdicts")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('rule_set_version', ?)",
+                (self.rule_set_version,)
+            )
+
+    def load_hot(self, limit: int) -> List[Tuple[str, Verdict]]:
+        """
+        Load the most frequently used verdicts.
+
+        Args:
+            limit: Maximum number of entries to load
+
+        Returns:
+            List of (normalized affiliation, verdict) pairs, most used first
+        """
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT affiliation, is_company, company_name FROM verdicts "
+                "ORDER BY hits DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [(affiliation, (bool(is_company), name)) for affiliation, is_company, name in rows]
+
+    def get(self, key: str) -> Optional[Verdict]:
+        """
+        Look up a verdict.
+
+        Args:
+            key: Normalized affiliation string
+
+        Returns:
+            Stored verdict, or None if the affiliation has not been seen
+        """
+        with self._lock:
+            verdict = self._pending.get(key)
+            if verdict is None:
+                row = self._conn.execute(
+                    "SELECT is_company, company_name FROM verdicts WHERE affiliation = ?",
+                    (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                verdict = (bool(row[0]), row[1])
+            self._pending_hits[key] += 1
+            return verdict
+
+    def put(self, key: str, verdict: Verdict) -> None:
+        """
+        Queue a verdict for writing; queued verdicts are written in batches.
+
+        Args:
+            key: Normalized affiliation string
+            verdict: Tuple of (is_company, company_name)
+        """
+        with self._lock:
+            self._pending[key] = verdict
+            self._pending_hits[key] += 1
+            should_flush = len(self._pending) >= self.batch_size
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued verdicts and hit counts in a single transaction."""
+        with self._lock:
+            if not self._pending and not self._pending_hits:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO verdicts (affiliation, is_company, company_name) "
+                    "VALUES (?, ?, ?)",
+                    [(key, int(is_company), name) for key, (is_company, name) in self._pending.items()]
+                )
+                self._conn.executemany(
+                    "UPDATE verdicts SET hits = hits + ? WHERE affiliation = ?",
+                    [(count, key) for key, count in self._pending_hits.items()]
+                )
+            logger.debug(f"Wrote {len(self._pending)} verdicts to {self.path}")
+            self._pending.clear()
+            self._pending_hits.clear()
+
+    def close(self) -> None:
+        """Flush queued verdicts and close the database."""
+        self.flush()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0])
+
+    def __enter__(self) -> "VerdictStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
\ No newline at end of file
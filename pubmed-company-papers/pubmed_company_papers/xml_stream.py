@@ -0,0 +1,192 @@
+"""Module for streaming PubMed efetch XML one article at a time."""
+
+from io import BytesIO
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+import logging
+import xml.etree.ElementTree as ET
+
+from pubmed_company_papers.stats import STATS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Publication date fields read by PubMedParser.extract_publication_date
+PUB_DATE_FIELDS = ("Year", "Month", "Day", "MedlineDate")
+
+# Author name fields read by PubMedParser.extract_authors_with_affiliations
+AUTHOR_NAME_FIELDS = ("LastName", "ForeName", "Initials")
+
+def _text(element: Optional[ET.Element]) -> Optional[str]:
+    """Return the full text of an element, including text inside inline markup."""
+    if element is None:
+        return None
+    return "".join(element.itertext())
+
+def _extract_author(element: ET.Element) -> Dict[str, Any]:
+    """Build an Entrez-style author dictionary from an <Author> element."""
+    author: Dict[str, Any] = {}
+
+    for field in AUTHOR_NAME_FIELDS:
+        value = element.findtext(field)
+        if value is not None:
+            author[field] = value
+
+    affiliations = [
+        {"Affiliation": _text(affiliation)}
+        for affiliation in element.iterfind("AffiliationInfo/Affiliation")
+    ]
+    if affiliations:
+        author["AffiliationInfo"] = affiliations
+
+    return author
+
+def extract_article(element: ET.Element) -> Dict[str, Any]:
+    """
+    Build a compact Entrez-style article dictionary from a <PubmedArticle> element.
+
+    Only the fields read by PubMedParser are kept; missing fields are left out so
+    the parser falls back to the same defaults it uses for Entrez records.
+
+    Args:
+        element: Parsed <PubmedArticle> element
+
+    Returns:
+        Article dictionary shaped like the output of Entrez.read
+    """
+    citation: Dict[str, Any] = {}
+    article: Dict[str, Any] = {}
+
+    citation_element = element.find("MedlineCitation")
+    if citation_element is not None:
+        pmid = citation_element.findtext("PMID")
+        if pmid is not None:
+            citation["PMID"] = pmid
+
+        article_element = citation_element.find("Article")
+        if article_element is not None:
+            citation["Article"] = article
+
+            title = _text(article_element.find("ArticleTitle"))
+            if title is not None:
+                article["ArticleTitle"] = title
+
+            pub_date_element = article_element.find("Journal/JournalIssue/PubDate")
+            if pub_date_element is not None:
+                pub_date = {}
+                for field in PUB_DATE_FIELDS:
+                    value = pub_date_element.findtext(field)
+                    if value is not None:
+                        pub_date[field] = value
+                article["Journal"] = {"JournalIssue": {"PubDate": pub_date}}
+
+            author_list_element = article_element.find("AuthorList")
+            if author_list_element is not None:
+                article["AuthorList"] = [
+                    _extract_author(author) for author in author_list_element.iterfind("Author")
+                ]
+
+    return {"MedlineCitation": citation}
+
+def iter_pubmed_elements(source: Union[str, IO[bytes]]) -> Iterator[ET.Element]:
+    """
+    Stream <PubmedArticle> elements from a PubMed efetch XML document.
+
+    Each element is yielded as soon as its closing tag is parsed and cleared
+    once the consumer moves on, so memory use does not grow with the size of
+    the document. Consumers must finish with an element before advancing.
+
+    Args:
+        source: File name or binary file object containing efetch XML
+
+    Yields:
+        Parsed <PubmedArticle> elements
+    """
+    context = ET.iterparse(source, events=("start", "end"))
+    root: Optional[ET.Element] = None
+    count = 0
+
+    for event, element in context:
+        if root is None:
+            root = element
+            continue
+        if event != "end":
+            continue
+
+        if element.tag == "PubmedArticle":
+            yield element
+            count += 1
+        elif element.tag != "PubmedBookArticle":
+            continue
+
+        # Drop the finished article so the tree never holds more than one
+        element.clear()
+        root.clear()
+
+    logger.debug(f"Streamed {count} articles")
+
+def iter_pubmed_articles(source: Union[str, IO[bytes]]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream articles from a PubMed efetch XML document.
+
+    Parsing time is recorded as one call of the "xml" stage per document.
+
+    Args:
+        source: File name or binary file object containing efetch XML
+
+    Yields:
+        Compact article dictionaries (see extract_article)
+    """
+    elements = iter_pubmed_elements(source)
+    yield from STATS.timed_iter("xml", (extract_article(element) for element in elements))
+
+def article_pmid(element: ET.Element) -> Optional[str]:
+    """
+    Get the PMID of a <PubmedArticle> element.
+
+    Args:
+        element: Parsed <PubmedArticle> element
+
+    Returns:
+        PMID, or None if the element has none
+    """
+    return element.findtext("MedlineCitation/PMID")
+
+def serialize_article(element: ET.Element) -> bytes:
+    """
+    Serialize a <PubmedArticle> element back to XML.
+
+    Args:
+        element: Parsed <PubmedArticle> element
+
+    Returns:
+        Standalone XML for the article (ASCII with character references)
+    """
+    tail, element.tail = element.tail, None
+    try:
+        return ET.tostring(element)
+    finally:
+        element.tail = tail
+
+def wrap_articles(fragments: Iterable[bytes]) -> bytes:
+    """
+    Join serialized <PubmedArticle> fragments into an efetch-style document.
+
+    Args:
+        fragments: Serialized articles
+
+    Returns:
+        <PubmedArticleSet> document containing the fragments
+    """
+    return b"<PubmedArticleSet>" + b"".join(fragments) + b"</PubmedArticleSet>"
+
+def parse_pubmed_xml(data: bytes) -> List[Dict[str, Any]]:
+    """
+    Parse a complete efetch XML payload held in memory.
+
+    Args:
+        data: Raw efetch XML
+
+    Returns:
+        List of compact article dictionaries
+    """
+    return list(iter_pubmed_articles(BytesIO(data)))
\ No newline at end of file
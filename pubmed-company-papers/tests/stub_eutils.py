@@ -0,0 +1,223 @@
+"""Local stub of the NCBI E-utilities used by tests and benchmarks."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+from urllib.parse import parse_qs, urlparse
+import threading
+import time
+
+ARTICLE_TEMPLATE = (
+    "<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>"
+    "<Journal><JournalIssue><PubDate><Year>2023</Year><Month>Jan</Month><Day>15</Day></PubDate>"
+    "</JournalIssue></Journal>"
+    "<ArticleTitle>Stub article {pmid}</ArticleTitle>"
+    "<AuthorList>"
+    "<Author><LastName>Smith</LastName><ForeName>John</ForeName>"
+    "<AffiliationInfo><Affiliation>Harvard University, Boston, MA, USA.</Affiliation></AffiliationInfo></Author>"
+    "<Author><LastName>Doe</LastName><ForeName>Jane</ForeName>"
+    "<AffiliationInfo><Affiliation>Pfizer Inc., New York, NY, USA. jane.doe@pfizer.com</Affiliation>"
+    "</AffiliationInfo></Author>"
+    "</AuthorList></Article></MedlineCitation></PubmedArticle>"
+)
+
+ESEARCH_DOCTYPE = (
+    '<!DOCTYPE eSearchResult PUBLIC "-//NLM//DTD esearch 20060628//EN" '
+    '"https://eutils.ncbi.nlm.nih.gov/eutils/dtd/20060628/esearch.dtd">'
+)
+
+def efetch_xml(pmids: List[str]) -> bytes:
+    """Build an efetch response with one stub article per PMID."""
+    articles = "".join(ARTICLE_TEMPLATE.format(pmid=pmid) for pmid in pmids)
+    return f'<?xml version="1.0" ?>\n<PubmedArticleSet>{articles}</PubmedArticleSet>\n'.encode("utf-8")
+
+def esearch_xml(pmids: List[str], count: Optional[int] = None, webenv: Optional[str] = None) -> bytes:
+    """Build an esearch response listing the given PMIDs."""
+    ids = "".join(f"<Id>{pmid}</Id>" for pmid in pmids)
+    total = len(pmids) if count is None else count
+    history = f"<QueryKey>1</QueryKey><WebEnv>{webenv}</WebEnv>" if webenv else ""
+    return (
+        f'<?xml version="1.0" ?>\n{ESEARCH_DOCTYPE}\n<eSearchResult><Count>{total}</Count><RetMax>{len(pmids)}</RetMax>'
+        f"<RetStart>0</RetStart>{history}<IdList>{ids}</IdList></eSearchResult>\n"
+    ).encode("utf-8")
+
+class StubEutils:
+    """Threaded HTTP server answering esearch and efetch with synthetic data."""
+
+    # WebEnv handed out for history-server searches
+    WEBENV = "MCID_stub_webenv"
+
+    def __init__(self, pmids: Optional[List[str]] = None, latency: float = 0.0,
+                 entrez_dates: Optional[Dict[str, str]] = None,
+                 terms: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize the stub.
+
+        Args:
+            pmids: PMIDs returned by esearch
+            latency: Delay added to every response (seconds)
+            entrez_dates: Optional Entrez date (YYYY/MM/DD) per PMID, used to
+                answer mindate/maxdate searches
+            terms: Optional PMIDs returned by esearch per search term; other
+                terms get `pmids`
+        """
+        self.pmids = pmids or []
+        self.latency = latency
+        self.entrez_dates = entrez_dates or {}
+        self.terms = terms or {}
+        self.requests: List[Dict[str, object]] = []
+        self.failures: Deque[Tuple[str, int, Optional[str]]] = deque()
+        self.truncations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass as PubMedAPI's eutils_url."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def _params(self) -> Dict[str, str]:
+                parsed = urlparse(self.path)
+                query = parsed.query
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    query = "&".join(filter(None, [query, self.rfile.read(length).decode("utf-8")]))
+                return {key: values[-1] for key, values in parse_qs(query).items()}
+
+            def _handle(self) -> None:
+                utility = urlparse(self.path).path.rsplit("/", 1)[-1].replace(".fcgi", "")
+                params = self._params()
+                with stub._lock:
+                    stub.requests.append({"utility": utility, "params": params, "time": time.monotonic()})
+                failure = stub._take_failure(utility)
+                if failure is not None:
+                    status, retry_after = failure
+                    self.send_response(status)
+                    if retry_after is not None:
+                        self.send_header("Retry-After", retry_after)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = stub.respond(utility, params)
+                if body is not None and stub._take_truncation(utility):
+                    body = body[:len(body) // 2]
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _handle
+            do_POST = _handle
+
+        return Handler
+
+    def fail_next(self, utility: str, status: int, times: int = 1,
+                  retry_after: Optional[str] = None) -> None:
+        """
+        Make the next requests for a utility fail with an HTTP error.
+
+        Args:
+            utility: E-utility name
+            status: HTTP status code to answer with
+            times: Number of requests to fail
+            retry_after: Optional Retry-After header value
+        """
+        with self._lock:
+            for _ in range(times):
+                self.failures.append((utility, status, retry_after))
+
+    def truncate_next(self, utility: str, times: int = 1) -> None:
+        """
+        Make the next responses for a utility end half-way, as malformed XML.
+
+        Args:
+            utility: E-utility name
+            times: Number of responses to truncate
+        """
+        with self._lock:
+            self.truncations[utility] = self.truncations.get(utility, 0) + times
+
+    def _take_truncation(self, utility: str) -> bool:
+        """Use up one queued truncation for a utility, if any."""
+        with self._lock:
+            if self.truncations.get(utility, 0) > 0:
+                self.truncations[utility] -= 1
+                return True
+        return False
+
+    def _take_failure(self, utility: str) -> Optional[Tuple[int, Optional[str]]]:
+        """Pop the first queued failure for a utility, if any."""
+        with self._lock:
+            for failure in self.failures:
+                if failure[0] == utility:
+                    self.failures.remove(failure)
+                    return failure[1], failure[2]
+        return None
+
+    def respond(self, utility: str, params: Dict[str, str]) -> Optional[bytes]:
+        """
+        Build the response body for a request.
+
+        Args:
+            utility: E-utility name
+            params: Request parameters
+
+        Returns:
+            Response body, or None for an unknown utility
+        """
+        if utility == "esearch":
+            retmax = int(params.get("retmax", 20))
+            webenv = self.WEBENV if params.get("usehistory") == "y" else None
+            pmids = self.terms.get(params.get("term", ""), self.pmids)
+            if "mindate" in params:
+                pmids = [
+                    pmid for pmid in pmids
+                    if params["mindate"] <= self.entrez_dates.get(pmid, "") <= params["maxdate"]
+                ]
+            start = int(params.get("retstart", 0))
+            return esearch_xml(pmids[start:start + retmax], count=len(pmids), webenv=webenv)
+        if utility == "efetch":
+            if "WebEnv" in params:
+                if params["WebEnv"] != self.WEBENV:
+                    return None
+                start = int(params.get("retstart", 0))
+                return efetch_xml(self.pmids[start:start + int(params.get("retmax", 20))])
+            return efetch_xml([pmid for pmid in params.get("id", "").split(",") if pmid])
+        return None
+
+    def request_times(self, utility: str) -> List[float]:
+        """Return the arrival times of requests for one utility."""
+        with self._lock:
+            return [request["time"] for request in self.requests if request["utility"] == utility]  # type: ignore[misc]
+
+    def start(self) -> "StubEutils":
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubEutils":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
\ No newline at end of file
@@ -1,7 +1,9 @@
 """Tests for the affiliations module."""
 
+import re
 import unittest
 from pubmed_company_papers.affiliations import AffiliationAnalyzer
+from pubmed_company_papers.records import AuthorRecord
 
 class TestAffiliationAnalyzer(unittest.TestCase):
     """Test cases for the AffiliationAnalyzer class."""
@@ -22,6 +24,53 @@ class TestAffiliationAnalyzer(unittest.TestCase):
         self.assertFalse(AffiliationAnalyzer.is_company_affiliation("National Institutes of Health, Bethesda, MD, USA"))
         self.assertFalse(AffiliationAnalyzer.is_company_affiliation("john.doe@university.edu"))
     
+    def test_classify_many(self):
+        """Test that classify_many matches the per-keyword reference scan."""
+        def reference(affiliation):
+            affiliation_lower = affiliation.lower()
+            for keyword in AffiliationAnalyzer.COMPANY_KEYWORDS:
+                if re.search(r'\b' + re.escape(keyword) + r'\b', affiliation_lower):
+                    return True
+            for keyword in AffiliationAnalyzer.ACADEMIC_KEYWORDS:
+                if re.search(r'\b' + re.escape(keyword) + r'\b', affiliation_lower):
+                    return False
+            email_match = re.search(r'[\w\.-]+@([\w\.-]+)', affiliation_lower)
+            if email_match:
+                domain = email_match.group(1)
+                if any(domain.endswith(d) for d in AffiliationAnalyzer.ACADEMIC_EMAIL_DOMAINS):
+                    return False
+                return domain.endswith('.com') or domain.endswith('.co')
+            return False
+
+        affiliations = [
+            "Pfizer Inc., New York, NY, USA",
+            "Harvard University, Boston, MA, USA",
+            "Medical Center of Excellence, Dallas, TX",
+            "Incyte Research, Wilmington, DE",
+            "Co-Lab for Imaging, Paris",
+            "AG Research, Hamilton, New Zealand",
+            "Basel, Switzerland. j.doe@roche.com",
+            "Shenzhen, China. wang@szu.edu.cn",
+            "Bogota. ana@empresa.co",
+            "Toronto. someone@example.org",
+            "Some Place, Nowhere",
+        ]
+
+        verdicts = AffiliationAnalyzer.classify_many(affiliations)
+
+        self.assertEqual(verdicts, [reference(a) for a in affiliations])
+        self.assertEqual(AffiliationAnalyzer.classify_many([]), [])
+        self.assertFalse(AffiliationAnalyzer.is_company_affiliation(""))
+
+    def test_compile_rules_per_subclass(self):
+        """Test that subclasses with their own keywords get their own rules."""
+        class CustomAnalyzer(AffiliationAnalyzer):
+            COMPANY_KEYWORDS = {'startup'}
+
+        self.assertTrue(CustomAnalyzer.is_company_affiliation("Acme Startup, Berlin"))
+        self.assertFalse(CustomAnalyzer.is_company_affiliation("Pfizer Inc., New York"))
+        self.assertTrue(AffiliationAnalyzer.is_company_affiliation("Pfizer Inc., New York"))
+
     def test_extract_company_name(self):
         """Test the extract_company_name method."""
         self.assertEqual(
@@ -70,5 +119,58 @@ class TestAffiliationAnalyzer(unittest.TestCase):
         self.assertIn("Pfizer Inc.", company_names)
         self.assertIn("Genentech, Inc.", company_names)
 
+    def test_identify_company_authors_records(self):
+        """Test that identify_company_authors accepts author records directly."""
+        authors = [
+            AuthorRecord("Smith, John", ("Harvard University, Boston, MA, USA",)),
+            AuthorRecord("Doe, Jane", ("Pfizer Inc., New York, NY, USA",), "jane.doe@pfizer.com"),
+            AuthorRecord("Roe, Rick"),
+        ]
+        
+        company_authors, company_names = AffiliationAnalyzer.identify_company_authors(authors)
+        
+        self.assertEqual(company_authors, ["Doe, Jane"])
+        self.assertEqual(company_names, ["Pfizer Inc."])
+    
+    def test_analyze_affiliation_cache(self):
+        """Test that repeated affiliations are served from the verdict cache."""
+        AffiliationAnalyzer.configure_cache(100)
+        self.addCleanup(AffiliationAnalyzer.configure_cache, AffiliationAnalyzer.DEFAULT_CACHE_SIZE)
+        
+        first = AffiliationAnalyzer.analyze_affiliation("AstraZeneca Pharmaceuticals, Cambridge, UK")
+        second = AffiliationAnalyzer.analyze_affiliation("  AstraZeneca   Pharmaceuticals, Cambridge,\tUK ")
+        academic = AffiliationAnalyzer.analyze_affiliation("Harvard University, Boston, MA, USA")
+        
+        self.assertEqual(first, (True, "AstraZeneca Pharmaceuticals"))
+        self.assertEqual(second, first)
+        self.assertEqual(academic, (False, ""))
+        
+        stats = AffiliationAnalyzer.cache_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["size"], 2)
+    
+    def test_analyze_affiliation_cache_keeps_casing(self):
+        """Test that affiliations differing only in case keep their own company name."""
+        AffiliationAnalyzer.configure_cache(100)
+        self.addCleanup(AffiliationAnalyzer.configure_cache, AffiliationAnalyzer.DEFAULT_CACHE_SIZE)
+        
+        AffiliationAnalyzer.analyze_affiliation("AstraZeneca Pharmaceuticals, Cambridge, UK")
+        variant = AffiliationAnalyzer.analyze_affiliation("ASTRAZENECA PHARMACEUTICALS, Cambridge, UK")
+        
+        self.assertEqual(variant, (True, "ASTRAZENECA PHARMACEUTICALS"))
+        self.assertEqual(AffiliationAnalyzer.cache_stats()["misses"], 2)
+    
+    def test_configure_cache_disabled(self):
+        """Test that a cache size of zero disables memoization."""
+        AffiliationAnalyzer.configure_cache(0)
+        self.addCleanup(AffiliationAnalyzer.configure_cache, AffiliationAnalyzer.DEFAULT_CACHE_SIZE)
+        
+        self.assertEqual(AffiliationAnalyzer.cache_stats(), {})
+        self.assertEqual(
+            AffiliationAnalyzer.analyze_affiliation("Pfizer Inc., New York, NY, USA"),
+            (True, "Pfizer Inc.")
+        )
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -2,10 +2,27 @@
 
 import unittest
 from unittest.mock import patch, MagicMock
+import datetime
 import json
-from io import StringIO
+import os
+import tempfile
+import time
+from io import BytesIO, StringIO
 
 from pubmed_company_papers.api import PubMedAPI
+from pubmed_company_papers.article_store import ArticleStore
+from pubmed_company_papers.batching import AdaptiveBatchSizer
+from pubmed_company_papers.ratelimit import TokenBucket
+from pubmed_company_papers.response_cache import ResponseCache
+from pubmed_company_papers.retry import RetryPolicy
+from tests.stub_eutils import StubEutils, efetch_xml
+
+BATCH_XML = b"""<?xml version="1.0" ?>
+<PubmedArticleSet>
+  <PubmedArticle><MedlineCitation><PMID>12345</PMID></MedlineCitation></PubmedArticle>
+  <PubmedArticle><MedlineCitation><PMID>67890</PMID></MedlineCitation></PubmedArticle>
+</PubmedArticleSet>
+"""
 
 class TestPubMedAPI(unittest.TestCase):
     """Test cases for the PubMedAPI class."""
@@ -39,6 +56,19 @@ class TestPubMedAPI(unittest.TestCase):
         mock_read.assert_called_once_with(mock_handle)
         mock_handle.close.assert_called_once()
     
+    @patch("pubmed_company_papers.api.Entrez.esearch")
+    @patch("pubmed_company_papers.api.Entrez.read")
+    def test_search_date_range(self, mock_read, mock_esearch):
+        """Test that a mindate narrows the search by Entrez date up to today."""
+        mock_read.return_value = {"IdList": ["12345"]}
+        
+        self.api.search("cancer", retmax=10, mindate="2024/05/01")
+        
+        mock_esearch.assert_called_once_with(
+            db="pubmed", term="cancer", retmax=10, datetype="edat",
+            mindate="2024/05/01", maxdate=datetime.date.today().strftime("%Y/%m/%d")
+        )
+    
     @patch("pubmed_company_papers.api.Entrez.efetch")
     @patch("pubmed_company_papers.api.Entrez.read")
     def test_fetch_details(self, mock_read, mock_efetch):
@@ -61,34 +91,298 @@ class TestPubMedAPI(unittest.TestCase):
         mock_handle.close.assert_called_once()
     
     @patch("pubmed_company_papers.api.Entrez.efetch")
-    @patch("pubmed_company_papers.api.Entrez.read")
-    @patch("pubmed_company_papers.api.time.sleep")
-    def test_fetch_articles_batch(self, mock_sleep, mock_read, mock_efetch):
+    def test_fetch_articles_batch(self, mock_efetch):
         """Test the fetch_articles_batch method."""
-        # Mock the response
-        mock_handle = MagicMock()
-        mock_efetch.return_value = mock_handle
-        
-        mock_read.return_value = {
-            "PubmedArticle": [
-                {"MedlineCitation": {"PMID": "12345"}},
-                {"MedlineCitation": {"PMID": "67890"}}
-            ]
-        }
+        # Mock the response with two articles per batch
+        mock_efetch.side_effect = lambda **kwargs: BytesIO(BATCH_XML)
         
         # Call the method with a batch size of 2
-        result = self.api.fetch_articles_batch(["12345", "67890", "13579"], batch_size=2)
+        with patch.object(self.api.rate_limiter, "acquire", return_value=0.0) as mock_acquire:
+            result = self.api.fetch_articles_batch(["12345", "67890", "13579"], batch_size=2)
         
         # Verify the result
         self.assertEqual(len(result), 4)  # 2 articles per batch, 2 batches
+        self.assertEqual(result[0]["MedlineCitation"]["PMID"], "12345")
         
         # Verify the API calls
         self.assertEqual(mock_efetch.call_count, 2)
         mock_efetch.assert_any_call(db="pubmed", id="12345,67890", retmode="xml")
         mock_efetch.assert_any_call(db="pubmed", id="13579", retmode="xml")
         
-        # Verify sleep was called between batches
-        mock_sleep.assert_called_once()
+        # Verify every batch was paced by the rate limiter rather than a fixed sleep
+        self.assertEqual(mock_acquire.call_count, 2)
+    
+    @patch("pubmed_company_papers.api.Entrez.efetch")
+    @patch("pubmed_company_papers.api.time.sleep")
+    def test_iter_articles_redrives_failed_batch(self, mock_sleep, mock_efetch):
+        """Test that a failed batch is recorded and re-driven after the other batches."""
+        mock_efetch.side_effect = [
+            IOError("HTTP Error 500"),
+            BytesIO(BATCH_XML),
+            BytesIO(efetch_xml(["1", "2"]))
+        ]
+        
+        articles = self.api.iter_articles(["1", "2", "12345", "67890"], batch_size=2)
+        
+        self.assertEqual(next(articles)["MedlineCitation"]["PMID"], "12345")
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in articles], ["67890", "1", "2"])
+        self.assertEqual(mock_efetch.call_count, 3)
+        mock_efetch.assert_called_with(db="pubmed", id="1,2", retmode="xml")
+        self.assertEqual((self.api.last_fetch.requested, self.api.last_fetch.retrieved), (4, 4))
+        self.assertEqual(self.api.last_fetch.failed, [])
+    
+    @patch("pubmed_company_papers.api.Entrez.efetch")
+    @patch("pubmed_company_papers.api.time.sleep")
+    def test_iter_articles_redrives_truncated_response(self, mock_sleep, mock_efetch):
+        """Test that only the articles missing from a cut-off response are re-driven."""
+        truncated = BATCH_XML[:BATCH_XML.index(b"67890")]
+        mock_efetch.side_effect = [BytesIO(truncated), BytesIO(efetch_xml(["67890"]))]
+        
+        articles = list(self.api.iter_articles(["12345", "67890"], batch_size=2))
+        
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in articles], ["12345", "67890"])
+        mock_efetch.assert_called_with(db="pubmed", id="67890", retmode="xml")
+    
+    @patch("pubmed_company_papers.api.Entrez.efetch")
+    @patch("pubmed_company_papers.api.time.sleep")
+    def test_iter_articles_ledger_keeps_unrecovered_batch(self, mock_sleep, mock_efetch):
+        """Test that a batch failing again in the re-drive stays in the ledger."""
+        mock_efetch.side_effect = [BytesIO(BATCH_XML), IOError("HTTP Error 400"), IOError("HTTP Error 400")]
+        
+        articles = list(self.api.iter_articles(["12345", "67890", "3"], batch_size=2))
+        
+        self.assertEqual(len(articles), 2)
+        report = self.api.last_fetch
+        self.assertEqual((report.requested, report.retrieved, report.missing), (3, 2, 1))
+        self.assertEqual(report.failed_pmids(), ["3"])
+
+    @patch("Bio.Entrez.urlopen")
+    @patch("pubmed_company_papers.retry.time.sleep")
+    def test_entrez_failures_retried_only_by_policy(self, mock_sleep, mock_urlopen):
+        """Test that a failing Entrez request reaches NCBI once per policy attempt."""
+        from urllib.error import HTTPError
+        mock_urlopen.side_effect = HTTPError("https://eutils.ncbi.nlm.nih.gov", 503, "error", {}, None)
+        api = PubMedAPI(email="test@example.com", api_key="key", rate_limiter=TokenBucket(float("inf")),
+                        retry_policy=RetryPolicy(max_attempts=3, base_delay=0))
+        
+        with self.assertRaises(HTTPError):
+            api.search("cancer", retmax=10)
+        
+        self.assertEqual(mock_urlopen.call_count, 3)
+    
+    @patch("pubmed_company_papers.api.Entrez.efetch")
+    def test_iter_articles_concurrent_order(self, mock_efetch):
+        """Test that concurrent fetching yields batches in PMID order."""
+        def efetch(**kwargs):
+            ids = kwargs["id"].split(",")
+            # Make earlier batches finish last
+            time.sleep(0.02 * (10 - int(ids[0]) // 2))
+            return BytesIO(efetch_xml(ids))
+        
+        mock_efetch.side_effect = efetch
+        api = PubMedAPI(email="test@example.com", rate_limiter=TokenBucket(rate=1000))
+        pmids = [str(i) for i in range(10)]
+        
+        articles = list(api.iter_articles(pmids, batch_size=2, concurrency=4))
+        
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in articles], pmids)
+        self.assertEqual(mock_efetch.call_count, 5)
+    
+    def test_concurrent_fetch_against_stub_server(self):
+        """Test concurrent fetching and rate limiting against a local E-utilities stub."""
+        pmids = [str(30000000 + i) for i in range(40)]
+        
+        with StubEutils(pmids=pmids, latency=0.05) as stub:
+            api = PubMedAPI(
+                email="test@example.com",
+                eutils_url=stub.url,
+                rate_limiter=TokenBucket(rate=20, capacity=1)
+            )
+            
+            self.assertEqual(api.search("cancer", retmax=40), pmids)
+            articles = list(api.iter_articles(pmids, batch_size=5, concurrency=4))
+            
+            fetch_times = stub.request_times("efetch")
+        
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in articles], pmids)
+        self.assertEqual(len(fetch_times), 8)
+        # 8 requests at 20/s with no burst allowance take at least 7 intervals
+        self.assertGreaterEqual(fetch_times[-1] - fetch_times[0], 7 / 20 - 0.02)
+
+    def test_history_paging_against_stub_server(self):
+        """Test history-server search and retstart/retmax paging."""
+        pmids = [str(30000000 + i) for i in range(23)]
+        
+        with StubEutils(pmids=pmids) as stub:
+            api = PubMedAPI(
+                email="test@example.com",
+                eutils_url=stub.url,
+                rate_limiter=TokenBucket(rate=1000)
+            )
+            
+            count, webenv, query_key = api.search_history("cancer")
+            articles = list(api.iter_history_articles(webenv, query_key, 21, batch_size=10))
+            concurrent = list(api.iter_history_articles(webenv, query_key, count, batch_size=5,
+                                                        concurrency=3))
+            
+            fetches = [r["params"] for r in stub.requests if r["utility"] == "efetch"]
+        
+        self.assertEqual((count, webenv, query_key), (23, StubEutils.WEBENV, "1"))
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in articles], pmids[:21])
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in concurrent], pmids)
+        self.assertEqual(
+            [(f["retstart"], f["retmax"]) for f in fetches[:3]],
+            [("0", "10"), ("10", "10"), ("20", "1")]
+        )
+        # No PMIDs are sent back to the server
+        self.assertTrue(all("id" not in f for f in fetches))
+
+    def test_response_cache_warm_run(self):
+        """Test that a warm re-run is served entirely from the response cache."""
+        pmids = [str(30000000 + i) for i in range(12)]
+        
+        with tempfile.TemporaryDirectory() as cache_dir, StubEutils(pmids=pmids) as stub:
+            def run():
+                with ResponseCache(cache_dir) as cache:
+                    api = PubMedAPI(email="test@example.com", eutils_url=stub.url,
+                                    rate_limiter=TokenBucket(rate=1000), response_cache=cache)
+                    found = api.search("cancer", retmax=12)
+                    return [a["MedlineCitation"]["PMID"] for a in
+                            api.iter_articles(found, batch_size=5)]
+            
+            # Warm part of the cache so the first run mixes hits and misses
+            with ResponseCache(cache_dir) as cache:
+                api = PubMedAPI(email="test@example.com", eutils_url=stub.url,
+                                rate_limiter=TokenBucket(rate=1000), response_cache=cache)
+                list(api.iter_articles(pmids[3:7], batch_size=5, concurrency=2))
+            
+            cold = run()
+            cold_requests = len(stub.requests)
+            warm = run()
+            warm_requests = len(stub.requests) - cold_requests
+            
+            fetched_ids = [r["params"]["id"] for r in stub.requests if r["utility"] == "efetch"]
+        
+        self.assertEqual(cold, pmids)
+        self.assertEqual(warm, pmids)
+        self.assertEqual(warm_requests, 0)
+        # Only uncached PMIDs were requested on the cold run
+        self.assertEqual(fetched_ids[1], "30000000,30000001,30000002")
+        self.assertEqual(fetched_ids[2], "30000007,30000008,30000009")
+    
+    def test_article_store_fetches_only_missing(self):
+        """Test that stored articles are read locally and only new PMIDs are fetched."""
+        pmids = [str(30000000 + i) for i in range(12)]
+        
+        with tempfile.TemporaryDirectory() as tmpdir, StubEutils(pmids=pmids) as stub:
+            path = os.path.join(tmpdir, "articles.sqlite")
+            
+            def run(requested):
+                with ArticleStore(path) as store:
+                    api = PubMedAPI(email="test@example.com", eutils_url=stub.url,
+                                    rate_limiter=TokenBucket(rate=1000), article_store=store)
+                    articles = api.fetch_articles_batch(requested, batch_size=5)
+                    return [a["MedlineCitation"]["PMID"] for a in articles], api.last_fetch
+            
+            run(pmids[:8])
+            first_requests = len(stub.requests)
+            found, report = run(pmids)
+            fetched = [r["params"]["id"] for r in stub.requests[first_requests:]]
+        
+        self.assertEqual(found, pmids)
+        self.assertEqual(fetched, [",".join(pmids[8:])])
+        self.assertEqual((report.requested, report.retrieved), (12, 12))
+
+    def test_retries_transient_errors_against_stub_server(self):
+        """Test that 429/503 responses are retried, honouring Retry-After."""
+        pmids = [str(40000000 + i) for i in range(6)]
+        sleeps = []
+        
+        with StubEutils(pmids=pmids) as stub:
+            stub.fail_next("efetch", 429, retry_after="2")
+            stub.fail_next("efetch", 503, times=2)
+            api = PubMedAPI(email="test@example.com", eutils_url=stub.url,
+                            rate_limiter=TokenBucket(rate=1000),
+                            retry_policy=RetryPolicy(max_attempts=4, base_delay=0.5))
+            with patch("pubmed_company_papers.api.time.sleep", side_effect=sleeps.append):
+                articles = list(api.iter_articles(pmids, batch_size=3))
+            fetches = [r["params"]["id"] for r in stub.requests if r["utility"] == "efetch"]
+        
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in articles], pmids)
+        self.assertEqual(len(fetches), 5)
+        self.assertEqual(sleeps[0], 2.0)
+        # Backoff bounds double per attempt: 0.5 * 2 ** (attempt - 1)
+        self.assertTrue(0 <= sleeps[1] <= 1.0)
+        self.assertTrue(0 <= sleeps[2] <= 2.0)
+        self.assertEqual((api.last_fetch.requested, api.last_fetch.retrieved), (6, 6))
+    
+    def test_redrive_against_stub_server(self):
+        """Test that the re-drive requests only the PMIDs of batches that failed."""
+        pmids = [str(50000000 + i) for i in range(9)]
+        
+        with StubEutils(pmids=pmids) as stub:
+            api = PubMedAPI(email="test@example.com", eutils_url=stub.url,
+                            rate_limiter=TokenBucket(rate=1000),
+                            retry_policy=RetryPolicy(max_attempts=2, base_delay=0))
+            stub.fail_next("efetch", 502, times=2)
+            with patch("pubmed_company_papers.api.time.sleep"):
+                articles = list(api.iter_articles(pmids, batch_size=3))
+            fetches = [r["params"]["id"] for r in stub.requests if r["utility"] == "efetch"]
+        
+        # The first batch exhausts its retries and is recovered after the others
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in articles], pmids[3:] + pmids[:3])
+        self.assertEqual(fetches, [",".join(pmids[:3])] * 2 + [",".join(pmids[3:6]), ",".join(pmids[6:]),
+                                                            ",".join(pmids[:3])])
+        self.assertEqual(api.last_fetch.retrieved, 9)
+    
+    def test_adaptive_batches_against_stub_server(self):
+        """Test that an adaptive batch sizer resizes id batches and history pages from payload sizes."""
+        pmids = [str(55000000 + i) for i in range(200)]
+        article_bytes = len(efetch_xml(pmids[:100])) / 100
+        
+        with StubEutils(pmids=pmids) as stub:
+            # Payloads of about 20 articles are the target
+            sizer = AdaptiveBatchSizer(min_size=5, max_size=100, target_bytes=int(20 * article_bytes))
+            api = PubMedAPI(email="test@example.com", eutils_url=stub.url,
+                            rate_limiter=TokenBucket(rate=1000), batch_sizer=sizer)
+            articles = list(api.iter_articles(pmids, batch_size=50))
+            id_sizes = [len(r["params"]["id"].split(",")) for r in stub.requests if r["utility"] == "efetch"]
+            
+            count, webenv, query_key = api.search_history("cancer")
+            start = len(stub.requests)
+            history = list(api.iter_history_articles(webenv, query_key, count, batch_size=50))
+            pages = [r["params"] for r in stub.requests[start:] if r["utility"] == "efetch"]
+        
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in articles], pmids)
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in history], pmids)
+        self.assertEqual(id_sizes[0], 50)
+        self.assertTrue(all(size in (19, 20) for size in id_sizes[1:-1]), id_sizes)
+        self.assertEqual([int(page["retstart"]) for page in pages],
+                         [sum(int(p["retmax"]) for p in pages[:i]) for i in range(len(pages))])
+        self.assertTrue(all(int(page["retmax"]) <= 20 for page in pages), pages)
+        
+        summary = sizer.summary()
+        self.assertEqual(summary["batches"], len(id_sizes) + len(pages))
+        self.assertEqual(summary["largest"], 50)
+    
+    def test_adaptive_batches_back_off_after_errors(self):
+        """Test that failed requests shrink the next batches."""
+        pmids = [str(56000000 + i) for i in range(40)]
+        
+        with StubEutils(pmids=pmids) as stub:
+            sizer = AdaptiveBatchSizer(min_size=2, max_size=100, target_seconds=60)
+            api = PubMedAPI(email="test@example.com", eutils_url=stub.url,
+                            rate_limiter=TokenBucket(rate=1000),
+                            retry_policy=RetryPolicy(max_attempts=2, base_delay=0), batch_sizer=sizer)
+            stub.fail_next("efetch", 503)
+            with patch("pubmed_company_papers.api.time.sleep"):
+                articles = list(api.iter_articles(pmids, batch_size=16))
+            id_sizes = [len(r["params"]["id"].split(",")) for r in stub.requests if r["utility"] == "efetch"]
+        
+        self.assertEqual([a["MedlineCitation"]["PMID"] for a in articles], pmids)
+        # The failed batch is retried as it was; the next one is half its size and growth waits
+        self.assertEqual(id_sizes[:4], [16, 16, 8, 8])
+        self.assertEqual(sizer.failures, 1)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Tests for the article_store module."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from io import BytesIO
+
+from pubmed_company_papers.article_store import ArticleStore
+from pubmed_company_papers.xml_stream import iter_pubmed_articles
+from tests.stub_eutils import efetch_xml
+
+class TestArticleStore(unittest.TestCase):
+    """Test cases for the ArticleStore class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "articles.sqlite")
+        self.pmids = [str(50000000 + i) for i in range(5)]
+        self.articles = list(iter_pubmed_articles(BytesIO(efetch_xml(self.pmids))))
+    
+    def test_put_and_get_across_sessions(self):
+        """Test that stored articles are read back unchanged in the next session."""
+        with ArticleStore(self.path) as store:
+            store.put_many(self.articles[:3])
+        
+        with ArticleStore(self.path) as store:
+            self.assertEqual(len(store), 3)
+            found = store.get_many(self.pmids)
+        
+        self.assertEqual(sorted(found), self.pmids[:3])
+        self.assertEqual(found[self.pmids[0]], self.articles[0])
+    
+    def test_missing_and_iter_articles_keep_order(self):
+        """Test bulk lookups by PMID list, including articles not yet written."""
+        store = ArticleStore(self.path, batch_size=2)
+        for article in (self.articles[3], self.articles[1], self.articles[0]):
+            store.put(article)
+        self.assertEqual(len(store), 2)
+        
+        self.assertEqual(store.missing(self.pmids), [self.pmids[2], self.pmids[4]])
+        self.assertEqual(list(store.iter_articles(self.pmids)),
+                         [self.articles[0], self.articles[1], self.articles[3]])
+        self.assertEqual((store.hits, store.misses), (3, 2))
+        store.close()
+    
+    def test_layout_change_clears_store(self):
+        """Test that articles stored in an older layout are discarded."""
+        with ArticleStore(self.path) as store:
+            store.put_many(self.articles)
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("UPDATE meta SET value = 'old' WHERE key = 'format_version'")
+        conn.close()
+        
+        with ArticleStore(self.path) as store:
+            self.assertEqual(len(store), 0)
+
+if __name__ == "__main__":
+    unittest.main()
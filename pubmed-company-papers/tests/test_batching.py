@@ -0,0 +1,82 @@
+"""Tests for the batching module."""
+
+import unittest
+
+from pubmed_company_papers.batching import COOLDOWN_BATCHES, AdaptiveBatchSizer
+
+class TestAdaptiveBatchSizer(unittest.TestCase):
+    """Test cases for AdaptiveBatchSizer."""
+    
+    def test_default_size_until_first_observation(self):
+        """Test that the caller's batch size is used, clamped, before anything was observed."""
+        sizer = AdaptiveBatchSizer(min_size=10, max_size=200)
+        
+        self.assertEqual(sizer.next_size(50), 50)
+        self.assertEqual(sizer.next_size(500), 200)
+        self.assertEqual(sizer.next_size(1), 10)
+    
+    def test_converges_on_target_latency(self):
+        """Test that batches are sized to the target response time, growing at most 2x per step."""
+        sizer = AdaptiveBatchSizer(min_size=10, max_size=1000, target_seconds=2.0)
+        sizes = []
+        size = sizer.next_size(50)
+        for _ in range(20):
+            sizes.append(size)
+            # 0.2s of round trip plus 10ms per article: 180 articles take 2s
+            sizer.record(size, 0.2 + 0.01 * size, size * 1000)
+            size = sizer.next_size(50)
+        
+        self.assertEqual(sizes[1], 100)
+        self.assertTrue(all(later <= 2 * earlier for earlier, later in zip(sizes, sizes[1:])))
+        self.assertTrue(170 <= sizes[-1] <= 180, sizes)
+    
+    def test_payload_target_limits_size(self):
+        """Test that large articles keep batches below the target payload size."""
+        sizer = AdaptiveBatchSizer(min_size=10, max_size=1000, target_seconds=60, target_bytes=100000)
+        
+        sizer.record(50, 0.5, 50 * 5000)
+        
+        self.assertEqual(sizer.next_size(50), 20)
+    
+    def test_size_stays_within_bounds(self):
+        """Test that the size never leaves [min_size, max_size]."""
+        sizer = AdaptiveBatchSizer(min_size=10, max_size=80)
+        
+        for _ in range(5):
+            sizer.record(sizer.next_size(50), 0.01, 100)
+        self.assertEqual(sizer.next_size(50), 80)
+        
+        for _ in range(5):
+            sizer.record(sizer.next_size(50), 120.0, 100)
+        self.assertEqual(sizer.next_size(50), 10)
+    
+    def test_failures_halve_size_and_pause_growth(self):
+        """Test that a failure halves the size and growth resumes only after the cooldown."""
+        sizer = AdaptiveBatchSizer(min_size=5, max_size=1000, target_seconds=10)
+        sizer.record(100, 1.0, 1000)
+        
+        sizer.record_failure(sizer.next_size(50))
+        self.assertEqual(sizer.next_size(50), 100)
+        
+        for _ in range(COOLDOWN_BATCHES):
+            sizer.record(sizer.next_size(50), 0.1, 1000)
+            self.assertEqual(sizer.next_size(50), 100)
+        sizer.record(sizer.next_size(50), 0.1, 1000)
+        self.assertEqual(sizer.next_size(50), 200)
+    
+    def test_summary_records_chosen_sizes(self):
+        """Test that every observation is kept for tuning."""
+        sizer = AdaptiveBatchSizer()
+        sizer.record(50, 1.0, 50000)
+        sizer.record_failure(100)
+        sizer.record(30, 1.0, 30000)
+        
+        summary = sizer.summary()
+        
+        self.assertEqual((summary["batches"], summary["failures"]), (2, 1))
+        self.assertEqual((summary["smallest"], summary["largest"], summary["mean"]), (30, 50, 40.0))
+        self.assertEqual([entry["size"] for entry in summary["observations"]], [50, 100, 30])
+        self.assertTrue(summary["observations"][1]["error"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Tests for the cache module."""
+
+import unittest
+
+from pubmed_company_papers.cache import LRUCache
+
+class TestLRUCache(unittest.TestCase):
+    """Test cases for the LRUCache class."""
+    
+    def test_get_and_put(self):
+        """Test storing and retrieving values with hit/miss counters."""
+        cache = LRUCache(maxsize=2)
+        
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("b", "missing"), "missing")
+        
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["size"], 1)
+    
+    def test_eviction_order(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(len(cache), 2)
+    
+    def test_clear(self):
+        """Test that clear empties the cache and resets the counters."""
+        cache = LRUCache(maxsize=1)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.clear()
+        
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 1})
+    
+    def test_invalid_maxsize(self):
+        """Test that a non-positive maxsize is rejected."""
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,365 @@
+"""Tests for the cli module."""
+
+import csv
+import datetime
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pubmed_company_papers import cli
+from pubmed_company_papers.incremental import IncrementalState
+from pubmed_company_papers.output import CSVAppender
+from tests.stub_eutils import StubEutils, efetch_xml
+
+class TestCLI(unittest.TestCase):
+    """Test cases for the command-line interface."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.filename = os.path.join(self.tmpdir.name, "results.csv")
+        self.pmids = [str(60000000 + i) for i in range(120)]
+    
+    def run_main(self, stub, *extra):
+        """Run get-papers-list against the stub server, without NCBI's rate limit."""
+        argv = ["get-papers-list", "cancer", "-m", "120", "-f", self.filename,
+                "--eutils-url", stub.url, "--rate-limit", "1000", *extra]
+        with patch("sys.argv", argv):
+            cli.main()
+    
+    def read_ids(self):
+        """Read the PubMed IDs written to the output file."""
+        with open(self.filename, newline="") as f:
+            return [row["PubmedID"] for row in csv.DictReader(f)]
+    
+    def test_resume_after_crash(self):
+        """Test that --resume continues an interrupted run without duplicates."""
+        original_append = CSVAppender.append
+        calls = []
+        
+        def crash_on_third_checkpoint(writer, rows):
+            calls.append(len(rows))
+            if len(calls) == 3:
+                # Half of the batch reaches the file before the crash
+                original_append(writer, rows[:10])
+                raise OSError("disk unplugged")
+            return original_append(writer, rows)
+        
+        with StubEutils(pmids=self.pmids) as stub:
+            with patch.object(CSVAppender, "append", crash_on_third_checkpoint):
+                with self.assertRaises(SystemExit):
+                    self.run_main(stub)
+            self.assertEqual(len(self.read_ids()), 110)
+            
+            first_run = len(stub.requests)
+            self.run_main(stub, "--resume")
+            resumed = stub.requests[first_run:]
+        
+        self.assertEqual(self.read_ids(), self.pmids)
+        # No new search and only the unfinished articles are fetched
+        self.assertEqual([r["utility"] for r in resumed], ["efetch"])
+        self.assertEqual(resumed[0]["params"]["id"], ",".join(self.pmids[100:]))
+    
+    def test_resume_requires_output_file(self):
+        """Test that --resume without -f is rejected."""
+        with patch("sys.argv", ["get-papers-list", "cancer", "--resume"]):
+            with self.assertRaises(SystemExit) as context:
+                cli.main()
+        self.assertEqual(context.exception.code, 1)
+    
+    def test_resume_rejects_different_query(self):
+        """Test that a journal is not resumed for a different query."""
+        with StubEutils(pmids=self.pmids[:5]) as stub:
+            self.run_main(stub)
+            argv = ["get-papers-list", "diabetes", "-f", self.filename, "--eutils-url", stub.url, "--resume"]
+            with patch("sys.argv", argv), self.assertRaises(SystemExit):
+                cli.main()
+        self.assertEqual(len(self.read_ids()), 5)
+
+    def test_incremental_runs_fetch_only_new_articles(self):
+        """Test that an incremental run searches by Entrez date and appends new rows."""
+        today = datetime.date.today().strftime("%Y/%m/%d")
+        old = self.pmids[:30]
+        new = self.pmids[30:40]
+        dates = {pmid: "2020/01/01" for pmid in old}
+        dates.update({pmid: today for pmid in new})
+        # Indexed today but already processed by the first run
+        dates[old[-1]] = today
+        
+        with StubEutils(pmids=old, entrez_dates=dates) as stub:
+            self.run_main(stub, "--incremental")
+            self.assertEqual(self.read_ids(), old)
+            
+            stub.pmids = old + new
+            first_run = len(stub.requests)
+            self.run_main(stub, "--incremental")
+            second = stub.requests[first_run:]
+        
+        self.assertEqual(self.read_ids(), old + new)
+        self.assertEqual(second[0]["params"]["datetype"], "edat")
+        self.assertLessEqual(second[0]["params"]["mindate"], today)
+        self.assertEqual([r["params"]["id"] for r in second[1:]], [",".join(new)])
+    
+    def test_incremental_rerun_after_crash(self):
+        """Test that an incremental run after a crashed one, without --resume, writes no duplicates."""
+        original_append = CSVAppender.append
+        calls = []
+        
+        def crash_on_third_checkpoint(writer, rows):
+            calls.append(len(rows))
+            if len(calls) == 3:
+                original_append(writer, rows[:10])
+                raise OSError("disk unplugged")
+            return original_append(writer, rows)
+        
+        with StubEutils(pmids=self.pmids) as stub:
+            with patch.object(CSVAppender, "append", crash_on_third_checkpoint):
+                with self.assertRaises(SystemExit):
+                    self.run_main(stub, "--incremental")
+            self.assertEqual(len(self.read_ids()), 110)
+            
+            first_run = len(stub.requests)
+            self.run_main(stub, "--incremental")
+            rerun = stub.requests[first_run:]
+        
+        self.assertEqual(self.read_ids(), self.pmids)
+        # Only the articles after the last checkpoint are fetched again
+        self.assertEqual([r["params"]["id"] for r in rerun if r["utility"] == "efetch"],
+                         [",".join(self.pmids[100:])])
+        self.assertEqual(len(IncrementalState(f"{self.filename}.state").query("cancer").seen), 120)
+    
+    def test_incremental_keeps_date_when_results_are_truncated(self):
+        """Test that an incremental run cut off by --max-results pages on and keeps the last date."""
+        state_file = f"{self.filename}.state"
+        
+        def last_date():
+            return IncrementalState(state_file).query("cancer").last_date
+        
+        with StubEutils(pmids=self.pmids[:40]) as stub:
+            for run in range(4):
+                with self.assertLogs("pubmed_company_papers.cli", level="INFO") as logs:
+                    self.run_main(stub, "--incremental", "-m", "10")
+                warned = any("--max-results" in line for line in logs.output)
+                # Each run skips the articles written before and fetches the next 10
+                self.assertEqual(self.read_ids(), self.pmids[:10 * (run + 1)])
+                self.assertEqual(warned, run < 3)
+                self.assertEqual(last_date() is None, run < 3)
+            
+            self.filename = os.path.join(self.tmpdir.name, "history.csv")
+            state_file = f"{self.filename}.state"
+            self.run_main(stub, "--incremental", "--use-history", "-m", "10")
+            self.assertIsNone(last_date())
+    
+    def test_workers_match_in_process_output(self):
+        """Test that --workers writes the same rows as in-process processing."""
+        with StubEutils(pmids=self.pmids) as stub:
+            self.run_main(stub)
+            with open(self.filename) as f:
+                expected = f.read()
+            
+            self.run_main(stub, "--workers", "2")
+        
+        with open(self.filename) as f:
+            self.assertEqual(f.read(), expected)
+        self.assertEqual(self.read_ids(), self.pmids)
+    
+    def test_workers_refetch_corrupt_batch(self):
+        """Test that a batch the pool workers fail to parse is re-fetched instead of dropped."""
+        with StubEutils(pmids=self.pmids) as stub:
+            stub.truncate_next("efetch")
+            with self.assertLogs("pubmed_company_papers.processing", level="ERROR"):
+                self.run_main(stub, "--workers", "2")
+            efetches = [r for r in stub.requests if r["utility"] == "efetch"]
+        
+        self.assertEqual(sorted(self.read_ids()), self.pmids)
+        # Three batches, then one request for the rest of the truncated batch
+        self.assertEqual(len(efetches), 4)
+        self.assertTrue(set(efetches[-1]["params"]["id"].split(",")) < set(self.pmids[:50]))
+    
+    def test_jsonl_format(self):
+        """Test that --format jsonl writes one record per article with list columns."""
+        self.filename = os.path.join(self.tmpdir.name, "results.jsonl")
+        with StubEutils(pmids=self.pmids[:5]) as stub:
+            self.run_main(stub, "--format", "jsonl")
+        
+        with open(self.filename, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["PubmedID"] for r in records], self.pmids[:5])
+        self.assertEqual(records[0]["Non-academicAuthor(s)"], ["Doe, Jane"])
+    
+    def test_parquet_format_rejects_resume(self):
+        """Test that Parquet output cannot be resumed."""
+        argv = ["get-papers-list", "cancer", "-f", self.filename, "--format", "parquet", "--resume"]
+        with patch("sys.argv", argv), self.assertRaises(SystemExit) as context:
+            cli.main()
+        self.assertEqual(context.exception.code, 1)
+    
+    def test_offline_input_mode(self):
+        """Test that --input classifies local dumps without touching the network."""
+        dump_dir = os.path.join(self.tmpdir.name, "baseline")
+        os.mkdir(dump_dir)
+        for number, start in enumerate(range(0, 120, 40)):
+            with gzip.open(os.path.join(dump_dir, f"pubmed24n{number + 1:04d}.xml.gz"), "wb") as f:
+                f.write(efetch_xml(self.pmids[start:start + 40]))
+        
+        for workers in ("1", "2"):
+            argv = ["get-papers-list", "--input", dump_dir, "-f", self.filename, "--workers", workers]
+            with patch("sys.argv", argv), patch.object(cli, "PubMedAPI") as api:
+                cli.main()
+            api.assert_not_called()
+            self.assertEqual(self.read_ids(), self.pmids)
+    
+    def test_offline_input_mode_reports_failed_file(self):
+        """Test that a dump file the workers cannot parse fails the run after the others are written."""
+        dump_dir = os.path.join(self.tmpdir.name, "baseline")
+        os.mkdir(dump_dir)
+        for number, start in enumerate(range(0, 120, 40)):
+            data = efetch_xml(self.pmids[start:start + 40])
+            with gzip.open(os.path.join(dump_dir, f"pubmed24n{number + 1:04d}.xml.gz"), "wb") as f:
+                f.write(data[:len(data) // 2] if number == 1 else data)
+        
+        argv = ["get-papers-list", "--input", dump_dir, "-f", self.filename, "--workers", "2"]
+        with patch("sys.argv", argv), self.assertRaises(SystemExit) as context:
+            with self.assertLogs("pubmed_company_papers.cli", level="ERROR") as logs:
+                cli.main()
+        
+        self.assertEqual(context.exception.code, 1)
+        self.assertIn("pubmed24n0002.xml.gz", logs.output[-1])
+        self.assertEqual(self.read_ids(), self.pmids[:40] + self.pmids[80:])
+    
+    def test_article_store_serves_repeat_runs(self):
+        """Test that a repeat run reads stored articles instead of fetching them."""
+        # Articles are stored by the main process as well as by pool workers
+        for first, second in ((["--workers", "1"], ["--workers", "2"]), (["--workers", "2"], ["--workers", "1"])):
+            store = os.path.join(self.tmpdir.name, f"articles{first[1]}.sqlite")
+            with StubEutils(pmids=self.pmids) as stub:
+                self.run_main(stub, "--article-store", store, *first)
+                first_run = len(stub.requests)
+                
+                self.run_main(stub, "--article-store", store, *second)
+                repeat = stub.requests[first_run:]
+            
+            self.assertEqual([r["utility"] for r in repeat], ["esearch"])
+            self.assertEqual(self.read_ids(), self.pmids)
+    
+    def test_stats_reports(self):
+        """Test that --stats-json and --stats-prometheus report stage timings, counters and retries."""
+        stats_json = os.path.join(self.tmpdir.name, "stats.json")
+        stats_prom = os.path.join(self.tmpdir.name, "stats.prom")
+        for workers in ("1", "2"):
+            with StubEutils(pmids=self.pmids) as stub, patch("pubmed_company_papers.retry.time.sleep"):
+                stub.fail_next("efetch", 503)
+                self.run_main(stub, "--workers", workers, "--stats-json", stats_json,
+                              "--stats-prometheus", stats_prom)
+            
+            with open(stats_json) as f:
+                report = json.load(f)
+            self.assertTrue(report["succeeded"])
+            self.assertEqual(report["query"], "cancer")
+            self.assertEqual(report["stages"]["esearch"]["calls"], 1)
+            self.assertEqual(report["stages"]["efetch"]["items"], 120)
+            # Classified in the pool workers with --workers 2, merged back into the report
+            self.assertEqual(report["stages"]["parser"]["items"], 120)
+            self.assertEqual(report["stages"]["xml"]["items"], 120)
+            self.assertEqual(report["stages"]["output"]["items"], 120)
+            self.assertEqual(report["counters"]["requests.retries"], 1)
+            self.assertEqual(report["counters"]["rows.written"], 120)
+            self.assertGreater(report["counters"]["efetch.bytes"], 0)
+            self.assertIn("affiliation_cache", report["hit_rates"])
+            
+            with open(stats_prom) as f:
+                metrics = f.read()
+            self.assertIn('pubmed_company_papers_stage_seconds_count{stage="efetch"} 3', metrics)
+            self.assertIn("pubmed_company_papers_requests_retries_total 1", metrics)
+    
+    def test_adaptive_batches_recorded_in_stats(self):
+        """Test that --adaptive-batches sizes the fetches and records the chosen sizes."""
+        stats_json = os.path.join(self.tmpdir.name, "stats.json")
+        with StubEutils(pmids=self.pmids) as stub:
+            self.run_main(stub, "--adaptive-batches", "--batch-size-range", "10", "40",
+                          "--stats-json", stats_json)
+            sizes = [len(r["params"]["id"].split(",")) for r in stub.requests if r["utility"] == "efetch"]
+        
+        with open(stats_json) as f:
+            batch_sizes = json.load(f)["batch_sizes"]
+        self.assertEqual(self.read_ids(), self.pmids)
+        self.assertEqual(sizes[0], 40)
+        self.assertEqual([entry["size"] for entry in batch_sizes["observations"]], sizes)
+        self.assertEqual((batch_sizes["min_size"], batch_sizes["max_size"]), (10, 40))
+    
+    def test_queries_file_fetches_union_once(self):
+        """Test that --queries-file fetches overlapping results once and tags rows with their queries."""
+        queries_file = os.path.join(self.tmpdir.name, "queries.txt")
+        with open(queries_file, "w") as f:
+            f.write("# oncology\ncancer\n\ntumor\ncancer\n")
+        terms = {"cancer": self.pmids[:80], "tumor": self.pmids[40:]}
+        
+        argv = ["get-papers-list", "--queries-file", queries_file, "-m", "120", "-f", self.filename,
+                "--rate-limit", "1000", "--eutils-url"]
+        for workers in ("1", "2"):
+            with self.subTest(workers=workers), StubEutils(terms=terms) as stub:
+                with patch("sys.argv", [*argv, stub.url, "--workers", workers]):
+                    cli.main()
+                searched = [r["params"]["term"] for r in stub.requests if r["utility"] == "esearch"]
+                fetched = [pmid for r in stub.requests if r["utility"] == "efetch"
+                           for pmid in r["params"]["id"].split(",")]
+                
+                with open(self.filename, newline="") as f:
+                    rows = [(row["Query"], row["PubmedID"]) for row in csv.DictReader(f)]
+                self.assertEqual(searched, ["cancer", "tumor"])
+                self.assertEqual(fetched, self.pmids)
+                self.assertEqual(len(rows), 160)
+                self.assertEqual(sorted(pmid for query, pmid in rows if query == "cancer"), self.pmids[:80])
+                self.assertEqual(sorted(pmid for query, pmid in rows if query == "tumor"), self.pmids[40:])
+    
+    def test_queries_file_rejects_query(self):
+        """Test that --queries-file cannot be combined with a query."""
+        argv = ["get-papers-list", "cancer", "--queries-file", "queries.txt"]
+        with patch("sys.argv", argv), self.assertRaises(SystemExit) as context:
+            cli.main()
+        self.assertEqual(context.exception.code, 2)
+    
+    def test_record_then_replay_offline(self):
+        """Test that a recorded run replays to the same output without the server."""
+        cassette = os.path.join(self.tmpdir.name, "cassette")
+        with StubEutils(pmids=self.pmids) as stub:
+            self.run_main(stub, "--record", cassette)
+        with open(self.filename) as f:
+            recorded = f.read()
+        
+        os.remove(self.filename)
+        argv = ["get-papers-list", "cancer", "-m", "120", "-f", self.filename, "-c", "4",
+                "--replay", cassette, "--replay-error-rate", "0.3", "--max-retries", "10"]
+        with patch("sys.argv", argv), patch("pubmed_company_papers.retry.time.sleep") as sleep:
+            cli.main()
+        with open(self.filename) as f:
+            self.assertEqual(f.read(), recorded)
+        self.assertTrue(sleep.called)
+    
+    def test_serve_rejects_query(self):
+        """Test that --serve takes no query of its own."""
+        with patch("sys.argv", ["get-papers-list", "cancer", "--serve", "0"]), \
+                self.assertRaises(SystemExit) as context:
+            cli.main()
+        self.assertEqual(context.exception.code, 2)
+    
+    def test_serve_rejects_run_options(self):
+        """Test that --serve rejects options its jobs would ignore."""
+        for option in (["--workers", "2"], ["--format", "jsonl"], ["--use-history"], ["-f", self.filename]):
+            with self.subTest(option=option), patch("sys.argv", ["get-papers-list", "--serve", "0", *option]), \
+                    self.assertRaises(SystemExit) as context:
+                cli.main()
+            self.assertEqual(context.exception.code, 2)
+    
+    def test_query_or_input_required(self):
+        """Test that a run needs either a query or --input."""
+        with patch("sys.argv", ["get-papers-list"]), self.assertRaises(SystemExit) as context:
+            cli.main()
+        self.assertEqual(context.exception.code, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""Tests for the dumps module."""
+
+import gzip
+import os
+import tempfile
+import unittest
+
+from pubmed_company_papers.dumps import find_dump_files, iter_dump_articles
+from tests.stub_eutils import efetch_xml
+
+class TestDumps(unittest.TestCase):
+    """Test cases for reading local PubMed dump files."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.baseline = os.path.join(self.tmpdir.name, "pubmed24n0002.xml.gz")
+        self.first = os.path.join(self.tmpdir.name, "pubmed24n0001.xml.gz")
+        for path, pmids in ((self.baseline, ["3", "4"]), (self.first, ["1", "2"])):
+            with gzip.open(path, "wb") as f:
+                f.write(efetch_xml(pmids))
+        with open(os.path.join(self.tmpdir.name, "README.txt"), "w") as f:
+            f.write("not a dump")
+    
+    def test_find_dump_files_in_directory(self):
+        """Test that directories expand to their dump files in name order."""
+        self.assertEqual(find_dump_files([self.tmpdir.name]), [self.first, self.baseline])
+    
+    def test_find_dump_files_glob_and_duplicates(self):
+        """Test that glob patterns are expanded and files are listed once."""
+        pattern = os.path.join(self.tmpdir.name, "pubmed24n*.xml.gz")
+        self.assertEqual(find_dump_files([self.baseline, pattern]), [self.baseline, self.first])
+    
+    def test_find_dump_files_missing(self):
+        """Test that a path matching nothing is an error."""
+        with self.assertRaises(FileNotFoundError):
+            find_dump_files([os.path.join(self.tmpdir.name, "missing*.xml.gz")])
+    
+    def test_iter_dump_articles(self):
+        """Test that articles are streamed from a gzipped dump."""
+        articles = list(iter_dump_articles(self.first))
+        self.assertEqual([article["MedlineCitation"]["PMID"] for article in articles], ["1", "2"])
+
+if __name__ == "__main__":
+    unittest.main()
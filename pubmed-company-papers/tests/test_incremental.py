@@ -0,0 +1,60 @@
+"""Tests for the incremental module."""
+
+import datetime
+import os
+import tempfile
+import unittest
+
+from pubmed_company_papers.incremental import IncrementalState, PMIDSet, QueryState
+
+class TestPMIDSet(unittest.TestCase):
+    """Test cases for the PMIDSet class."""
+    
+    def test_membership_and_update(self):
+        """Test membership checks for string and integer IDs."""
+        pmids = PMIDSet(["300", "100"])
+        pmids.update(["200", 100, "Unknown"])
+        
+        self.assertIn("200", pmids)
+        self.assertIn(300, pmids)
+        self.assertNotIn("150", pmids)
+        self.assertNotIn("Unknown", pmids)
+        self.assertEqual(list(pmids), ["100", "200", "300"])
+    
+    def test_encode_roundtrip(self):
+        """Test that encoding is lossless and compact for dense IDs."""
+        pmids = PMIDSet(range(35000000, 35100000, 3))
+        encoded = pmids.encode()
+        
+        self.assertEqual(list(PMIDSet.decode(encoded)), list(pmids))
+        self.assertLess(len(encoded), len(pmids))
+        self.assertEqual(len(PMIDSet.decode(PMIDSet().encode())), 0)
+
+class TestIncrementalState(unittest.TestCase):
+    """Test cases for QueryState and IncrementalState."""
+    
+    def test_mindate(self):
+        """Test that the next search overlaps the last run by a day."""
+        self.assertIsNone(QueryState().mindate())
+        self.assertEqual(QueryState(last_date=datetime.date(2024, 3, 1)).mindate(), "2024/02/29")
+    
+    def test_save_and_load(self):
+        """Test that per-query state survives a round trip through the file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "results.csv.state")
+            state = IncrementalState(path)
+            query = state.query("cancer")
+            query.last_date = datetime.date(2024, 5, 17)
+            query.seen.update(["1", "2"])
+            state.query("diabetes")
+            state.save()
+            
+            loaded = IncrementalState(path)
+            self.assertEqual(set(loaded.queries), {"cancer", "diabetes"})
+            self.assertEqual(loaded.query("cancer").last_date, datetime.date(2024, 5, 17))
+            self.assertEqual(list(loaded.query("cancer").seen), ["1", "2"])
+            self.assertIsNone(loaded.query("diabetes").last_date)
+            self.assertFalse(os.path.exists(path + ".tmp"))
+
+if __name__ == "__main__":
+    unittest.main()
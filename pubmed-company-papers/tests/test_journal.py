@@ -0,0 +1,64 @@
+"""Tests for the journal module."""
+
+import os
+import tempfile
+import unittest
+
+from pubmed_company_papers.journal import RunJournal
+
+class TestRunJournal(unittest.TestCase):
+    """Test cases for the RunJournal class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "results.csv.journal")
+        self.settings = {"query": "cancer", "max_results": 100, "use_history": False}
+    
+    def test_resume_restores_state(self):
+        """Test that a resumed journal replays search and batch entries."""
+        with RunJournal(self.path) as journal:
+            journal.start(self.settings)
+            journal.record_search(["1", "2", "3", "4"], 4)
+            journal.record_batch(["1", "2"], rows=1, offset=120)
+        
+        with RunJournal(self.path, resume=True) as journal:
+            self.assertTrue(journal.resumed)
+            self.assertTrue(journal.matches(self.settings))
+            self.assertFalse(journal.matches(dict(self.settings, query="diabetes")))
+            self.assertEqual(journal.remaining(journal.pmids), ["3", "4"])
+            self.assertEqual((journal.rows, journal.offset, journal.count), (1, 120, 4))
+            journal.record_batch(["3"], rows=2, offset=200)
+        
+        with RunJournal(self.path, resume=True) as journal:
+            self.assertEqual(journal.remaining(journal.pmids), ["4"])
+            self.assertEqual(journal.offset, 200)
+    
+    def test_truncated_entry_is_ignored(self):
+        """Test that an entry cut off by a crash does not count as done."""
+        with RunJournal(self.path) as journal:
+            journal.start(self.settings)
+            journal.record_search(["1", "2"], 2)
+            journal.record_batch(["1"], rows=0, offset=0)
+        with open(self.path, "a") as f:
+            f.write('{"event":"batch","pmids":["2"],"ro')
+        
+        with RunJournal(self.path, resume=True) as journal:
+            self.assertEqual(journal.remaining(journal.pmids), ["2"])
+    
+    def test_without_resume_replaces_journal(self):
+        """Test that a fresh run discards an existing journal."""
+        with RunJournal(self.path) as journal:
+            journal.start(self.settings)
+            journal.record_batch(["1"], rows=1, offset=10)
+        
+        with RunJournal(self.path) as journal:
+            self.assertFalse(journal.resumed)
+            self.assertEqual(journal.done, set())
+        
+        with RunJournal(self.path, resume=True) as journal:
+            self.assertFalse(journal.resumed)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,17 @@
 """Tests for the output module."""
 
 import unittest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch
+import csv
+import io
+import json
 import os
-import pandas as pd
+import tempfile
 
-from pubmed_company_papers.output import OutputHandler
+from pubmed_company_papers.output import (
+    QUERY_COLUMNS, CSVAppender, JSONLinesAppender, OutputHandler, ParquetAppender
+)
+from pubmed_company_papers.records import ArticleRecord
 
 class TestOutputHandler(unittest.TestCase):
     """Test cases for the OutputHandler class."""
@@ -32,42 +38,39 @@ class TestOutputHandler(unittest.TestCase):
             }
         ]
     
-    @patch("pubmed_company_papers.output.pd.DataFrame")
-    def test_create_csv_to_file(self, mock_dataframe):
+    def test_create_csv_to_file(self):
         """Test creating a CSV file."""
-        # Mock DataFrame and to_csv
-        mock_df = MagicMock()
-        mock_dataframe.return_value = mock_df
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "test.csv")
+            
+            # Call the method with a stream of rows
+            count = OutputHandler.create_csv(iter(self.sample_data), filename=filename)
+            
+            with open(filename, newline="") as f:
+                rows = list(csv.DictReader(f))
         
-        # Call the method
-        OutputHandler.create_csv(self.sample_data, filename="test.csv")
-        
-        # Verify DataFrame was created with the correct data
-        mock_dataframe.assert_called_once_with(self.sample_data)
-        
-        # Verify to_csv was called with the correct filename
-        mock_df.to_csv.assert_called_once_with("test.csv", index=False)
+        # Verify all rows were written with the expected columns and quoting
+        self.assertEqual(count, 2)
+        self.assertEqual(rows, self.sample_data)
     
-    @patch("pubmed_company_papers.output.pd.DataFrame")
-    @patch("builtins.print")
-    def test_create_csv_to_console(self, mock_print, mock_dataframe):
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_create_csv_to_console(self, mock_stdout):
         """Test printing CSV to console."""
-        # Mock DataFrame and to_csv
-        mock_df = MagicMock()
-        mock_dataframe.return_value = mock_df
-        mock_df.to_csv.return_value = "CSV content"
-        
         # Call the method without a filename
         OutputHandler.create_csv(self.sample_data)
         
-        # Verify DataFrame was created with the correct data
-        mock_dataframe.assert_called_once_with(self.sample_data)
-        
-        # Verify to_csv was called with index=False
-        mock_df.to_csv.assert_called_once_with(index=False)
-        
-        # Verify print was called with the CSV content
-        mock_print.assert_called_once_with("CSV content")
+        # Verify the header and the quoted company name were printed
+        lines = mock_stdout.getvalue().splitlines()
+        self.assertEqual(lines[0], "PubmedID,Title,PublicationDate,Non-academicAuthor(s),"
+                                   "CompanyAffiliation(s),CorrespondingAuthorEmail")
+        self.assertEqual(len(lines), 3)
+        self.assertIn('"Genentech, Inc."', lines[2])
+    
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_create_csv_without_data(self, mock_stdout):
+        """Test that nothing is written when there are no rows."""
+        self.assertEqual(OutputHandler.create_csv(iter([])), 0)
+        self.assertEqual(mock_stdout.getvalue(), "")
     
     def test_format_data_for_csv(self):
         """Test formatting data for CSV output."""
@@ -101,5 +104,141 @@ class TestOutputHandler(unittest.TestCase):
         
         self.assertEqual(result, expected)
 
+    def test_format_row(self):
+        """Test formatting an article record as a result row."""
+        record = ArticleRecord("12345", "Test Article", "2023-01-15", (), "jane.doe@pfizer.com")
+        
+        result = OutputHandler.format_row(record, ["Doe, Jane"], ["Pfizer Inc."])
+        
+        expected = dict(self.sample_data[0], Title="Test Article")
+        expected.update({"Non-academicAuthor(s)": ["Doe, Jane"], "CompanyAffiliation(s)": ["Pfizer Inc."]})
+        self.assertEqual(result, expected)
+        self.assertEqual(OutputHandler.to_csv_row(result), dict(self.sample_data[0], Title="Test Article"))
+    
+    def test_format_row_keeps_lists(self):
+        """Test that result rows keep authors and companies as lists."""
+        record = ArticleRecord("12345", "Test Article", "2023-01-15", (), "jane.doe@pfizer.com")
+        
+        row = OutputHandler.format_row(record, ["Doe, Jane", "Roe, Rick"], ["Pfizer Inc."])
+        
+        self.assertEqual(row["Non-academicAuthor(s)"], ["Doe, Jane", "Roe, Rick"])
+        self.assertEqual(OutputHandler.to_csv_row(row)["Non-academicAuthor(s)"], "Doe, Jane; Roe, Rick")
+        self.assertEqual(OutputHandler.to_csv_row(self.sample_data[0]), self.sample_data[0])
+
+class TestCSVAppender(unittest.TestCase):
+    """Test cases for the CSVAppender class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.filename = os.path.join(self.tmpdir.name, "results.csv")
+        self.row = OutputHandler.format_data_for_csv(
+            "12345", "Title, with comma", "2023-01-15", ["Doe, Jane"], ["Pfizer Inc."], ""
+        )
+    
+    def test_append_writes_header_once(self):
+        """Test that rows are appended after a single header."""
+        writer = CSVAppender(self.filename)
+        self.assertEqual(writer.append([]), 0)
+        self.assertFalse(os.path.exists(self.filename))
+        writer.append([self.row])
+        size = writer.append([dict(self.row, PubmedID="67890")])
+        writer.close()
+        
+        with open(self.filename, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row["PubmedID"] for row in rows], ["12345", "67890"])
+        self.assertEqual(rows[0]["Title"], "Title, with comma")
+        self.assertEqual(size, os.path.getsize(self.filename))
+    
+    def test_resume_discards_rows_after_checkpoint(self):
+        """Test that resuming truncates the file to the checkpoint offset."""
+        writer = CSVAppender(self.filename)
+        offset = writer.append([self.row])
+        writer.append([dict(self.row, PubmedID="uncommitted")])
+        writer.close()
+        
+        writer = CSVAppender(self.filename, resume_offset=offset)
+        writer.append([dict(self.row, PubmedID="67890")])
+        writer.close()
+        
+        with open(self.filename, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row["PubmedID"] for row in rows], ["12345", "67890"])
+    
+    def test_append_with_query_column(self):
+        """Test that the writer's columns set the header and column order."""
+        writer = CSVAppender(self.filename, columns=QUERY_COLUMNS)
+        writer.append([dict(self.row, Query="cancer"), dict(self.row, Query="tumor")])
+        writer.close()
+        
+        with open(self.filename, newline="") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        self.assertEqual(reader.fieldnames[:2], ["Query", "PubmedID"])
+        self.assertEqual([row["Query"] for row in rows], ["cancer", "tumor"])
+    
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_append_to_console(self, mock_stdout):
+        """Test writing rows to the console."""
+        writer = CSVAppender()
+        self.assertEqual(writer.append([self.row]), 0)
+        writer.close()
+        
+        self.assertTrue(mock_stdout.getvalue().startswith("PubmedID,Title,"))
+        self.assertIn('"Title, with comma"', mock_stdout.getvalue())
+
+class TestColumnarAppenders(unittest.TestCase):
+    """Test cases for the JSON Lines and Parquet writers."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        record = ArticleRecord("12345", "Title, with comma", "2023-01-15", (), "")
+        self.row = OutputHandler.format_row(record, ["Doe, Jane", "Roe, Rick"], ["Pfizer Inc.", "Genentech, Inc."])
+    
+    def test_jsonl_keeps_lists_and_resumes(self):
+        """Test that JSON Lines output has one record per line and can be resumed."""
+        filename = os.path.join(self.tmpdir.name, "results.jsonl")
+        writer = JSONLinesAppender(filename)
+        offset = writer.append([self.row])
+        writer.append([dict(self.row, PubmedID="uncommitted")])
+        writer.close()
+        
+        writer = JSONLinesAppender(filename, resume_offset=offset)
+        writer.append([dict(self.row, PubmedID="67890")])
+        writer.close()
+        
+        with open(filename, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["PubmedID"] for r in records], ["12345", "67890"])
+        self.assertEqual(records[0]["CompanyAffiliation(s)"], ["Pfizer Inc.", "Genentech, Inc."])
+    
+    def test_parquet_requires_file(self):
+        """Test that Parquet output is rejected for the console."""
+        with self.assertRaises((ValueError, ImportError)):
+            ParquetAppender()
+    
+    def test_parquet_writes_list_columns_in_row_groups(self):
+        """Test that Parquet output keeps list columns and writes bounded row groups."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        
+        filename = os.path.join(self.tmpdir.name, "results.parquet")
+        writer = ParquetAppender(filename, row_group_size=3)
+        for i in range(4):
+            writer.append([dict(self.row, PubmedID=str(i)), dict(self.row, PubmedID=f"{i}b")])
+        writer.close()
+        
+        parquet = pq.ParquetFile(filename)
+        table = parquet.read()
+        self.assertEqual(table.num_rows, 8)
+        self.assertEqual(parquet.metadata.num_row_groups, 2)
+        self.assertEqual(table.column("Non-academicAuthor(s)").to_pylist()[0], ["Doe, Jane", "Roe, Rick"])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
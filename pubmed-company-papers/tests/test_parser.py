@@ -151,5 +151,31 @@ class TestPubMedParser(unittest.TestCase):
         email = PubMedParser.extract_corresponding_author_email(article_copy)
         self.assertEqual(email, "Unknown")
 
+    def test_extract_article(self):
+        """Test that extract_article matches the individual extractors."""
+        record = PubMedParser.extract_article(self.article)
+        
+        self.assertEqual(record.pubmed_id, PubMedParser.extract_pubmed_id(self.article))
+        self.assertEqual(record.title, PubMedParser.extract_title(self.article))
+        self.assertEqual(record.publication_date, PubMedParser.extract_publication_date(self.article))
+        self.assertEqual(
+            [author.as_dict() for author in record.authors],
+            PubMedParser.extract_authors_with_affiliations(self.article)
+        )
+        self.assertEqual(
+            record.corresponding_email,
+            PubMedParser.extract_corresponding_author_email(self.article)
+        )
+        self.assertEqual(record.pubmed_id, "12345")
+        self.assertEqual(record.corresponding_email, "jane.doe@pfizer.com")
+    
+    def test_extract_article_missing_fields(self):
+        """Test extract_article defaults when fields are missing."""
+        record = PubMedParser.extract_article({"MedlineCitation": {"PMID": "12345"}})
+        self.assertEqual(tuple(record), ("12345", "Unknown", "Unknown", (), "Unknown"))
+        
+        record = PubMedParser.extract_article({})
+        self.assertEqual(tuple(record), ("Unknown", "Unknown", "Unknown", (), "Unknown"))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Tests for the pipeline module."""
+
+import threading
+import time
+import unittest
+
+from pubmed_company_papers.pipeline import BackgroundWorker, iter_in_thread
+
+class TestIterInThread(unittest.TestCase):
+    """Test cases for iter_in_thread."""
+    
+    def test_yields_items_in_order(self):
+        """Test that every item is yielded once, in order."""
+        self.assertEqual(list(iter_in_thread(range(100), maxsize=2, chunk_size=7)), list(range(100)))
+        self.assertEqual(list(iter_in_thread([])), [])
+    
+    def test_producer_error_is_raised(self):
+        """Test that an exception in the producer reaches the consumer."""
+        def source():
+            yield 1
+            raise OSError("connection reset")
+        
+        items = iter_in_thread(source(), chunk_size=1)
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(OSError):
+            next(items)
+    
+    def test_early_stop_closes_source(self):
+        """Test that abandoning the consumer stops and closes the producer."""
+        closed = threading.Event()
+        
+        def source():
+            try:
+                for i in range(10000):
+                    yield i
+            finally:
+                closed.set()
+        
+        items = iter_in_thread(source(), maxsize=1, chunk_size=1)
+        self.assertEqual(next(items), 0)
+        items.close()
+        
+        self.assertTrue(closed.wait(1))
+    
+    def test_overlaps_producer_and_consumer(self):
+        """Test that wall time approaches max(produce, consume) rather than the sum."""
+        def slow_source():
+            for i in range(10):
+                time.sleep(0.02)
+                yield i
+        
+        start = time.perf_counter()
+        for _ in iter_in_thread(slow_source(), chunk_size=1):
+            time.sleep(0.02)
+        elapsed = time.perf_counter() - start
+        
+        self.assertLess(elapsed, 0.35)
+
+class TestBackgroundWorker(unittest.TestCase):
+    """Test cases for the BackgroundWorker class."""
+    
+    def test_runs_tasks_in_order(self):
+        """Test that tasks run in submission order."""
+        done = []
+        worker = BackgroundWorker(maxsize=2)
+        for i in range(20):
+            worker.submit(done.append, i)
+        worker.close()
+        
+        self.assertEqual(done, list(range(20)))
+    
+    def test_failure_is_raised_and_later_tasks_dropped(self):
+        """Test that a failed task surfaces and stops the remaining tasks."""
+        done = []
+        
+        def fail():
+            raise OSError("disk full")
+        
+        worker = BackgroundWorker(maxsize=10)
+        worker.submit(done.append, 1)
+        worker.submit(fail)
+        worker.submit(done.append, 2)
+        
+        with self.assertRaises(OSError):
+            worker.close()
+        self.assertEqual(done, [1])
+
+if __name__ == "__main__":
+    unittest.main()
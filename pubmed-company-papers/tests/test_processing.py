@@ -0,0 +1,132 @@
+"""Tests for the processing module."""
+
+import gzip
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from pubmed_company_papers.affiliations import AffiliationAnalyzer
+from pubmed_company_papers.processing import (
+    PayloadError,
+    ProcessingPool,
+    process_article,
+    process_file,
+    process_payload,
+)
+from pubmed_company_papers.xml_stream import iter_pubmed_articles
+from tests.stub_eutils import efetch_xml
+
+class TestProcessing(unittest.TestCase):
+    """Test cases for in-process and pooled article processing."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.batches = [[str(70000000 + 10 * b + i) for i in range(10)] for b in range(6)]
+    
+    def raw_batches(self, payloads):
+        """Number downloaded payloads the way PubMedAPI.iter_article_batches does."""
+        return [(number, {"id": ",".join(batch)}, payload)
+                for number, (batch, payload) in enumerate(zip(self.batches, payloads), 1)]
+    
+    def test_process_payload(self):
+        """Test that a raw batch yields one result per article, in order."""
+        results = process_payload(efetch_xml(self.batches[0]))
+        
+        self.assertEqual([pmid for pmid, _ in results], self.batches[0])
+        row = results[0][1]
+        self.assertEqual(row["PubmedID"], self.batches[0][0])
+        self.assertEqual(row["CompanyAffiliation(s)"], ["Pfizer Inc."])
+    
+    def test_pool_matches_in_process_results(self):
+        """Test that the pool returns the in-process results in input order."""
+        payloads = [efetch_xml(batch) for batch in self.batches]
+        expected = [
+            process_article(article)
+            for payload in payloads
+            for article in iter_pubmed_articles(BytesIO(payload))
+        ]
+        
+        with ProcessingPool(2) as pool:
+            results = list(pool.process(self.raw_batches(payloads)))
+        
+        self.assertEqual(results, expected)
+        self.assertEqual(pool.articles, 60)
+        self.assertEqual(pool.failed, [])
+    
+    def test_truncated_payload_raises_with_partial_results(self):
+        """Test that a truncated batch reports the articles parsed before the error."""
+        data = efetch_xml(self.batches[0])
+        with self.assertRaises(PayloadError) as context:
+            process_payload(data[:len(data) // 2])
+        
+        delivered = [pmid for pmid, _ in context.exception.results]
+        self.assertTrue(delivered)
+        self.assertEqual(delivered, self.batches[0][:len(delivered)])
+    
+    def test_pool_reports_corrupt_batch(self):
+        """Test that a batch failing to parse in a worker is returned to the caller as failed."""
+        corrupt = efetch_xml(self.batches[1])
+        payloads = [efetch_xml(self.batches[0]), corrupt[:len(corrupt) // 2], efetch_xml(self.batches[2])]
+        
+        with ProcessingPool(2) as pool:
+            with self.assertLogs("pubmed_company_papers.processing", level="ERROR"):
+                results = list(pool.process(self.raw_batches(payloads)))
+        
+        pmids = [pmid for pmid, _ in results]
+        delivered = pmids[10:-10]
+        self.assertEqual(pmids, self.batches[0] + delivered + self.batches[2])
+        self.assertEqual(pool.articles, len(results))
+        # Only the articles the corrupt batch did not deliver are left to re-fetch
+        self.assertEqual([batch.number for batch in pool.failed], [2])
+        self.assertEqual(pool.failed[0].params["id"].split(","), self.batches[1][len(delivered):])
+    
+    def test_workers_do_not_inherit_open_stores(self):
+        """Test that workers start without the parent's open SQLite connections."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            AffiliationAnalyzer.open_store(os.path.join(tmpdir, "verdicts.sqlite"))
+            self.addCleanup(AffiliationAnalyzer.close_store)
+            with ProcessingPool(1) as pool:
+                inherited = pool._executor.submit(getattr, AffiliationAnalyzer, "_verdict_store").result()
+            AffiliationAnalyzer.close_store()
+        
+        self.assertIsNone(inherited)
+    
+    def test_pool_processes_files_in_order(self):
+        """Test that dump files are sharded across workers and results keep file order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for number, batch in enumerate(self.batches):
+                path = os.path.join(tmpdir, f"pubmed24n{number:04d}.xml.gz")
+                with gzip.open(path, "wb") as f:
+                    f.write(efetch_xml(batch))
+                paths.append(path)
+            
+            with ProcessingPool(2) as pool:
+                results = list(pool.process_files(paths))
+            
+            self.assertEqual(results, [r for path in paths for r in process_file(path)])
+        
+        self.assertEqual([pmid for pmid, _ in results], [pmid for batch in self.batches for pmid in batch])
+        self.assertEqual(pool.articles, 60)
+    
+    def test_pool_reports_corrupt_file(self):
+        """Test that a dump file failing in a worker is skipped and returned to the caller as failed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for number, batch in enumerate(self.batches[:3]):
+                path = os.path.join(tmpdir, f"pubmed24n{number:04d}.xml")
+                data = efetch_xml(batch)
+                with open(path, "wb") as f:
+                    f.write(data[:len(data) // 2] if number == 1 else data)
+                paths.append(path)
+            
+            with ProcessingPool(2) as pool:
+                with self.assertLogs("pubmed_company_papers.processing", level="ERROR"):
+                    results = list(pool.process_files(paths))
+        
+        self.assertEqual([pmid for pmid, _ in results], self.batches[0] + self.batches[2])
+        self.assertEqual([(batch.number, batch.params["path"]) for batch in pool.failed], [(2, paths[1])])
+
+if __name__ == "__main__":
+    unittest.main()
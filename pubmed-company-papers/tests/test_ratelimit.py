@@ -0,0 +1,91 @@
+"""Tests for the ratelimit module."""
+
+import unittest
+from unittest.mock import patch
+
+from pubmed_company_papers.ratelimit import TokenBucket
+
+class FakeClock:
+    """Controllable replacement for time.monotonic and time.sleep."""
+    
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the TokenBucket class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        patcher = patch("pubmed_company_papers.ratelimit.time")
+        mock_time = patcher.start()
+        mock_time.monotonic.side_effect = self.clock.monotonic
+        mock_time.sleep.side_effect = self.clock.sleep
+        self.addCleanup(patcher.stop)
+    
+    def test_burst_then_throttle(self):
+        """Test that a bucket with a larger capacity allows a burst and then paces requests."""
+        bucket = TokenBucket(rate=3, capacity=3)
+        
+        for _ in range(3):
+            self.assertEqual(bucket.acquire(), 0.0)
+        
+        waited = bucket.acquire()
+        self.assertAlmostEqual(waited, 1 / 3)
+        self.assertAlmostEqual(self.clock.now, 100 + 1 / 3)
+    
+    def test_no_window_exceeds_rate(self):
+        """Test that by default no 1-second window holds more than `rate` acquisitions."""
+        for rate in (3, 10):
+            with self.subTest(rate=rate):
+                bucket = TokenBucket(rate=rate)
+                times = []
+                for _ in range(5 * rate):
+                    bucket.acquire()
+                    times.append(self.clock.now)
+                    # Idle gaps let a bucket refill, which must not allow a burst
+                    if len(times) % 7 == 0:
+                        self.clock.now += 2.5
+                
+                for start in times:
+                    in_window = [t for t in times if start <= t < start + 1 - 1e-9]
+                    self.assertLessEqual(len(in_window), rate)
+    
+    def test_unlimited_rate(self):
+        """Test that an infinite rate never waits."""
+        bucket = TokenBucket(rate=float("inf"))
+        for _ in range(100):
+            self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(self.clock.sleeps, [])
+    
+    def test_try_acquire(self):
+        """Test non-blocking acquisition and refill over time."""
+        bucket = TokenBucket(rate=2, capacity=1)
+        
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.clock.now += 0.5
+        self.assertTrue(bucket.try_acquire())
+    
+    def test_for_ncbi(self):
+        """Test that the NCBI limiter depends on the API key."""
+        self.assertEqual(TokenBucket.for_ncbi().rate, 3)
+        self.assertEqual(TokenBucket.for_ncbi("key").rate, 10)
+    
+    def test_invalid_rate(self):
+        """Test that a non-positive rate or capacity is rejected."""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=3, capacity=0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the records module."""
+
+import tracemalloc
+import unittest
+
+from pubmed_company_papers.records import ArticleRecord, AuthorRecord, StringPool
+
+class TestStringPool(unittest.TestCase):
+    """Test cases for the StringPool class."""
+    
+    def test_intern_returns_shared_instance(self):
+        """Test that equal strings map to one pooled instance."""
+        pool = StringPool()
+        first = "".join(["Pfizer Inc., ", "New York"])
+        second = "".join(["Pfizer Inc., ", "New York"])
+        self.assertIsNot(first, second)
+        
+        self.assertIs(pool.intern(first), first)
+        self.assertIs(pool.intern(second), first)
+        self.assertEqual(len(pool), 1)
+        
+        pooled = pool.intern_all([second, "Harvard University"])
+        self.assertIs(pooled[0], first)
+        self.assertEqual(len(pool), 2)
+        
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+
+    def test_pool_is_bounded(self):
+        """Test that least recently used strings are dropped once the pool is full."""
+        pool = StringPool(maxsize=2)
+        first = pool.intern("".join(["Pfizer", " Inc."]))
+        pool.intern("Harvard University")
+        pool.intern("Pfizer Inc.")
+        pool.intern("Genentech, Inc.")
+        self.assertEqual(len(pool), 2)
+        # Recently used strings stay pooled, the oldest one was evicted
+        self.assertIs(pool.intern("Pfizer Inc."), first)
+        harvard = "".join(["Harvard", " University"])
+        self.assertIs(pool.intern(harvard), harvard)
+    
+    def test_memory_stays_flat_across_batches(self):
+        """Test that interning ever new strings does not grow memory past the cap."""
+        pool = StringPool(maxsize=1000)
+        
+        def intern_batch(batch):
+            pool.intern_all(f"Department {batch}-{i}, Example University" for i in range(1000))
+        
+        tracemalloc.start()
+        try:
+            for batch in range(5):
+                intern_batch(batch)
+            warm = tracemalloc.get_traced_memory()[0]
+            for batch in range(5, 50):
+                intern_batch(batch)
+            grown = tracemalloc.get_traced_memory()[0] - warm
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(len(pool), 1000)
+        self.assertLess(grown, 50 * 1024)
+    
+    def test_invalid_size(self):
+        """Test that the pool needs a positive size."""
+        with self.assertRaises(ValueError):
+            StringPool(maxsize=0)
+
+class TestAuthorRecord(unittest.TestCase):
+    """Test cases for the AuthorRecord class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.author = AuthorRecord(
+            name="Doe, Jane",
+            affiliations=("Pfizer Inc., New York, NY, USA",),
+            email="jane.doe@pfizer.com"
+        )
+    
+    def test_slots(self):
+        """Test that records carry no per-instance dictionary."""
+        self.assertFalse(hasattr(self.author, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.author.extra = "value"
+    
+    def test_dictionary_access(self):
+        """Test dictionary-style access for code written against author dicts."""
+        self.assertEqual(self.author["name"], "Doe, Jane")
+        self.assertEqual(self.author.get("affiliations"), ("Pfizer Inc., New York, NY, USA",))
+        self.assertIsNone(self.author.get("missing"))
+        with self.assertRaises(KeyError):
+            self.author["missing"]
+    
+    def test_as_dict(self):
+        """Test conversion to the author dictionary format."""
+        self.assertEqual(self.author.as_dict(), {
+            "name": "Doe, Jane",
+            "affiliations": ["Pfizer Inc., New York, NY, USA"],
+            "email": "jane.doe@pfizer.com",
+            "is_corresponding": False
+        })
+        self.assertEqual(self.author, AuthorRecord("Doe, Jane", ("Pfizer Inc., New York, NY, USA",), "jane.doe@pfizer.com"))
+
+class TestArticleRecord(unittest.TestCase):
+    """Test cases for the ArticleRecord type."""
+    
+    def test_fields(self):
+        """Test field access by name and position."""
+        record = ArticleRecord("12345", "Title", "2023-01-15", (), "Unknown")
+        self.assertEqual(record.pubmed_id, "12345")
+        self.assertEqual(record[1], "Title")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Tests for the response_cache module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pubmed_company_papers.response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the ResponseCache class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.directory = os.path.join(self.tmpdir.name, "cache")
+    
+    def test_articles_roundtrip(self):
+        """Test storing and loading article XML across sessions."""
+        with ResponseCache(self.directory) as cache:
+            cache.put_articles({"1": b"<PubmedArticle>one</PubmedArticle>", "2": b"<PubmedArticle/>"})
+            self.assertEqual(cache.get_articles(["1", "3"]), {"1": b"<PubmedArticle>one</PubmedArticle>"})
+        
+        with ResponseCache(self.directory) as cache:
+            self.assertEqual(set(cache.get_articles(["1", "2", "3"])), {"1", "2"})
+            stats = cache.stats()
+            self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+    
+    def test_search_roundtrip(self):
+        """Test that esearch results are keyed by all parameters."""
+        with ResponseCache(self.directory) as cache:
+            cache.put_search({"term": "cancer", "retmax": 10}, ["1", "2"])
+            self.assertEqual(cache.get_search({"retmax": 10, "term": "cancer"}), ["1", "2"])
+            self.assertIsNone(cache.get_search({"term": "cancer", "retmax": 20}))
+    
+    def test_ttl_expiry(self):
+        """Test that entries older than the TTL are ignored and removed."""
+        with ResponseCache(self.directory, ttl=60) as cache:
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1000.0):
+                cache.put_articles({"1": b"<PubmedArticle/>"})
+                cache.put_search({"term": "cancer"}, ["1"])
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1030.0):
+                self.assertEqual(len(cache.get_articles(["1"])), 1)
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1100.0):
+                self.assertEqual(cache.get_articles(["1"]), {})
+                self.assertIsNone(cache.get_search({"term": "cancer"}))
+    
+    def test_search_ttl(self):
+        """Test that search results expire after their own, shorter TTL while articles are kept."""
+        with ResponseCache(self.directory, ttl=3600, search_ttl=60) as cache:
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1000.0):
+                cache.put_articles({"1": b"<PubmedArticle/>"})
+                cache.put_search({"term": "cancer"}, ["1"])
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1030.0):
+                self.assertEqual(cache.get_search({"term": "cancer"}), ["1"])
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1100.0):
+                self.assertIsNone(cache.get_search({"term": "cancer"}))
+                self.assertEqual(len(cache.get_articles(["1"])), 1)
+    
+    def test_size_cap_evicts_least_recently_used(self):
+        """Test LRU eviction once the size cap is exceeded."""
+        payload = os.urandom(400)
+        with ResponseCache(self.directory, ttl=None, max_bytes=1000) as cache:
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1.0):
+                cache.put_articles({"1": payload})
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=2.0):
+                cache.put_articles({"2": payload})
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=3.0):
+                cache.get_articles(["1"])
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=4.0):
+                cache.put_articles({"3": payload})
+            
+            self.assertEqual(set(cache.get_articles(["1", "2", "3"])), {"1", "3"})
+            self.assertEqual(cache.stats()["evictions"], 1)
+            self.assertLessEqual(cache.total_bytes(), 1000)
+    
+    def test_running_total_matches_stored_sizes(self):
+        """Test that the byte total follows inserts, replacements, expiry and eviction without table scans."""
+        def stored(cache):
+            return sum(cache._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+                       for table in ("articles", "searches"))
+        
+        with ResponseCache(self.directory, ttl=60, max_bytes=2000) as cache:
+            statements = []
+            cache._conn.set_trace_callback(statements.append)
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1000.0):
+                cache.put_articles({"1": os.urandom(300), "2": b"<PubmedArticle/>"})
+                cache.put_search({"term": "cancer"}, ["1", "2"])
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1030.0):
+                # Replacements count their new size only
+                cache.put_articles({"1": os.urandom(500), "3": os.urandom(700)})
+                cache.put_search({"term": "cancer"}, ["1", "2", "3"])
+                cache.put_articles({"4": os.urandom(900)})
+            cache._conn.set_trace_callback(None)
+            self.assertGreater(cache.stats()["evictions"], 0)
+            self.assertEqual(cache.total_bytes(), stored(cache))
+            self.assertLessEqual(cache.total_bytes(), 2000)
+            self.assertFalse([sql for sql in statements if "SUM(size)" in sql and "WHERE" not in sql])
+            
+            with patch("pubmed_company_papers.response_cache.time.time", return_value=1200.0):
+                cache.get_articles(["1", "2", "3", "4"])
+            self.assertEqual(cache.total_bytes(), stored(cache))
+            total = cache.total_bytes()
+        
+        with ResponseCache(self.directory, ttl=60, max_bytes=2000) as cache:
+            self.assertEqual(cache.total_bytes(), total)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for the retry module."""
+
+import email.utils
+import time
+import unittest
+from unittest.mock import patch
+from urllib.error import HTTPError, URLError
+
+from pubmed_company_papers.retry import FetchReport, RetryPolicy, batch_size
+
+def http_error(code, retry_after=None):
+    """Build an HTTPError with an optional Retry-After header."""
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return HTTPError("https://example.org", code, "error", headers, None)
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test cases for the RetryPolicy class."""
+    
+    def test_is_retryable(self):
+        """Test which errors are considered transient."""
+        self.assertTrue(RetryPolicy.is_retryable(http_error(429)))
+        self.assertTrue(RetryPolicy.is_retryable(http_error(503)))
+        self.assertTrue(RetryPolicy.is_retryable(URLError("connection refused")))
+        self.assertTrue(RetryPolicy.is_retryable(ConnectionResetError()))
+        self.assertFalse(RetryPolicy.is_retryable(http_error(400)))
+        self.assertFalse(RetryPolicy.is_retryable(ValueError("bad")))
+    
+    def test_retry_after(self):
+        """Test parsing Retry-After as seconds and as an HTTP date."""
+        self.assertEqual(RetryPolicy.retry_after(http_error(429, "3")), 3.0)
+        self.assertIsNone(RetryPolicy.retry_after(http_error(429)))
+        self.assertIsNone(RetryPolicy.retry_after(http_error(429, "soon")))
+        
+        when = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(RetryPolicy.retry_after(http_error(503, when)), 30, delta=2)
+    
+    def test_backoff_bounds(self):
+        """Test that jittered delays stay under the exponential cap."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        for attempt, cap in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (10, 5.0)]:
+            for _ in range(50):
+                self.assertTrue(0 <= policy.backoff(attempt) <= cap)
+    
+    def test_next_delay(self):
+        """Test that Retry-After wins over backoff and retries are bounded."""
+        policy = RetryPolicy(max_attempts=3)
+        self.assertEqual(policy.next_delay(1, http_error(429, "7")), 7.0)
+        self.assertIsNotNone(policy.next_delay(2, http_error(500)))
+        self.assertIsNone(policy.next_delay(3, http_error(500)))
+        self.assertIsNone(policy.next_delay(1, http_error(404)))
+    
+    def test_next_delay_caps_retry_after(self):
+        """Test that a large or far-future Retry-After is capped at max_delay."""
+        policy = RetryPolicy(max_delay=30.0)
+        self.assertEqual(policy.next_delay(1, http_error(429, "86400")), 30.0)
+        
+        when = email.utils.formatdate(time.time() + 7200, usegmt=True)
+        self.assertEqual(policy.next_delay(1, http_error(503, when)), 30.0)
+    
+    @patch("pubmed_company_papers.retry.time.sleep")
+    def test_call(self, mock_sleep):
+        """Test that call retries transient errors and re-raises permanent ones."""
+        policy = RetryPolicy(max_attempts=3)
+        outcomes = [http_error(503), URLError("reset"), "ok"]
+        
+        def flaky():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        
+        self.assertEqual(policy.call(flaky), "ok")
+        self.assertEqual(mock_sleep.call_count, 2)
+        
+        with self.assertRaises(HTTPError):
+            policy.call(lambda: (_ for _ in ()).throw(http_error(400)))
+        self.assertEqual(mock_sleep.call_count, 2)
+
+class TestFetchReport(unittest.TestCase):
+    """Test cases for FetchReport and batch_size."""
+    
+    def test_batch_size(self):
+        """Test counting articles for id lists and history pages."""
+        self.assertEqual(batch_size({"id": "1,2,3"}), 3)
+        self.assertEqual(batch_size({"id": ""}), 0)
+        self.assertEqual(batch_size({"WebEnv": "w", "query_key": "1", "retstart": 0, "retmax": 250}), 250)
+    
+    def test_ledger(self):
+        """Test the failed-batch ledger and missing count."""
+        report = FetchReport(requested=10)
+        report.retrieved = 5
+        report.record_failure(2, {"id": "4,5"}, http_error(503))
+        report.record_failure(3, {"WebEnv": "w", "retstart": 6, "retmax": 3}, URLError("reset"))
+        
+        self.assertEqual(report.missing, 5)
+        self.assertEqual(report.failed_pmids(), ["4", "5"])
+        self.assertEqual([batch.size for batch in report.failed], [2, 3])
+        self.assertIn("503", report.failed[0].error)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Tests for the server module."""
+
+import json
+import os
+from http.client import HTTPConnection
+from urllib.parse import urlparse
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from pubmed_company_papers.article_store import ArticleStore
+from pubmed_company_papers.ratelimit import TokenBucket
+from pubmed_company_papers.server import PapersServer, PapersService
+from tests.stub_eutils import StubEutils
+
+class TestPapersServer(unittest.TestCase):
+    """Test cases for the local HTTP/JSON service."""
+    
+    def setUp(self):
+        """Start a stub E-utilities server and a service in front of it."""
+        self.pmids = [str(70000000 + i) for i in range(120)]
+        self.stub = StubEutils(pmids=self.pmids).start()
+        self.addCleanup(self.stub.stop)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+    
+    def start_server(self, **kwargs):
+        """Serve a PapersService on a free port until the test ends."""
+        kwargs.setdefault("rate_limiter", TokenBucket(1000))
+        service = PapersService(email="test@example.com", eutils_url=self.stub.url, **kwargs)
+        server = PapersServer(service)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+    
+    def post_job(self, server, job):
+        """Submit a job and return the decoded lines of the streamed response."""
+        request = Request(f"{server.url}/jobs", data=json.dumps(job).encode("utf-8"),
+                          headers={"Content-Type": "application/json"})
+        with urlopen(request) as response:
+            self.assertEqual(response.headers["Content-Type"], "application/x-ndjson")
+            return [json.loads(line) for line in response]
+    
+    def efetched(self):
+        """Return the PMIDs requested from efetch so far."""
+        return [pmid for r in self.stub.requests if r["utility"] == "efetch"
+                for pmid in r["params"]["id"].split(",")]
+    
+    def test_job_streams_rows_and_summary(self):
+        """Test that a job streams one row per matching article followed by a summary."""
+        server = self.start_server()
+        lines = self.post_job(server, {"query": "cancer", "max_results": 120})
+        
+        rows, summary = lines[:-1], lines[-1]["summary"]
+        self.assertEqual([row["PubmedID"] for row in rows], self.pmids)
+        self.assertEqual(rows[0]["CompanyAffiliation(s)"], ["Pfizer Inc."])
+        self.assertEqual((summary["found"], summary["retrieved"], summary["rows"]), (120, 120, 120))
+        self.assertEqual(server.service.status()["jobs"]["completed"], 1)
+    
+    def test_warm_article_store_skips_fetches(self):
+        """Test that a repeated job is served from the article store kept open by the service."""
+        store = ArticleStore(os.path.join(self.tmpdir.name, "articles.sqlite"))
+        self.addCleanup(store.close)
+        server = self.start_server(article_store=store)
+        
+        first = self.post_job(server, {"query": "cancer", "max_results": 50})
+        fetched = len(self.efetched())
+        second = self.post_job(server, {"query": "cancer", "max_results": 50})
+        
+        self.assertEqual(fetched, 50)
+        self.assertEqual(len(self.efetched()), 50)
+        self.assertEqual(first[:-1], second[:-1])
+        self.assertEqual(server.service.status()["article_store"]["hits"], 50)
+    
+    def test_concurrent_jobs_share_rate_limit(self):
+        """Test that concurrent jobs together stay within the service's rate limit."""
+        server = self.start_server(rate_limiter=TokenBucket(20, capacity=1))
+        results = []
+        
+        def run_job():
+            results.append(self.post_job(server, {"query": "cancer", "max_results": 100}))
+        
+        threads = [threading.Thread(target=run_job) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual([len(lines) for lines in results], [101] * 3)
+        # 3 searches and 6 efetch batches, at most one request per 50 ms
+        times = sorted(r["time"] for r in self.stub.requests)
+        self.assertEqual(len(times), 9)
+        self.assertGreaterEqual(times[-1] - times[0], 8 * 0.05 * 0.9)
+    
+    def test_invalid_job_rejected(self):
+        """Test that malformed jobs are answered with 400 without searching."""
+        server = self.start_server()
+        for job in ({}, {"query": "cancer", "max_results": 0}, {"query": "cancer", "retmax": 5}):
+            with self.subTest(job=job), self.assertRaises(HTTPError) as context:
+                self.post_job(server, job)
+            self.assertEqual(context.exception.code, 400)
+        self.assertEqual(self.stub.requests, [])
+    
+    def test_invalid_content_length_rejected(self):
+        """Test that a negative or malformed Content-Length is answered with 400."""
+        server = self.start_server()
+        address = urlparse(server.url)
+        for length in ("-1", "abc"):
+            with self.subTest(length=length):
+                connection = HTTPConnection(address.hostname, address.port, timeout=5)
+                self.addCleanup(connection.close)
+                connection.putrequest("POST", "/jobs")
+                connection.putheader("Content-Length", length)
+                connection.endheaders()
+                response = connection.getresponse()
+                self.assertEqual(response.status, 400)
+                self.assertEqual(json.load(response), {"error": "invalid Content-Length"})
+        self.assertEqual(self.stub.requests, [])
+    
+    def test_busy_server_answers_503(self):
+        """Test that jobs beyond max_jobs are turned away."""
+        server = self.start_server(max_jobs=1)
+        server.service.acquire()
+        with self.assertRaises(HTTPError) as context:
+            self.post_job(server, {"query": "cancer"})
+        self.assertEqual(context.exception.code, 503)
+        self.assertEqual(context.exception.headers["Retry-After"], "1")
+        server.service.release(True)
+        self.assertEqual(len(self.post_job(server, {"query": "cancer", "max_results": 10})), 11)
+    
+    def test_health_and_stats(self):
+        """Test the health and statistics endpoints."""
+        server = self.start_server()
+        self.post_job(server, {"query": "cancer", "max_results": 10})
+        with urlopen(f"{server.url}/health") as response:
+            self.assertEqual(json.load(response), {"status": "ok"})
+        with urlopen(f"{server.url}/stats") as response:
+            stats = json.load(response)
+        self.assertEqual(stats["service"]["jobs"]["completed"], 1)
+        self.assertIn("job", stats["stages"])
+
+if __name__ == "__main__":
+    unittest.main()
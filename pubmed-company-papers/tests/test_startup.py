@@ -0,0 +1,35 @@
+"""Tests that the CLI and classifier load without their heavy dependencies."""
+
+import subprocess
+import sys
+import unittest
+
+from benchmarks.bench_startup import HEAVY_MODULES, SCENARIOS
+
+class TestStartup(unittest.TestCase):
+    """Test cases for lazy imports on the startup paths."""
+    
+    def loaded_modules(self, code):
+        """Run code in a fresh interpreter and return the heavy modules it loaded."""
+        check = f"{code}\nimport sys\nprint('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+        loaded = result.stdout.rsplit("loaded:", 1)[1].strip()
+        return [name for name in loaded.split(",") if name]
+    
+    def test_help_does_not_load_heavy_modules(self):
+        """Test that --help loads neither Biopython, tqdm, multiprocessing nor sqlite3."""
+        self.assertEqual(self.loaded_modules(SCENARIOS["help"]), [])
+    
+    def test_classification_does_not_load_heavy_modules(self):
+        """Test that classifying an affiliation needs none of the heavy modules."""
+        self.assertEqual(self.loaded_modules(SCENARIOS["classify"]), [])
+    
+    def test_entrez_is_available_from_api_module(self):
+        """Test that api.Entrez still resolves to Biopython's Entrez module."""
+        from Bio import Entrez
+        from pubmed_company_papers import api
+        
+        self.assertIs(api.Entrez, Entrez)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Tests for the stats module."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from pubmed_company_papers.stats import LATENCY_BUCKETS, RunStats
+
+class TestRunStats(unittest.TestCase):
+    """Test cases for RunStats."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.stats = RunStats()
+    
+    def test_report_stage_throughput_and_latency(self):
+        """Test that stage calls are summed into throughput, mean and max latency."""
+        self.stats.record("efetch", 0.2, 50)
+        self.stats.record("efetch", 0.6, 50)
+        
+        stage = self.stats.report()["stages"]["efetch"]
+        
+        self.assertEqual(stage["calls"], 2)
+        self.assertEqual(stage["items"], 100)
+        self.assertAlmostEqual(stage["seconds"], 0.8)
+        self.assertAlmostEqual(stage["items_per_second"], 125.0)
+        self.assertAlmostEqual(stage["mean_seconds"], 0.4)
+        self.assertAlmostEqual(stage["max_seconds"], 0.6)
+        self.assertEqual(stage["latency_buckets"]["0.25"], 1)
+        self.assertEqual(stage["latency_buckets"]["1.0"], 1)
+        self.assertEqual(sum(stage["latency_buckets"].values()), 2)
+    
+    def test_timer_skips_failed_calls(self):
+        """Test that the timer context only records blocks that complete."""
+        with self.stats.timer("esearch"):
+            pass
+        with self.assertRaises(ValueError), self.stats.timer("esearch"):
+            raise ValueError("bad response")
+        
+        self.assertEqual(self.stats.report()["stages"]["esearch"]["calls"], 1)
+    
+    def test_timed_iter_records_one_call_per_iteration(self):
+        """Test that timed_iter counts the items and records once, even when closed early."""
+        self.assertEqual(list(self.stats.timed_iter("xml", range(5))), [0, 1, 2, 3, 4])
+        
+        partial = self.stats.timed_iter("xml", range(5))
+        next(partial)
+        partial.close()
+        
+        stage = self.stats.report()["stages"]["xml"]
+        self.assertEqual(stage["calls"], 2)
+        self.assertEqual(stage["items"], 6)
+    
+    def test_merge_snapshot(self):
+        """Test that a worker snapshot adds to the counters and timers."""
+        worker = RunStats()
+        worker.count("requests.retries", 2)
+        worker.record("parser", 0.01, 1)
+        self.stats.count("requests.retries")
+        self.stats.record("parser", 0.02, 1)
+        
+        self.stats.merge(worker.snapshot())
+        report = self.stats.report()
+        
+        self.assertEqual(report["counters"]["requests.retries"], 3)
+        self.assertEqual(report["stages"]["parser"]["calls"], 2)
+        self.assertAlmostEqual(report["stages"]["parser"]["max_seconds"], 0.02)
+    
+    def test_hit_rates(self):
+        """Test that hits/misses counter pairs are turned into hit rates."""
+        self.stats.count("affiliation_cache.hits", 3)
+        self.stats.count("affiliation_cache.misses", 1)
+        self.stats.count("article_store.hits", 0)
+        
+        hit_rates = self.stats.report()["hit_rates"]
+        
+        self.assertEqual(hit_rates, {"affiliation_cache": 0.75, "article_store": None})
+    
+    def test_write_json(self):
+        """Test that the JSON report includes the run information."""
+        path = os.path.join(self.tmpdir.name, "stats.json")
+        self.stats.count("rows.written", 7)
+        
+        self.stats.write_json(path, query="cancer")
+        
+        with open(path) as f:
+            report = json.load(f)
+        self.assertEqual(report["query"], "cancer")
+        self.assertEqual(report["counters"], {"rows.written": 7})
+        self.assertFalse(os.path.exists(f"{path}.tmp"))
+    
+    def test_write_prometheus(self):
+        """Test that the Prometheus textfile has cumulative histogram buckets and counters."""
+        path = os.path.join(self.tmpdir.name, "stats.prom")
+        self.stats.record("efetch", 0.2, 50)
+        self.stats.record("efetch", 120.0, 50)
+        self.stats.count("efetch.bytes", 2048)
+        self.stats.count("affiliation_cache.hits", 1)
+        self.stats.count("affiliation_cache.misses", 1)
+        
+        self.stats.write_prometheus(path)
+        
+        with open(path) as f:
+            lines = f.read().splitlines()
+        buckets = [line for line in lines if line.startswith('pubmed_company_papers_stage_seconds_bucket{stage="efetch"')]
+        self.assertEqual(len(buckets), len(LATENCY_BUCKETS) + 1)
+        self.assertIn('pubmed_company_papers_stage_seconds_bucket{stage="efetch",le="0.25"} 1', lines)
+        self.assertIn('pubmed_company_papers_stage_seconds_bucket{stage="efetch",le="+Inf"} 2', lines)
+        self.assertIn('pubmed_company_papers_stage_seconds_count{stage="efetch"} 2', lines)
+        self.assertIn('pubmed_company_papers_stage_items_total{stage="efetch"} 100', lines)
+        self.assertIn("pubmed_company_papers_efetch_bytes_total 2048", lines)
+        self.assertIn("pubmed_company_papers_affiliation_cache_hit_ratio 0.5", lines)
+        self.assertIn("# TYPE pubmed_company_papers_stage_seconds histogram", lines)
+
+if __name__ == "__main__":
+    unittest.main()
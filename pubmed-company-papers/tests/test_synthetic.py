@@ -0,0 +1,55 @@
+"""Tests for the synthetic efetch generator used by the benchmark suite."""
+
+import os
+import tempfile
+import unittest
+
+from pubmed_company_papers.affiliations import AffiliationAnalyzer
+from pubmed_company_papers.dumps import iter_dump_articles
+from pubmed_company_papers.parser import PubMedParser
+
+from benchmarks.synthetic import SyntheticCorpus
+
+class TestSyntheticCorpus(unittest.TestCase):
+    """Test cases for SyntheticCorpus."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+    
+    def read(self, corpus, size, name="corpus.xml.gz"):
+        """Write a corpus and parse it back into article records."""
+        path = os.path.join(self.tmpdir.name, name)
+        corpus.write_file(path, size)
+        return [PubMedParser.extract_article(article) for article in iter_dump_articles(path)]
+    
+    def test_generated_corpus_parses(self):
+        """Test that every generated article parses with its PMID, title, date and authors."""
+        records = self.read(SyntheticCorpus(seed=1), 200)
+        
+        self.assertEqual([record.pubmed_id for record in records], [str(30000000 + i) for i in range(200)])
+        self.assertTrue(all(record.title and record.publication_date for record in records))
+        self.assertTrue(all(record.authors for record in records))
+    
+    def test_same_seed_gives_same_corpus(self):
+        """Test that the corpus only depends on its settings."""
+        first = list(SyntheticCorpus(seed=7).iter_articles(50))
+        self.assertEqual(list(SyntheticCorpus(seed=7).iter_articles(50)), first)
+        self.assertNotEqual(list(SyntheticCorpus(seed=8).iter_articles(50)), first)
+    
+    def test_affiliation_mix(self):
+        """Test that the company share and e-mail density control the classifier's input."""
+        def company_articles(corpus):
+            records = self.read(corpus, 300, f"{id(corpus)}.xml")
+            return sum(bool(AffiliationAnalyzer.identify_company_authors(record.authors)[0])
+                       for record in records)
+        
+        self.assertEqual(company_articles(SyntheticCorpus(company_share=0.0, email_density=0.0)), 0)
+        self.assertEqual(company_articles(SyntheticCorpus(company_share=1.0, hospital_share=0.0)), 300)
+        
+        records = self.read(SyntheticCorpus(email_density=1.0, multi_affiliation_share=0.0), 50)
+        self.assertTrue(all("@" in author.affiliations[0] for record in records for author in record.authors))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Tests for the transport module."""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from urllib.error import HTTPError
+
+from pubmed_company_papers.api import PubMedAPI
+from pubmed_company_papers.ratelimit import TokenBucket
+from pubmed_company_papers.retry import RetryPolicy
+from pubmed_company_papers.transport import (
+    CassetteMiss,
+    HTTPTransport,
+    RecordingTransport,
+    ReplayTransport,
+    Transport,
+    cassette_key,
+)
+from tests.stub_eutils import StubEutils
+
+class TestTransports(unittest.TestCase):
+    """Test cases for recording and replaying E-utilities responses."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cassette = os.path.join(self.tmpdir.name, "cassette")
+        self.pmids = [str(80000000 + i) for i in range(120)]
+    
+    def make_api(self, transport, **kwargs):
+        """Create an API handler that is not slowed down by rate limiting."""
+        return PubMedAPI(email="test@example.com", rate_limiter=TokenBucket(float("inf")),
+                         transport=transport, **kwargs)
+    
+    def run_query(self, api, concurrency=1):
+        """Search and fetch every article, returning the fetched PMIDs."""
+        pmids = api.search("cancer", retmax=120)
+        return [article["MedlineCitation"]["PMID"]
+                for article in api.iter_articles(pmids, concurrency=concurrency)]
+    
+    def record(self):
+        """Record a search and fetch of every stub article."""
+        with StubEutils(pmids=self.pmids) as stub:
+            recorder = RecordingTransport(HTTPTransport(stub.url, "TestTool", "test@example.com"), self.cassette)
+            fetched = self.run_query(self.make_api(recorder))
+        return recorder, fetched
+    
+    def test_replay_serves_recorded_responses(self):
+        """Test that a replay returns what was recorded, without a server."""
+        recorder, recorded = self.record()
+        self.assertEqual(recorded, self.pmids)
+        # One esearch and three efetch batches of 50
+        self.assertEqual(recorder.recorded, 4)
+        with open(os.path.join(self.cassette, "index.jsonl")) as f:
+            self.assertEqual([json.loads(line)["utility"] for line in f], ["esearch"] + ["efetch"] * 3)
+        
+        for concurrency in (1, 4):
+            with self.subTest(concurrency=concurrency):
+                player = ReplayTransport(self.cassette)
+                self.assertEqual(self.run_query(self.make_api(player), concurrency), self.pmids)
+                self.assertEqual(player.requests, 4)
+    
+    def test_keys_ignore_caller_identity(self):
+        """Test that cassettes recorded with one email replay for another."""
+        params = {"db": "pubmed", "id": "1,2", "retmode": "xml"}
+        self.assertEqual(cassette_key("efetch", params),
+                         cassette_key("efetch", dict(params, email="other@example.com", api_key="key")))
+        self.assertNotEqual(cassette_key("efetch", params), cassette_key("efetch", dict(params, id="1")))
+    
+    def test_unrecorded_request_is_not_retried(self):
+        """Test that a request missing from the cassette fails at once."""
+        self.record()
+        player = ReplayTransport(self.cassette)
+        api = self.make_api(player)
+        with self.assertRaises(CassetteMiss):
+            api.search("tumor", retmax=120)
+        self.assertEqual(player.requests, 1)
+    
+    def test_injected_errors_are_retried(self):
+        """Test that injected errors exercise the retries and repeat with the same seed."""
+        self.record()
+        injected = []
+        for _ in range(2):
+            player = ReplayTransport(self.cassette, error_rate=0.5, seed=7)
+            api = self.make_api(player, retry_policy=RetryPolicy(max_attempts=20, base_delay=0))
+            self.assertEqual(self.run_query(api, concurrency=2), self.pmids)
+            self.assertGreater(player.injected, 0)
+            self.assertEqual(player.requests, 4 + player.injected)
+            injected.append(player.injected)
+        self.assertEqual(injected[0], injected[1])
+        
+        player = ReplayTransport(self.cassette, error_rate=1.0, error_status=429)
+        with self.assertRaises(HTTPError) as context:
+            player.open("esearch", {})
+        self.assertEqual(context.exception.code, 429)
+    
+    def test_replay_latency(self):
+        """Test that replayed responses are delayed by the configured latency."""
+        self.record()
+        api = self.make_api(ReplayTransport(self.cassette, latency=0.05))
+        start = time.perf_counter()
+        self.run_query(api)
+        self.assertGreaterEqual(time.perf_counter() - start, 4 * 0.05)
+    
+    def test_transport_is_abstract(self):
+        """Test that the base transport cannot be used without an open implementation."""
+        with self.assertRaises(TypeError):
+            Transport()
+    
+    def test_missing_cassette_directory(self):
+        """Test that replaying from a directory that does not exist is an error."""
+        with self.assertRaises(ValueError):
+            ReplayTransport(os.path.join(self.tmpdir.name, "missing"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Tests for the verdict_store module."""
+
+import os
+import re
+import tempfile
+import unittest
+
+from pubmed_company_papers.affiliations import AffiliationAnalyzer
+from pubmed_company_papers.verdict_store import VerdictStore
+
+class TestVerdictStore(unittest.TestCase):
+    """Test cases for the VerdictStore class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "verdicts.sqlite")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        AffiliationAnalyzer.close_store()
+        AffiliationAnalyzer.configure_cache(AffiliationAnalyzer.DEFAULT_CACHE_SIZE)
+        self.tmpdir.cleanup()
+    
+    def test_put_and_get_across_sessions(self):
+        """Test that verdicts written in one session are read back in the next."""
+        with VerdictStore(self.path, "v1", batch_size=2) as store:
+            store.put("pfizer inc., new york", (True, "Pfizer Inc."))
+            self.assertEqual(store.get("pfizer inc., new york"), (True, "Pfizer Inc."))
+            self.assertIsNone(store.get("harvard university"))
+        
+        with VerdictStore(self.path, "v1") as store:
+            self.assertEqual(len(store), 1)
+            self.assertEqual(store.get("pfizer inc., new york"), (True, "Pfizer Inc."))
+    
+    def test_batched_writes(self):
+        """Test that verdicts are written once the batch size is reached."""
+        store = VerdictStore(self.path, "v1", batch_size=2)
+        store.put("a", (True, "A Inc."))
+        self.assertEqual(len(store), 0)
+        store.put("b", (False, ""))
+        self.assertEqual(len(store), 2)
+        store.close()
+    
+    def test_version_change_invalidates(self):
+        """Test that a new rule-set version discards stale verdicts."""
+        with VerdictStore(self.path, "v1") as store:
+            store.put("a", (True, "A Inc."))
+        
+        with VerdictStore(self.path, "v2") as store:
+            self.assertEqual(len(store), 0)
+            self.assertIsNone(store.get("a"))
+    
+    def test_load_hot(self):
+        """Test that the most used verdicts are loaded first."""
+        with VerdictStore(self.path, "v1") as store:
+            store.put("a", (True, "A Inc."))
+            store.put("b", (False, ""))
+            store.flush()
+            store.get("b")
+            store.get("b")
+        
+        with VerdictStore(self.path, "v1") as store:
+            self.assertEqual(store.load_hot(1), [("b", (False, ""))])
+            self.assertEqual(len(store.load_hot(10)), 2)
+            self.assertEqual(store.load_hot(0), [])
+    
+    def test_analyzer_uses_store(self):
+        """Test that the analyzer persists verdicts and preloads them on attach."""
+        AffiliationAnalyzer.configure_cache(10)
+        AffiliationAnalyzer.open_store(self.path)
+        verdict = AffiliationAnalyzer.analyze_affiliation("Pfizer Inc., New York, NY, USA")
+        AffiliationAnalyzer.close_store()
+        
+        AffiliationAnalyzer.configure_cache(10)
+        AffiliationAnalyzer.open_store(self.path)
+        self.assertEqual(AffiliationAnalyzer.cache_stats()["size"], 1)
+        self.assertEqual(AffiliationAnalyzer.analyze_affiliation("Pfizer Inc., New York, NY, USA"), verdict)
+        self.assertEqual(AffiliationAnalyzer.cache_stats()["hits"], 1)
+    
+    def test_rule_set_version_tracks_keywords(self):
+        """Test that the version stamp changes with the keyword sets."""
+        class CustomAnalyzer(AffiliationAnalyzer):
+            COMPANY_KEYWORDS = AffiliationAnalyzer.COMPANY_KEYWORDS | {'startup'}
+        
+        self.assertEqual(AffiliationAnalyzer.rule_set_version(), AffiliationAnalyzer.rule_set_version())
+        self.assertNotEqual(AffiliationAnalyzer.rule_set_version(), CustomAnalyzer.rule_set_version())
+    
+    def test_rule_set_version_tracks_extraction_rules(self):
+        """Test that the version stamp changes with the email suffixes and company name patterns."""
+        class SuffixAnalyzer(AffiliationAnalyzer):
+            COMMERCIAL_EMAIL_SUFFIXES = ('.com', '.co', '.io')
+        
+        class PatternAnalyzer(AffiliationAnalyzer):
+            COMPANY_SUFFIX_PATTERN = re.compile(r'([\w\s\-&]+)\s+(Inc\.|Corp\.|LLC)', re.IGNORECASE)
+        
+        versions = {AffiliationAnalyzer.rule_set_version(), SuffixAnalyzer.rule_set_version(),
+                    PatternAnalyzer.rule_set_version()}
+        self.assertEqual(len(versions), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Tests for the xml_stream module."""
+
+import unittest
+from io import BytesIO
+
+from pubmed_company_papers.parser import PubMedParser
+from pubmed_company_papers.xml_stream import iter_pubmed_articles, parse_pubmed_xml
+
+SAMPLE_XML = b"""<?xml version="1.0" ?>
+<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2024//EN" "https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_240101.dtd">
+<PubmedArticleSet>
+  <PubmedArticle>
+    <MedlineCitation Status="MEDLINE" Owner="NLM">
+      <PMID Version="1">12345</PMID>
+      <Article PubModel="Print">
+        <Journal>
+          <JournalIssue CitedMedium="Internet">
+            <PubDate><Year>2023</Year><Month>Jan</Month><Day>15</Day></PubDate>
+          </JournalIssue>
+        </Journal>
+        <ArticleTitle>Targeting <i>KRAS</i> in lung cancer.</ArticleTitle>
+        <AuthorList CompleteYN="Y">
+          <Author ValidYN="Y">
+            <LastName>Smith</LastName><ForeName>John</ForeName><Initials>J</Initials>
+            <AffiliationInfo><Affiliation>Harvard University, Boston, MA, USA.</Affiliation></AffiliationInfo>
+          </Author>
+          <Author ValidYN="Y">
+            <LastName>Doe</LastName><ForeName>Jane</ForeName><Initials>J</Initials>
+            <AffiliationInfo><Affiliation>Pfizer Inc., New York, NY, USA. jane.doe@pfizer.com</Affiliation></AffiliationInfo>
+          </Author>
+        </AuthorList>
+      </Article>
+      <CommentsCorrectionsList>
+        <CommentsCorrections RefType="Cites"><PMID Version="1">99999</PMID></CommentsCorrections>
+      </CommentsCorrectionsList>
+    </MedlineCitation>
+  </PubmedArticle>
+  <PubmedBookArticle>
+    <BookDocument><PMID Version="1">55555</PMID></BookDocument>
+  </PubmedBookArticle>
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID Version="1">67890</PMID>
+      <Article>
+        <Journal>
+          <JournalIssue><PubDate><MedlineDate>2020 Jan-Feb</MedlineDate></PubDate></JournalIssue>
+        </Journal>
+        <ArticleTitle>Second article</ArticleTitle>
+      </Article>
+    </MedlineCitation>
+  </PubmedArticle>
+</PubmedArticleSet>
+"""
+
+class TestXMLStream(unittest.TestCase):
+    """Test cases for the xml_stream module."""
+    
+    def test_iter_pubmed_articles(self):
+        """Test streaming articles into Entrez-style dictionaries."""
+        articles = list(iter_pubmed_articles(BytesIO(SAMPLE_XML)))
+        
+        # Book articles are skipped
+        self.assertEqual(len(articles), 2)
+        
+        first = articles[0]
+        self.assertEqual(PubMedParser.extract_pubmed_id(first), "12345")
+        self.assertEqual(PubMedParser.extract_title(first), "Targeting KRAS in lung cancer.")
+        self.assertEqual(PubMedParser.extract_publication_date(first), "2023-01-15")
+        
+        authors = PubMedParser.extract_authors_with_affiliations(first)
+        self.assertEqual([author["name"] for author in authors], ["Smith, John", "Doe, Jane"])
+        self.assertEqual(authors[1]["affiliations"], ["Pfizer Inc., New York, NY, USA. jane.doe@pfizer.com"])
+        self.assertEqual(PubMedParser.extract_corresponding_author_email(first), "jane.doe@pfizer.com")
+    
+    def test_missing_fields_use_parser_defaults(self):
+        """Test that missing fields fall back to the parser's defaults."""
+        second = parse_pubmed_xml(SAMPLE_XML)[1]
+        
+        self.assertEqual(PubMedParser.extract_pubmed_id(second), "67890")
+        self.assertEqual(PubMedParser.extract_publication_date(second), "2020-01-01")
+        self.assertEqual(PubMedParser.extract_authors_with_affiliations(second), [])
+        self.assertEqual(PubMedParser.extract_corresponding_author_email(second), "Unknown")
+    
+    def test_empty_document(self):
+        """Test that a document without articles yields nothing."""
+        self.assertEqual(parse_pubmed_xml(b"<PubmedArticleSet></PubmedArticleSet>"), [])
+
+if __name__ == "__main__":
+    unittest.main()